@@ -0,0 +1,269 @@
+"""
+Startup and import-time benchmark for Helwan-Insight. Everything runs offscreen
+(QT_QPA_PLATFORM=offscreen) in fresh Python processes and the results are written as
+JSON, so runs on different versions can be compared.
+
+Measured:
+    startup       time from launching `main.py --startup-timing` to each startup stage it
+                  reports (first paint, background loading done), including interpreter
+                  start. The first ("cold") run starts with an empty bytecode cache; the
+                  following ("warm") runs, and the measurements below, reuse it. The OS file
+                  cache is only dropped with --drop-caches (Linux, as root).
+    imports       per-module import cost from `python -X importtime`, for the modules
+                  imported before the window paints and for the ones preloaded after it.
+    construction  building PlotArea and EDADashboard, and setup_translation.
+
+Examples:
+    python benchmarks/startup_benchmark.py --output startup.json
+    python benchmarks/startup_benchmark.py --runs 10 --compare startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Stages printed by main.py --startup-timing, in order; the last one ends a run
+STARTUP_STAGES = ('imports', 'application', 'translation', 'window', 'first paint', 'background loading')
+
+# Seconds a single startup run may take before it is reported as failed
+RUN_TIMEOUT_SECONDS = 120
+
+# Relative slowdown reported as a regression by --compare, and the least absolute one
+# (smaller differences are timer noise)
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+MIN_REGRESSION_SECONDS = 0.005
+
+_STAGE_LINE = re.compile(r'^\[startup\] (?P<stage>.+): (?P<ms>\d+) ms$')
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s+)(?P<module>\S+)$')
+
+# Run in a child process by measure_construction: the imports are done first, so only
+# building the widgets and loading the translations is timed
+_CONSTRUCTION_SCRIPT = """
+import json, sys, time
+from PyQt5.QtWidgets import QApplication, QMainWindow
+app = QApplication(sys.argv[:1])
+from utils.i18n import setup_translation
+from ui.widgets.visualization import PlotArea
+from ui.widgets.eda_dashboard import EDADashboard
+
+repeats = int(sys.argv[1])
+timings = {"setup_translation_en": [], "setup_translation_ar": [], "PlotArea": [], "EDADashboard": []}
+host = QMainWindow()
+host._ = lambda text: text
+for _ in range(repeats):
+    for locale_code in ("en", "ar"):
+        start = time.perf_counter()
+        setup_translation(locale_code, "helwan_insight")
+        timings["setup_translation_" + locale_code].append(time.perf_counter() - start)
+    start = time.perf_counter()
+    widget = PlotArea(parent=host)
+    timings["PlotArea"].append(time.perf_counter() - start)
+    widget.deleteLater()
+    start = time.perf_counter()
+    widget = EDADashboard(parent=host)
+    timings["EDADashboard"].append(time.perf_counter() - start)
+    widget.deleteLater()
+    app.processEvents()
+print(json.dumps(timings))
+"""
+
+
+def _environment(pycache_dir: str) -> dict:
+    # Bytecode is always written (to pycache_dir), or no run after the first would be warm
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', PYTHONPYCACHEPREFIX=pycache_dir)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.abspath(SRC_DIR), env.get('PYTHONPATH')]))
+    return env
+
+
+def drop_os_caches() -> bool:
+    """Drops the Linux page cache (needs root); returns whether it worked."""
+    try:
+        subprocess.run(['sync'], check=True)
+        with open('/proc/sys/vm/drop_caches', 'w') as caches:
+            caches.write('3\n')
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+def measure_startup_run(pycache_dir: str) -> dict:
+    """
+    Launches main.py once and returns the seconds from launch to each stage, read from its
+    --startup-timing output as the lines arrive; the process is stopped after the last stage.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'main.py', '--startup-timing'], cwd=SRC_DIR,
+                               env=_environment(pycache_dir),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    stages = {}
+    try:
+        for line in process.stderr:
+            match = _STAGE_LINE.match(line.strip())
+            if not match:
+                continue
+            stages[match['stage']] = time.perf_counter() - start
+            if match['stage'] == STARTUP_STAGES[-1]:
+                break
+            if time.perf_counter() - start > RUN_TIMEOUT_SECONDS:
+                break
+    finally:
+        process.kill()
+        process.wait()
+    missing = [stage for stage in STARTUP_STAGES if stage not in stages]
+    if missing:
+        raise RuntimeError(f"main.py did not reach the startup stages: {', '.join(missing)}")
+    return stages
+
+
+def measure_startup(runs: int, pycache_dir: str, drop_caches: bool = False) -> dict:
+    """One cold run (empty bytecode cache) and runs - 1 warm runs, summarised per stage."""
+    caches_dropped = drop_os_caches() if drop_caches else False
+    cold = measure_startup_run(pycache_dir)
+    warm = [measure_startup_run(pycache_dir) for _ in range(max(runs - 1, 1))]
+    return {
+        "cold": cold,
+        "warm": {stage: summarize([run[stage] for run in warm]) for stage in STARTUP_STAGES},
+        "os_caches_dropped": caches_dropped,
+    }
+
+
+def parse_importtime(output: str) -> list:
+    """The top-level entries of `python -X importtime` output as dicts (times in seconds)."""
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            modules.append({"module": match['module'], "self": int(match['self']) / 1e6,
+                            "cumulative": int(match['cumulative']) / 1e6,
+                            "depth": (len(match['indent']) - 1) // 2})
+    return modules
+
+
+def measure_imports(pycache_dir: str, top: int = 30) -> dict:
+    """
+    Import costs of what main.py imports before the window is shown, and of the modules
+    preloaded after the first paint (utils.startup.PRELOAD_MODULES).
+    """
+    code = ("import time; start = time.perf_counter(); import main; "
+            "print('STARTUP', time.perf_counter() - start, flush=True); "
+            "from utils.startup import preload_modules; start = time.perf_counter(); preload_modules(); "
+            "print('PRELOAD', time.perf_counter() - start, flush=True)")
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=SRC_DIR,
+                               env=_environment(pycache_dir), capture_output=True, text=True,
+                               timeout=RUN_TIMEOUT_SECONDS, check=True)
+    totals = dict(line.split() for line in completed.stdout.splitlines() if line.startswith(('STARTUP', 'PRELOAD')))
+    modules = parse_importtime(completed.stderr)
+    return {
+        "before_first_paint": float(totals['STARTUP']),
+        "preloaded": float(totals['PRELOAD']),
+        "top_level": [module for module in modules if module["depth"] == 0],
+        "slowest_self": sorted(modules, key=lambda module: module["self"], reverse=True)[:top],
+    }
+
+
+def measure_construction(repeats: int, pycache_dir: str) -> dict:
+    completed = subprocess.run([sys.executable, '-c', _CONSTRUCTION_SCRIPT, str(repeats)], cwd=SRC_DIR,
+                               env=_environment(pycache_dir), capture_output=True, text=True, timeout=RUN_TIMEOUT_SECONDS,
+                               check=True)
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {name: summarize(values) for name, values in timings.items()}
+
+
+def summarize(values: list) -> dict:
+    return {"median": statistics.median(values), "min": min(values), "max": max(values), "runs": len(values)}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SRC_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(results: dict) -> dict:
+    # The timings compared between runs: cold and median warm startup stages, import totals
+    # and median construction times
+    flat = {f"startup.cold.{stage}": seconds for stage, seconds in results["startup"]["cold"].items()}
+    flat.update({f"startup.warm.{stage}": summary["median"] for stage, summary in results["startup"]["warm"].items()})
+    flat["imports.before_first_paint"] = results["imports"]["before_first_paint"]
+    flat["imports.preloaded"] = results["imports"]["preloaded"]
+    flat.update({f"construction.{name}": summary["median"] for name, summary in results["construction"].items()})
+    return flat
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> list:
+    """(metric, baseline seconds, current seconds) for every metric slower than threshold allows."""
+    current, previous = _flatten(results), _flatten(baseline)
+    return [(metric, previous[metric], seconds) for metric, seconds in current.items()
+            if metric in previous and seconds > previous[metric] * (1 + threshold)
+            and seconds - previous[metric] >= MIN_REGRESSION_SECONDS]
+
+
+def run_benchmark(runs: int = 5, repeats: int = 5, drop_caches: bool = False) -> dict:
+    with tempfile.TemporaryDirectory(prefix='helwan-pycache-') as pycache_dir:
+        return {
+            "revision": _git_revision(),
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "startup": measure_startup(runs, pycache_dir, drop_caches),
+            "imports": measure_imports(pycache_dir),
+            "construction": measure_construction(repeats, pycache_dir),
+        }
+
+
+def print_summary(results: dict):
+    print(f"Revision {results['revision']} on Python {results['python']} ({results['platform']})")
+    print("Startup (seconds from launch):        cold    warm median")
+    for stage in STARTUP_STAGES:
+        print(f"  {stage:<34} {results['startup']['cold'][stage]:7.3f} {results['startup']['warm'][stage]['median']:12.3f}")
+    print(f"Imports before first paint: {results['imports']['before_first_paint']:.3f} s, "
+          f"preloaded afterwards: {results['imports']['preloaded']:.3f} s")
+    for module in results['imports']['slowest_self'][:10]:
+        print(f"  {module['module']:<50} {module['self'] * 1000:8.1f} ms self")
+    print("Construction (median):")
+    for name, summary in results['construction'].items():
+        print(f"  {name:<34} {summary['median'] * 1000:8.1f} ms")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure Helwan-Insight startup and import times.")
+    parser.add_argument('--runs', type=int, default=5, help="Startup runs, the first one cold (default: 5).")
+    parser.add_argument('--repeats', type=int, default=5, help="Widget constructions measured (default: 5).")
+    parser.add_argument('--drop-caches', action='store_true', help="Drop the OS file cache before the cold run (Linux, root).")
+    parser.add_argument('-o', '--output', help="Write the results to this JSON file.")
+    parser.add_argument('--compare', help="Baseline JSON file; exits with 1 if a timing regressed.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help=f"Relative slowdown counted as a regression (default: {DEFAULT_REGRESSION_THRESHOLD}).")
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = run_benchmark(args.runs, args.repeats, args.drop_caches)
+    print_summary(results)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+        for metric, before, after in regressions:
+            print(f"REGRESSION {metric}: {before:.3f} s -> {after:.3f} s", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
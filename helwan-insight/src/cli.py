@@ -0,0 +1,348 @@
+"""
+Headless command-line entry point for Helwan-Insight. It does not import Qt, so it runs on
+servers and in scheduled jobs.
+
+It does not import matplotlib either: the analyses
+use DataHandler directly and print JSON (one line per input file) or CSV.
+
+Examples:
+    python cli.py replay cleaning.json january.csv february.csv --output-dir cleaned/
+    python cli.py profile data/*.csv > profiles.jsonl
+    python cli.py outliers data/*.csv --format csv --output-dir reports/
+    python cli.py ttest before after data.csv --method permutation --seed 1
+    python cli.py report data/*.csv --output-dir reports/ --ttest before after
+    python cli.py batch data/ --output-dir profiles/ --jobs 8 --timeout 120
+    python cli.py index profiles/ --sql "SELECT path, rows FROM files WHERE null_rate > 0.2"
+    python cli.py serve --port 8765 --load big.csv
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import sys
+
+from core.batch import (
+    BatchIndex, BATCH_INDEX_NAME, DEFAULT_FILE_MEMORY_LIMIT_MB, DEFAULT_FILE_TIMEOUT_SECONDS, process_directory
+)
+from core.data_handler import DataHandler, TEST_METHODS
+from core.pipeline import Pipeline, DEFAULT_CHUNK_SIZE
+from core.tracing import tracer
+
+OUTPUT_FORMATS = ('json', 'csv')
+
+# Table analyses: each returns a DataFrame with one record per row (a label column first
+# where the index carried the labels)
+TABLE_ANALYSES = {
+    'profile': lambda handler, args: handler.get_column_profile(),
+    'describe': lambda handler, args: handler.get_dataframe_describe().rename_axis('Statistic').reset_index(),
+    'correlations': lambda handler, args: handler.get_correlation_matrix(cluster=args.cluster)
+                                                 .rename_axis('Column').reset_index(),
+    'missing': lambda handler, args: handler.get_missing_values_summary(),
+    'outliers': lambda handler, args: handler.get_outlier_summary(args.columns),
+}
+
+# Test analyses: each returns the result dict of the DataHandler test
+TEST_ANALYSES = {
+    'ttest': lambda handler, args: handler.perform_t_test(args.column1, args.column2, args.method,
+                                                          args.permutations, args.seed, args.jobs),
+    'chisquare': lambda handler, args: handler.perform_chi_square_test(args.column1, args.column2, args.method,
+                                                                       args.permutations, args.seed, args.jobs),
+}
+
+# Test result fields that are pre-formatted text tables, left out of CSV rows
+_TEXT_TABLE_FIELDS = ('contingency_table', 'expected_frequencies')
+
+
+def output_path_for(input_path: str, output_dir: str = None, suffix: str = '_processed',
+                    extension: str = None) -> str:
+    stem, input_extension = os.path.splitext(os.path.basename(input_path))
+    directory = output_dir if output_dir else os.path.dirname(input_path)
+    return os.path.join(directory, f"{stem}{suffix}{extension or input_extension}")
+
+
+def run_replay(args) -> int:
+    if args.output and len(args.inputs) > 1:
+        raise ValueError("--output can only be used with a single input file. Use --output-dir instead.")
+    pipeline = Pipeline.load(args.pipeline)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+    for input_path in args.inputs:
+        output_path = args.output or output_path_for(input_path, args.output_dir, args.suffix)
+        try:
+            summary = pipeline.run(input_path, output_path, chunk_size=args.chunk_size)
+        except (ValueError, IOError) as e:
+            print(f"{input_path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        mode = "streamed" if summary["streamed"] else "in memory"
+        print(f"{input_path} -> {output_path}: {summary['rows_in']} rows in, {summary['rows_out']} rows out ({mode})")
+    return 1 if failures else 0
+
+
+def _json_safe(value):
+    # numpy scalars become Python numbers, NaN and infinities become null
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    return value
+
+
+def json_result(command: str, result):
+    """The result of an analysis made JSON-safe: a list of records for a table, a dict for a test."""
+    if command in TABLE_ANALYSES:
+        return json.loads(result.to_json(orient='records', date_format='iso', double_precision=15))
+    return _json_safe(result)
+
+
+def csv_rows(command: str, result) -> list:
+    """A JSON-safe result as CSV rows; a test gives one row of its scalar fields."""
+    if command in TABLE_ANALYSES:
+        return result
+    return [{key: value for key, value in result.items()
+             if key not in _TEXT_TABLE_FIELDS and not isinstance(value, dict)}]
+
+
+def write_csv(stream, rows: list):
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    writer = csv.DictWriter(stream, fieldnames=fieldnames, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def run_analysis(args) -> int:
+    """
+    Runs one analysis on each input file. Results go to stdout (JSON Lines, or one CSV with
+    a leading File column, written once all files are done) or, with --output-dir, to <input>_<analysis>.json/.csv files.
+    A file that fails is reported on stderr and the others still run.
+    """
+    analysis = TABLE_ANALYSES.get(args.command) or TEST_ANALYSES[args.command]
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+    stdout_rows = []
+    for input_path in args.inputs:
+        handler = DataHandler(input_path)
+        try:
+            handler.load_data()
+            result = json_result(args.command, analysis(handler, args))
+        except (ValueError, IOError) as e:
+            print(f"{input_path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+
+        if args.output_dir:
+            output_path = output_path_for(input_path, args.output_dir, f"_{args.command}", f".{args.format}")
+            with open(output_path, 'w', newline='', encoding='utf-8') as output:
+                if args.format == 'json':
+                    json.dump(result, output, ensure_ascii=False, indent=2)
+                else:
+                    write_csv(output, csv_rows(args.command, result))
+            print(f"{input_path} -> {output_path}", file=sys.stderr)
+        elif args.format == 'json':
+            print(json.dumps({"file": input_path, "analysis": args.command, "result": result}, ensure_ascii=False))
+        else:
+            stdout_rows.extend({'File': input_path, **row} for row in csv_rows(args.command, result))
+    if stdout_rows:
+        # Written at the end so the header covers the columns of every file
+        write_csv(sys.stdout, stdout_rows)
+    return 1 if failures else 0
+
+
+def run_report(args) -> int:
+    if args.output and len(args.inputs) > 1:
+        raise ValueError("--output can only be used with a single input file. Use --output-dir instead.")
+    # Charts need matplotlib, so it is only imported for this command
+    from core.report import generate_report
+
+    tests = [('ttest', *pair) for pair in args.ttest or []] + [('chisquare', *pair) for pair in args.chisquare or []]
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    failures = 0
+    for input_path in args.inputs:
+        output_path = args.output or output_path_for(input_path, args.output_dir, '_report', '.html')
+        handler = DataHandler(input_path)
+        try:
+            handler.load_data()
+            summary = generate_report(handler.get_dataframe(), output_path, columns=args.columns,
+                                      tests=tests or None, image_format=args.image_format,
+                                      title=os.path.basename(input_path), n_jobs=args.jobs)
+        except (ValueError, IOError) as e:
+            print(f"{input_path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        print(f"{input_path} -> {output_path}: {summary['sections']} sections")
+        for heading, reason in summary["skipped"]:
+            print(f"  {heading}: {reason}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def run_batch(args) -> int:
+    def report_progress(completed: int, total: int):
+        print(f"\r{completed}/{total} files", end='', file=sys.stderr, flush=True)
+
+    memory_limit = args.memory_limit if args.memory_limit > 0 else None
+    timeout = args.timeout if args.timeout > 0 else None
+    summary = process_directory(args.directory, args.output_dir, recursive=not args.no_recursive, n_jobs=args.jobs,
+                                timeout=timeout, memory_limit_mb=memory_limit, retry_failed=args.retry_failed,
+                                progress_callback=report_progress)
+    if summary["processed"]:
+        print(file=sys.stderr)
+    statuses = ", ".join(f"{count} {status}" for status, count in sorted(summary["statuses"].items()))
+    print(f"{summary['processed']} files processed ({statuses or 'none'}), {summary['skipped']} already in the index; "
+          f"index: {summary['index']}")
+    return 0 if set(summary["statuses"]) <= {'ok'} else 1
+
+
+def run_index(args) -> int:
+    index_path = os.path.join(args.index, BATCH_INDEX_NAME) if os.path.isdir(args.index) else args.index
+    if not os.path.isfile(index_path):
+        raise ValueError(f"Index '{index_path}' not found.")
+    with BatchIndex(index_path) as index:
+        if args.sql:
+            try:
+                columns, rows = index.query(args.sql)
+            except sqlite3.Error as e:
+                raise ValueError(f"Invalid query: {e}")
+        elif args.schemas:
+            columns, rows = ['schema_fingerprint', 'files', 'columns', 'example_path'], index.schemas()
+        else:
+            columns, rows = ['status', 'files'], sorted(index.status_counts().items())
+    writer = csv.writer(sys.stdout, lineterminator='\n')
+    writer.writerow(columns)
+    writer.writerows(rows)
+    return 0
+
+
+def run_serve(args) -> int:
+    # pyarrow (optional) is slow to import, so the server is only imported for this command
+    from core.server import run_server
+
+    def announce(server):
+        print(f"Serving on http://{server.host}:{server.port} ({len(server.datasets)} datasets loaded); "
+              f"press Ctrl+C to stop.", file=sys.stderr, flush=True)
+
+    try:
+        run_server(args.host, args.port, args.workers, preload=args.load, ready_callback=announce)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser, command: str):
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json', help="Output format (default: json).")
+    parser.add_argument('--output-dir', help=f"Write <input>_{command}.<format> files here instead of to stdout.")
+    parser.set_defaults(func=run_analysis)
+
+
+def _add_analysis_parser(subparsers, command: str, help_text: str) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(command, help=help_text)
+    parser.add_argument('inputs', nargs='+', help="Input .csv, .xlsx or .xls files.")
+    _add_output_arguments(parser, command)
+    return parser
+
+
+def _add_test_parser(subparsers, command: str, help_text: str) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(command, help=help_text)
+    parser.add_argument('column1', help="First column.")
+    parser.add_argument('column2', help="Second column.")
+    parser.add_argument('inputs', nargs='+', help="Input .csv, .xlsx or .xls files.")
+    parser.add_argument('--method', choices=TEST_METHODS, default='parametric', help="Test method (default: parametric).")
+    parser.add_argument('--permutations', type=int, default=10000, help="Permutations for --method permutation (default: 10000).")
+    parser.add_argument('--seed', type=int, help="Random seed for --method permutation.")
+    parser.add_argument('--jobs', type=int, help="Worker processes for --method permutation (default: all cores).")
+    _add_output_arguments(parser, command)
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='helwan-insight', description="Helwan-Insight headless tools.")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="Time the data operations and write them to FILE as Chrome-trace JSON.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    replay = subparsers.add_parser('replay', help="Replay a recorded pipeline on one or more data files.")
+    replay.add_argument('pipeline', help="Pipeline file (.json, or .yaml/.yml with PyYAML installed).")
+    replay.add_argument('inputs', nargs='+', help="Input .csv, .xlsx or .xls files.")
+    replay.add_argument('-o', '--output', help="Output file (single input only).")
+    replay.add_argument('--output-dir', help="Directory for the output files (default: next to each input).")
+    replay.add_argument('--suffix', default='_processed', help="Suffix added to output file names (default: _processed).")
+    replay.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per chunk when streaming CSV files (default: {DEFAULT_CHUNK_SIZE}, 0 disables "
+                             "streaming). Streamed duplicate removal compares row hashes only.")
+    replay.set_defaults(func=run_replay)
+
+    _add_analysis_parser(subparsers, 'profile', "Column types, missing and unique counts and numerical ranges.")
+    _add_analysis_parser(subparsers, 'describe', "Descriptive statistics of the numerical columns.")
+    correlations = _add_analysis_parser(subparsers, 'correlations', "Pearson correlation matrix of the numerical columns.")
+    correlations.add_argument('--cluster', action='store_true', help="Order the columns by hierarchical clustering.")
+    _add_analysis_parser(subparsers, 'missing', "Missing-value counts per column.")
+    outliers = _add_analysis_parser(subparsers, 'outliers', "IQR outlier bounds and counts per numerical column.")
+    outliers.add_argument('--columns', nargs='+', help="Numerical columns to check (default: all).")
+    _add_test_parser(subparsers, 'ttest', "Welch's t-test (or permutation/exact test) between two numerical columns.")
+    _add_test_parser(subparsers, 'chisquare', "Chi-square test of independence between two categorical columns.")
+
+    report = subparsers.add_parser('report', help="Write a self-contained HTML report of each data file.")
+    report.add_argument('inputs', nargs='+', help="Input .csv, .xlsx or .xls files.")
+    report.add_argument('-o', '--output', help="Output .html file (single input only).")
+    report.add_argument('--output-dir', help="Directory for the <input>_report.html files (default: next to each input).")
+    report.add_argument('--columns', nargs='+', help="Columns profiled in the report (default: all).")
+    report.add_argument('--ttest', nargs=2, action='append', metavar=('COLUMN1', 'COLUMN2'),
+                        help="Run a t-test between two numerical columns (repeatable).")
+    report.add_argument('--chisquare', nargs=2, action='append', metavar=('COLUMN1', 'COLUMN2'),
+                        help="Run a chi-square test between two categorical columns (repeatable; "
+                             "without any tests, pairs of categorical columns are tested).")
+    report.add_argument('--image-format', choices=('png', 'svg'), default='png', help="Chart format (default: png).")
+    report.add_argument('--jobs', type=int, help="Worker processes (default: all cores).")
+    report.set_defaults(func=run_report)
+
+    batch = subparsers.add_parser('batch', help="Profile every data file in a directory into a queryable index.")
+    batch.add_argument('directory', help="Directory with .csv, .xlsx and .xls files.")
+    batch.add_argument('--output-dir', required=True, help=f"Directory for the per-file results and {BATCH_INDEX_NAME}.")
+    batch.add_argument('--jobs', type=int, help="Files processed at a time (default: all cores).")
+    batch.add_argument('--timeout', type=float, default=DEFAULT_FILE_TIMEOUT_SECONDS,
+                       help=f"Seconds allowed per file, 0 for no limit (default: {DEFAULT_FILE_TIMEOUT_SECONDS}).")
+    batch.add_argument('--memory-limit', type=int, default=DEFAULT_FILE_MEMORY_LIMIT_MB,
+                       help=f"Megabytes of memory allowed per file, 0 for no limit (default: {DEFAULT_FILE_MEMORY_LIMIT_MB}).")
+    batch.add_argument('--retry-failed', action='store_true', help="Process files that failed in an earlier run again.")
+    batch.add_argument('--no-recursive', action='store_true', help="Do not look into subdirectories.")
+    batch.set_defaults(func=run_batch)
+
+    index = subparsers.add_parser('index', help="Query the index written by the batch command (CSV output).")
+    index.add_argument('index', help=f"The batch output directory or its {BATCH_INDEX_NAME}.")
+    index.add_argument('--schemas', action='store_true', help="List the distinct schemas and how many files have each.")
+    index.add_argument('--sql', help="Run an SQL query on the files and columns tables.")
+    index.set_defaults(func=run_index)
+
+    serve = subparsers.add_parser('serve', help="Run a local HTTP/JSON server that keeps datasets loaded.")
+    serve.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1).")
+    serve.add_argument('--port', type=int, default=8765, help="Port to listen on (default: 8765).")
+    serve.add_argument('--workers', type=int, help="Threads running the analyses (default: chosen by Python).")
+    serve.add_argument('--load', nargs='+', metavar='FILE', help="Files to load before serving.")
+    serve.set_defaults(func=run_serve)
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        tracer.enabled = True
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if args.trace:
+            tracer.export_chrome_trace(args.trace)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
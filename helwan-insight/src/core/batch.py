@@ -0,0 +1,320 @@
+import hashlib
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from core.data_handler import DataHandler
+from core.history import DataHistory
+from core.parallel import resolve_worker_count
+
+try:
+    import resource
+except ImportError:  # not available on Windows; files are then processed without a memory limit
+    resource = None
+
+BATCH_FILE_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+
+# Name of the summary index written into the output directory
+BATCH_INDEX_NAME = 'index.sqlite'
+
+# Limits for profiling a single file: seconds, and megabytes of memory the worker may
+# allocate on top of what it started with (None disables a limit)
+DEFAULT_FILE_TIMEOUT_SECONDS = 300
+DEFAULT_FILE_MEMORY_LIMIT_MB = 4096
+
+# How often (seconds) the parent checks running workers for results and timeouts
+_POLL_INTERVAL_SECONDS = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime REAL,
+    status TEXT,
+    error TEXT,
+    rows INTEGER,
+    columns INTEGER,
+    missing_cells INTEGER,
+    null_rate REAL,
+    schema_fingerprint TEXT,
+    result_path TEXT,
+    seconds REAL,
+    processed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS columns (
+    path TEXT,
+    position INTEGER,
+    name TEXT,
+    dtype TEXT,
+    missing INTEGER,
+    null_rate REAL,
+    PRIMARY KEY (path, position)
+);
+CREATE INDEX IF NOT EXISTS files_by_fingerprint ON files (schema_fingerprint);
+CREATE INDEX IF NOT EXISTS columns_by_name ON columns (name);
+"""
+
+
+class BatchIndex:
+    """
+    SQLite index of a batch run: one row per file in `files` (status 'ok', 'failed',
+    'timeout' or 'memory', shape, null rate, schema fingerprint, result file) and one row
+    per column in `columns`. Every file is committed as it finishes, so an interrupted
+    run resumes where it stopped, and the index can be queried with any SQLite client.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_done(self, path: str, size: int, mtime: float, retry_failed: bool = False) -> bool:
+        """Whether the file, unchanged since, was already processed (successfully, with retry_failed)."""
+        row = self.connection.execute("SELECT size, mtime, status FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime:
+            return False
+        return row[2] == 'ok' or not retry_failed
+
+    def record(self, path: str, size: int, mtime: float, status: str, seconds: float,
+               summary: dict = None, error: str = None):
+        summary = summary or {}
+        with self.connection:
+            self.connection.execute("DELETE FROM columns WHERE path = ?", (path,))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, size, mtime, status, error, summary.get("rows"), summary.get("columns"),
+                 summary.get("missing_cells"), summary.get("null_rate"), summary.get("schema_fingerprint"),
+                 summary.get("result_path"), seconds, time.strftime('%Y-%m-%dT%H:%M:%S')))
+            self.connection.executemany(
+                "INSERT INTO columns VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, position, column["name"], column["dtype"], column["missing"], column["null_rate"])
+                 for position, column in enumerate(summary.get("column_details", []))])
+
+    def query(self, sql: str, params: tuple = ()) -> tuple:
+        """Runs a query on the index; returns (column names, rows)."""
+        cursor = self.connection.execute(sql, params)
+        return [description[0] for description in cursor.description or []], cursor.fetchall()
+
+    def status_counts(self) -> dict:
+        return dict(self.connection.execute("SELECT status, COUNT(*) FROM files GROUP BY status"))
+
+    def schemas(self) -> list:
+        """(schema fingerprint, number of files, column count, one example path), most common first."""
+        return self.connection.execute(
+            "SELECT schema_fingerprint, COUNT(*), MAX(columns), MIN(path) FROM files WHERE status = 'ok' "
+            "GROUP BY schema_fingerprint ORDER BY COUNT(*) DESC").fetchall()
+
+
+def find_data_files(directory: str, recursive: bool = True) -> list:
+    """The .csv, .xlsx and .xls files in directory (and its subdirectories), sorted."""
+    if not os.path.isdir(directory):
+        raise ValueError(f"Directory '{directory}' not found.")
+    if not recursive:
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                      if name.lower().endswith(BATCH_FILE_EXTENSIONS)
+                      and os.path.isfile(os.path.join(directory, name)))
+    found = []
+    for root, _dirs, names in os.walk(directory):
+        found += [os.path.join(root, name) for name in names if name.lower().endswith(BATCH_FILE_EXTENSIONS)]
+    return sorted(found)
+
+
+def schema_fingerprint(columns: list, dtypes: list) -> str:
+    """Hash of the column names and dtypes in order: files with the same layout share it."""
+    text = "\n".join(f"{column}\t{dtype}" for column, dtype in zip(columns, dtypes))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def result_path_for(path: str, directory: str, output_dir: str) -> str:
+    # Named after the file, plus a hash of its relative path so equal names in
+    # different subdirectories do not collide
+    relative = os.path.relpath(path, directory)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(relative.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(output_dir, 'results', f"{stem}_{digest}.json")
+
+
+def _to_builtin(value):
+    # json cannot serialize numpy scalars
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _limit_memory(memory_limit_mb: int):
+    # The limit is on top of the address space the worker already has (it starts as a copy
+    # of the parent), so it bounds what profiling the file may allocate
+    if resource is None or memory_limit_mb is None:
+        return
+    try:
+        with open('/proc/self/statm') as statm:
+            current = int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        current = 0
+    limit = current + memory_limit_mb * 2 ** 20
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def profile_file(path: str, result_path: str) -> dict:
+    """
+    Loads one file with DataHandler, writes its missing-value summary and basic statistics
+    to result_path (JSON) and returns the summary stored in the index.
+    """
+    handler = DataHandler(path)
+    handler.history = DataHistory(max_depth=0)
+    df = handler.load_data()
+    missing = handler.get_missing_values_summary()
+    try:
+        statistics = handler.get_basic_statistics()
+    except ValueError:  # no numerical columns
+        statistics = None
+
+    missing_counts = df.isna().sum()
+    cells = df.size
+    dtypes = [str(dtype) for dtype in df.dtypes]
+    summary = {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "missing_cells": int(missing_counts.sum()),
+        "null_rate": float(missing_counts.sum() / cells) if cells else 0.0,
+        "schema_fingerprint": schema_fingerprint([str(column) for column in df.columns], dtypes),
+        "column_details": [
+            {"name": str(column), "dtype": dtype, "missing": int(missing_counts.iloc[position]),
+             "null_rate": float(missing_counts.iloc[position] / len(df)) if len(df) else 0.0}
+            for position, (column, dtype) in enumerate(zip(df.columns, dtypes))
+        ],
+        "result_path": result_path,
+    }
+    result = {
+        "path": path,
+        **{key: value for key, value in summary.items() if key != "result_path"},
+        "missing_values": json.loads(missing.to_json(orient='records', double_precision=15)),
+        "basic_statistics": (json.loads(statistics.to_json(orient='columns', double_precision=15))
+                             if statistics is not None else None),
+    }
+    os.makedirs(os.path.dirname(result_path), exist_ok=True)
+    with open(result_path, 'w', encoding='utf-8') as output:
+        json.dump(result, output, ensure_ascii=False, indent=2, default=_to_builtin)
+    return summary
+
+
+def _out_of_memory(error: BaseException) -> bool:
+    # Loading wraps errors in a ValueError, and some readers turn a failed allocation into
+    # another error that only keeps numpy's "Unable to allocate" message
+    while error is not None:
+        if isinstance(error, MemoryError) or 'Unable to allocate' in str(error):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _profile_worker(connection, path: str, result_path: str, memory_limit_mb: int):
+    # Runs in its own process; sends back (status, summary or error message)
+    try:
+        _limit_memory(memory_limit_mb)
+        connection.send(('ok', profile_file(path, result_path)))
+    except Exception as e:
+        if _out_of_memory(e):
+            connection.send(('memory', f"More than {memory_limit_mb} MB of memory needed."))
+        else:
+            connection.send(('failed', str(e) or type(e).__name__))
+    finally:
+        connection.close()
+
+
+def process_directory(directory: str, output_dir: str, recursive: bool = True, n_jobs: int = None,
+                      timeout: float = DEFAULT_FILE_TIMEOUT_SECONDS,
+                      memory_limit_mb: int = DEFAULT_FILE_MEMORY_LIMIT_MB, retry_failed: bool = False,
+                      progress_callback=None) -> dict:
+    """
+    Profiles every data file in directory (see profile_file), each in its own worker
+    process with n_jobs running at a time. A worker that runs longer than timeout seconds
+    is stopped, and one that needs more than memory_limit_mb fails with status 'memory'.
+    Results go to output_dir/results and the summary to the BatchIndex
+    output_dir/index.sqlite. Files already in the index and unchanged since are skipped,
+    so an interrupted run can simply be started again; failed files are tried again only
+    with retry_failed. progress_callback is called as (completed, total). Returns
+    {"index", "processed", "skipped", "statuses"}.
+    """
+    files = find_data_files(directory, recursive)
+    os.makedirs(output_dir, exist_ok=True)
+    index_path = os.path.join(output_dir, BATCH_INDEX_NAME)
+    output_root = os.path.abspath(output_dir)
+    statuses = {}
+
+    with BatchIndex(index_path) as index:
+        pending = []
+        for path in files:
+            if os.path.abspath(path).startswith(output_root + os.sep):
+                continue  # results of an earlier run inside the scanned directory
+            stat = os.stat(path)
+            if not index.is_done(path, stat.st_size, stat.st_mtime, retry_failed):
+                pending.append((path, stat.st_size, stat.st_mtime))
+        skipped = len(files) - len(pending)
+        workers = resolve_worker_count(n_jobs)
+        context = multiprocessing.get_context()
+        running = {}  # connection -> (process, path, size, mtime, start)
+        completed = 0
+
+        def finish(connection, status: str, payload):
+            nonlocal completed
+            process, path, size, mtime, start = running.pop(connection)
+            connection.close()
+            process.join()
+            seconds = time.perf_counter() - start
+            if status == 'ok':
+                index.record(path, size, mtime, status, seconds, summary=payload)
+            else:
+                index.record(path, size, mtime, status, seconds, error=payload)
+            statuses[status] = statuses.get(status, 0) + 1
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, len(pending))
+
+        try:
+            queue = list(reversed(pending))
+            while queue or running:
+                while queue and len(running) < workers:
+                    path, size, mtime = queue.pop()
+                    receiver, sender = context.Pipe(duplex=False)
+                    process = context.Process(target=_profile_worker, daemon=True,
+                                              args=(sender, path, result_path_for(path, directory, output_dir),
+                                                    memory_limit_mb))
+                    process.start()
+                    sender.close()
+                    running[receiver] = (process, path, size, mtime, time.perf_counter())
+
+                for connection in multiprocessing.connection.wait(list(running), timeout=_POLL_INTERVAL_SECONDS):
+                    try:
+                        status, payload = connection.recv()
+                    except EOFError:  # the worker died without an answer (e.g. killed by the OS)
+                        process = running[connection][0]
+                        process.join()
+                        status, payload = 'failed', f"Worker exited with code {process.exitcode}."
+                    finish(connection, status, payload)
+
+                now = time.perf_counter()
+                for connection, (process, _path, _size, _mtime, start) in list(running.items()):
+                    if timeout is not None and now - start > timeout:
+                        process.kill()
+                        finish(connection, 'timeout', f"Stopped after {timeout:g} seconds.")
+        finally:
+            for process, *_rest in running.values():
+                process.kill()
+                process.join()
+
+    return {"index": index_path, "processed": completed, "skipped": skipped, "statuses": statuses}
@@ -0,0 +1,177 @@
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2; the common formats below are tried instead
+    guess_datetime_format = None
+
+# Distinct values used to infer a datetime format or the number separators
+DEFAULT_SAMPLE_SIZE = 200
+
+# Tried (after pandas' own guesses) when inferring a datetime format
+COMMON_DATETIME_FORMATS = (
+    '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y/%m/%d',
+    '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y', '%d.%m.%Y',
+    '%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M',
+    '%d %b %Y', '%d %B %Y', '%b %d, %Y', '%B %d, %Y', '%Y%m%d',
+)
+
+# Arabic-Indic and Persian digits, the Arabic decimal separator and the Arabic thousands
+# separator (which is dropped)
+_DIGIT_TRANSLATION = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹٫', '01234567890123456789.', '٬')
+_GROUPING_CHARACTERS = re.compile(r"[\s'’]")  # \s also covers no-break spaces
+_CURRENCY_SYMBOLS = re.compile(r"[$€£¥₹]")
+_THOUSANDS_ONLY = {',': re.compile(r'[-+]?\d{1,3}(,\d{3})+'), '.': re.compile(r'[-+]?\d{1,3}(\.\d{3})+')}
+
+
+def _sample(uniques, sample_size: int):
+    # Evenly spaced distinct values, so the sample is not just the start of the file
+    if len(uniques) <= sample_size:
+        return uniques
+    return uniques[np.linspace(0, len(uniques) - 1, sample_size).astype(int)]
+
+
+def infer_datetime_format(values, sample_size: int = DEFAULT_SAMPLE_SIZE, dayfirst: bool = False):
+    """
+    Returns the strftime format that parses the most values of a sample of the distinct
+    strings, or None when no format parses any of them. Formats guessed by pandas come first,
+    then COMMON_DATETIME_FORMATS (day-first formats are preferred with dayfirst=True).
+    """
+    uniques = pd.unique(pd.Series(values).dropna().astype(str))
+    sample = pd.Index(_sample(uniques, sample_size))
+    if len(sample) == 0:
+        return None
+
+    candidates = []
+    if guess_datetime_format is not None:
+        for value in sample[:10]:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                guessed = guess_datetime_format(value, dayfirst=dayfirst)
+            if guessed and guessed not in candidates:
+                candidates.append(guessed)
+    common = sorted(COMMON_DATETIME_FORMATS, key=lambda fmt: not fmt.startswith('%d')) if dayfirst else COMMON_DATETIME_FORMATS
+    candidates.extend(fmt for fmt in common if fmt not in candidates)
+
+    best_format, best_count = None, 0
+    for fmt in candidates:
+        count = int(pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum())
+        if count > best_count:
+            best_format, best_count = fmt, count
+            if count == len(sample):
+                break
+    return best_format
+
+
+def infer_number_separators(values, sample_size: int = DEFAULT_SAMPLE_SIZE) -> tuple:
+    """
+    Guesses (decimal, thousands) separators from a sample of number strings, e.g. ('.', ',')
+    for "1,234.5" and (',', '.') for "1.234,5". A lone comma followed by exactly three digits
+    ("1,234") counts as a thousands separator; other lone commas ("3,5") as decimal commas.
+    """
+    uniques = pd.unique(pd.Series(values).dropna().astype(str))
+    comma_decimal = dot_decimal = 0
+    for value in _sample(uniques, sample_size):
+        value = _GROUPING_CHARACTERS.sub('', value.translate(_DIGIT_TRANSLATION))
+        last_comma, last_dot = value.rfind(','), value.rfind('.')
+        if last_comma >= 0 and last_dot >= 0:
+            if last_comma > last_dot:
+                comma_decimal += 1
+            else:
+                dot_decimal += 1
+        elif last_comma >= 0:
+            if not _THOUSANDS_ONLY[','].fullmatch(value):
+                comma_decimal += 1
+        elif last_dot >= 0 and not _THOUSANDS_ONLY['.'].fullmatch(value):
+            dot_decimal += 1
+    if comma_decimal > dot_decimal:
+        return ',', '.'
+    return '.', ','
+
+
+def _factorize(series: pd.Series) -> tuple:
+    # Repeated strings are parsed once: convert the distinct values, then map back by code
+    codes, uniques = pd.factorize(series, sort=False)
+    return codes, pd.Index(uniques)
+
+
+def _take(parsed_uniques, codes: np.ndarray, index) -> pd.Series:
+    # Code -1 (a missing value) is not a label of the parsed values, so it becomes NaN/NaT
+    values = pd.Series(parsed_uniques).reset_index(drop=True).reindex(codes)
+    values.index = index
+    return values
+
+
+def to_datetime(series: pd.Series, format: str = None, dayfirst: bool = False) -> dict:
+    """
+    Converts a column to datetimes. Text is parsed with an explicit (given or inferred)
+    format, one parse per distinct string; strings that do not match the format are
+    retried individually with flexible parsing.
+    Returns {"values": converted Series (NaT where parsing failed), "failed": boolean mask
+    of non-missing values that could not be parsed, "format": the format used}.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return {"values": series, "failed": np.zeros(len(series), dtype=bool), "format": None}
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        values = pd.to_datetime(series, errors='coerce')
+        return {"values": values, "failed": (values.isna() & series.notna()).to_numpy(), "format": None}
+
+    codes, uniques = _factorize(series)
+    texts = uniques.astype(str).str.strip()
+    if format is None:
+        format = infer_datetime_format(texts, dayfirst=dayfirst)
+
+    if format is not None:
+        parsed = pd.Series(pd.to_datetime(texts, format=format, errors='coerce'))
+    else:
+        parsed = pd.Series(pd.NaT, index=range(len(texts)), dtype='datetime64[ns]')
+    unmatched = parsed.isna().to_numpy()
+    if unmatched.any():
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            retried = pd.to_datetime(texts[unmatched], format='mixed', dayfirst=dayfirst, errors='coerce')
+        parsed = parsed.where(~unmatched, pd.Series(retried.to_numpy(), index=np.flatnonzero(unmatched)))
+
+    values = _take(parsed, codes, series.index)
+    failed = (values.isna() & series.notna()).to_numpy()
+    return {"values": pd.to_datetime(values), "failed": failed, "format": format}
+
+
+def normalize_number_text(texts: pd.Index, decimal: str, thousands: str) -> pd.Series:
+    """Turns locale-formatted number strings into plain ones that pd.to_numeric accepts."""
+    texts = pd.Series(texts.astype(str)).str.translate(_DIGIT_TRANSLATION)
+    texts = texts.str.replace(_GROUPING_CHARACTERS, '', regex=True)
+    texts = texts.str.replace(_CURRENCY_SYMBOLS, '', regex=True)
+    # Accounting style negatives: (1,234.50)
+    texts = texts.str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+    if thousands:
+        texts = texts.str.replace(thousands, '', regex=False)
+    if decimal != '.':
+        texts = texts.str.replace(decimal, '.', regex=False)
+    return texts
+
+
+def to_numeric(series: pd.Series, decimal: str = None, thousands: str = None) -> dict:
+    """
+    Converts a column to numbers. Text may use thousands separators, decimal commas,
+    Arabic-Indic digits, currency symbols or accounting negatives; the separators are
+    inferred from a sample unless given. Each distinct string is parsed once.
+    Returns {"values", "failed", "decimal", "thousands"} like to_datetime.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return {"values": series, "failed": np.zeros(len(series), dtype=bool), "decimal": None, "thousands": None}
+
+    codes, uniques = _factorize(series)
+    if decimal is None or thousands is None:
+        inferred_decimal, inferred_thousands = infer_number_separators(uniques)
+        decimal = decimal or inferred_decimal
+        thousands = thousands if thousands is not None else (inferred_thousands if inferred_thousands != decimal else '')
+    parsed = pd.to_numeric(normalize_number_text(uniques, decimal, thousands), errors='coerce')
+
+    values = _take(parsed, codes, series.index).astype(float)
+    failed = (values.isna() & series.notna()).to_numpy()
+    return {"values": values, "failed": failed, "decimal": decimal, "thousands": thousands}
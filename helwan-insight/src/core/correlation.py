@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+
+def pearson_matrix(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pearson correlations of all column pairs of a numerical frame, each pair over the rows
+    where both values are present (as DataFrame.corr). The sums the coefficients need are
+    taken for all pairs at once as matrix products of the (centred) values and the mask of
+    present values, which scales to thousands of columns.
+    """
+    values = frame.to_numpy(dtype=float, na_value=np.nan)
+    present = np.isfinite(values)
+    # Centring first keeps the differences of large sums below from losing precision
+    values = np.where(present, values, 0.0)
+    means = values.sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+    values = np.where(present, values - means, 0.0)
+    if present.all():
+        # No missing values: every pair uses all rows, one product gives all covariances
+        with np.errstate(invalid='ignore', divide='ignore'):
+            products = values.T @ values
+            scale = np.sqrt(np.diag(products))
+            correlations = products / np.outer(scale, scale)
+        correlations = np.clip(correlations, -1, 1)
+        np.fill_diagonal(correlations, np.where(scale > 0, 1.0, np.nan))
+        return pd.DataFrame(correlations, index=frame.columns, columns=frame.columns)
+    mask = present.astype(float)
+
+    counts = mask.T @ mask
+    sums = values.T @ mask  # [i, j]: sum of column i over the rows where column j is present
+    squares = (values ** 2).T @ mask
+    products = values.T @ values
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariances = counts * products - sums * sums.T
+        variances = (counts * squares - sums ** 2) * (counts * squares - sums ** 2).T
+        correlations = covariances / np.sqrt(variances)
+    correlations[(counts < 2) | ~(variances > 0)] = np.nan
+    correlations = np.clip(correlations, -1, 1)
+    np.fill_diagonal(correlations, np.where(np.diag(variances) > 0, 1.0, np.nan))
+    return pd.DataFrame(correlations, index=frame.columns, columns=frame.columns)
+
+
+def cluster_order(correlations: np.ndarray) -> np.ndarray:
+    """
+    An ordering of the columns that puts strongly correlated ones next to each other: the
+    leaves of an average-linkage clustering on the distance 1 - |r| (undefined
+    correlations count as none).
+    """
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    n = len(correlations)
+    if n < 3:
+        return np.arange(n)
+    distances = 1 - np.abs(np.nan_to_num(correlations, nan=0.0))
+    distances = (distances + distances.T) / 2
+    np.fill_diagonal(distances, 0)
+    return leaves_list(linkage(squareform(np.clip(distances, 0, None), checks=False), method='average'))
+
+
+def clustered(correlations: pd.DataFrame) -> pd.DataFrame:
+    """The correlation matrix with rows and columns in cluster_order."""
+    order = cluster_order(correlations.to_numpy())
+    return correlations.iloc[order, order]
@@ -1,12 +1,178 @@
 import pandas as pd
 import numpy as np
-import scipy.stats as stats
 import io
+import os
+import tempfile
+import threading
+import time
 
+from core.conversion import to_datetime, to_numeric
+from core.correlation import pearson_matrix, clustered
+from core.duplicates import DUPLICATE_KEEP_OPTIONS, column_hash, combine_hashes, duplicate_groups, duplicate_mask, duplicate_report
+from core.grouping import GroupIndex
+from core.histograms import FineHistogram
+from core.kde import fft_kde
+from core.history import DataHistory, HistoryEntry
+from core.memory import memory_monitor, spill_frame, load_spilled_frame
+from core.plot_cache import estimate_size
+from core.tracing import trace_methods
+from core.resampling import (
+    bootstrap_confidence_intervals, permutation_t_test, permutation_chi_square_test
+)
+
+# Methods accepted by perform_t_test and perform_chi_square_test
+TEST_METHODS = ('parametric', 'permutation', 'exact')
+
+# Strategies accepted by impute_missing_values
+IMPUTATION_STRATEGIES = ('fill_mean', 'fill_median', 'fill_mode', 'fill_value', 'ffill', 'bfill', 'interpolate')
+_NUMERICAL_ONLY_STRATEGIES = ('fill_mean', 'fill_median', 'interpolate')
+
+# Rows binned at a time when building a fine histogram, bounding the temporary memory
+HISTOGRAM_CHUNK_ROWS = 5_000_000
+
+# Rows of a column of Python objects (e.g. strings) measured to estimate its memory; its
+# full size is extrapolated from them
+MEMORY_SAMPLE_ROWS = 10_000
+
+# Caches derived from the data, cleared whenever it changes (and when memory runs short)
+_CACHE_ATTRIBUTES = ('_group_index_cache', '_column_hash_cache', '_conversion_cache', '_histogram_cache',
+                     '_density_cache', '_correlation_cache', '_memory_usage_cache')
+
+# Every public method is timed while tracing is on (see core.tracing); rows are read from
+# _df so that timing a spilled dataset does not reload it
+@trace_methods('data', rows_attribute='_df')
 class DataHandler:
     def __init__(self, file_path: str = None):
         self.file_path = file_path
-        self.df = None
+        self._df = None
+        # Where the data was spilled to by spill_to_disk (None while it is in memory)
+        self._spill_path = None
+        self._spill_dtypes = None
+        self._spill_directory = None
+        self._spill_lock = threading.RLock()
+        self.last_access = time.monotonic()
+        # Incremented on every change to self.df; caches derived from the data are keyed on it
+        self.data_version = 0
+        self._group_index_cache = {}
+        self._column_hash_cache = {}
+        self._conversion_cache = {}
+        self._histogram_cache = {}
+        self._density_cache = {}
+        self._correlation_cache = {}
+        self._memory_usage_cache = {}
+        # Called with the new data_version whenever the data changes (e.g. to drop plot caches)
+        self._data_listeners = []
+        self.history = DataHistory()
+        self._redoing = False
+        memory_monitor.register_handler(self)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        # Any use of the data counts as activity, and brings a spilled dataset back; the lock
+        # keeps a spill from another thread from dropping the data between the two steps
+        self.last_access = time.monotonic()
+        with self._spill_lock:
+            if self._spill_path is not None:
+                self._restore_from_disk()
+            return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame):
+        with self._spill_lock:
+            self.last_access = time.monotonic()
+            self._df = df
+            self._discard_spill()
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._spill_path is not None
+
+    def spill_to_disk(self) -> int:
+        """
+        Moves the data to a temporary file (see core.memory.spill_frame) and drops the
+        caches; the data is reloaded, with the same dtypes, on its next use.
+        Returns the bytes freed (as accounted by get_column_memory_usage).
+        """
+        with self._spill_lock:
+            if self._df is None or self._spill_path is not None:
+                return 0
+            freed = int(self.get_column_memory_usage().sum()) + self.clear_caches()
+            if self._spill_directory is None:
+                self._spill_directory = tempfile.TemporaryDirectory(prefix='helwan-insight-spill-')
+            self._spill_path = spill_frame(self._df, self._spill_directory.name, str(self.data_version))
+            self._spill_dtypes = self._df.dtypes
+            self._df = None
+            return freed
+
+    def _restore_from_disk(self):
+        with self._spill_lock:
+            if self._spill_path is None:
+                return
+            self._df = load_spilled_frame(self._spill_path, self._spill_dtypes)
+            self._discard_spill()
+
+    def _discard_spill(self):
+        if self._spill_path is not None:
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                pass
+            self._spill_path = self._spill_dtypes = None
+
+    def get_column_memory_usage(self) -> pd.Series:
+        """
+        Bytes used by each column (index included), measured once per data version.
+        Columns of Python objects are measured on MEMORY_SAMPLE_ROWS evenly spaced rows, as
+        measuring every object takes seconds on millions of rows; other columns are exact.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded.")
+        usage = self._memory_usage_cache.get(self.data_version)
+        if usage is None:
+            df = self.df
+            sizes = {'Index': df.index.memory_usage(deep=len(df) <= MEMORY_SAMPLE_ROWS)}
+            for position, column in enumerate(df.columns):
+                values = df.iloc[:, position]
+                holds_objects = pd.api.types.is_object_dtype(values) or (
+                    isinstance(values.dtype, pd.StringDtype) and values.dtype.storage == 'python')
+                if holds_objects and len(values) > MEMORY_SAMPLE_ROWS:
+                    sample = values.iloc[np.linspace(0, len(values) - 1, MEMORY_SAMPLE_ROWS).astype(np.intp)]
+                    sizes[column] = int(sample.memory_usage(deep=True, index=False) * len(values) / len(sample))
+                else:
+                    sizes[column] = values.memory_usage(deep=True, index=False)
+            usage = pd.Series(sizes, dtype='int64')
+            self._memory_usage_cache = {self.data_version: usage}
+        return usage
+
+    def estimate_operation_memory(self, columns: list = None, copies: int = 2) -> int:
+        """
+        Rough extra memory an operation needs: copies of the columns it rewrites (all of
+        them when columns is None), e.g. the new values plus their undo copy.
+        """
+        if self._df is None and self._spill_path is None:
+            return 0
+        usage = self.get_column_memory_usage()
+        if columns is not None:
+            usage = usage.reindex(columns, fill_value=0)
+        return int(usage.sum()) * copies
+
+    def get_cache_sizes(self) -> dict:
+        """Approximate bytes held by each of the caches derived from the data."""
+        sizes = {}
+        for attribute in _CACHE_ATTRIBUTES:
+            cache = getattr(self, attribute)
+            sizes[attribute.strip('_')] = estimate_size(cache) if cache else 0
+        return sizes
+
+    def clear_caches(self) -> int:
+        """Empties the caches derived from the data; returns the bytes freed."""
+        freed = sum(self.get_cache_sizes().values())
+        self._clear_caches()
+        return freed
+
+    def _clear_caches(self):
+        for attribute in _CACHE_ATTRIBUTES:
+            getattr(self, attribute).clear()
 
     def load_data(self) -> pd.DataFrame:
         if not self.file_path:
@@ -16,20 +182,108 @@ class DataHandler:
             try:
                 self.df = pd.read_csv(self.file_path)
             except Exception as e:
-                raise ValueError(f"Failed to load CSV file: {e}")
+                raise ValueError(f"Failed to load CSV file: {e}") from e
         elif self.file_path.endswith(('.xlsx', '.xls')):
             try:
                 self.df = pd.read_excel(self.file_path)
             except Exception as e:
-                raise ValueError(f"Failed to load Excel file: {e}")
+                raise ValueError(f"Failed to load Excel file: {e}") from e
         else:
             raise ValueError("Unsupported file type. Please load a .csv, .xlsx, or .xls file.")
         
         if self.df is None or self.df.empty:
             raise ValueError("The loaded file is empty or contains no valid data.")
         
+        self.history.clear()
+        self._mark_data_changed()
         return self.df
 
+    def _mark_data_changed(self):
+        self.data_version += 1
+        self._clear_caches()
+        for listener in list(self._data_listeners):
+            listener(self.data_version)
+
+    def add_data_listener(self, callback):
+        if callback not in self._data_listeners:
+            self._data_listeners.append(callback)
+
+    def remove_data_listener(self, callback):
+        if callback in self._data_listeners:
+            self._data_listeners.remove(callback)
+
+    def _record(self, entry: HistoryEntry = None):
+        # A redo re-runs the operation; it must not discard the rest of the redo stack.
+        # Without history (max_depth 0) callers pass no entry at all
+        if entry is not None and self.history.enabled:
+            self.history.record(entry, clear_redo=not self._redoing)
+        self._mark_data_changed()
+
+    def _replace_columns(self, new_columns: dict, operation: str, params: dict):
+        """
+        Replaces whole columns instead of writing into them, so the previous column objects
+        can be kept for undo without copying (the other columns are not touched at all).
+        Their size is taken from the (sampled, cached) column memory usage.
+        """
+        entry = None
+        if self.history.enabled:
+            old_columns = {column: self.df[column] for column in new_columns}
+            nbytes = self.get_column_memory_usage().reindex(list(old_columns), fill_value=0).sum()
+            entry = HistoryEntry.columns(operation, params, old_columns, nbytes)
+        for column, values in new_columns.items():
+            self.df[column] = values
+        self._record(entry)
+
+    def _drop_rows(self, drop_mask, operation: str, params: dict) -> int:
+        """Removes the masked rows, keeping only those rows (and their positions) for undo."""
+        drop_mask = np.asarray(drop_mask, dtype=bool)
+        removed_positions = np.flatnonzero(drop_mask)
+        entry = None
+        if self.history.enabled:
+            removed_rows = self.df.iloc[removed_positions]
+            row_bytes = self.get_column_memory_usage().sum() / max(len(self.df), 1)
+            entry = HistoryEntry.rows(operation, params, removed_rows, removed_positions,
+                                      row_bytes * len(removed_positions) + removed_positions.nbytes)
+        if len(removed_positions):
+            self.df = self.df[~drop_mask]
+        self._record(entry)
+        return len(removed_positions)
+
+    def undo(self) -> dict:
+        """Reverts the most recent operation and returns its description."""
+        if self.df is None:
+            raise ValueError("No data loaded.")
+        entry = self.history.pop_undo()
+        self.df = entry.apply_undo(self.df)
+        self.history.push_redo(entry)
+        self._mark_data_changed()
+        return entry.describe()
+
+    def redo(self) -> dict:
+        """Re-applies the most recently undone operation and returns its description."""
+        if self.df is None:
+            raise ValueError("No data loaded.")
+        entry = self.history.pop_redo()
+        self._redoing = True
+        try:
+            getattr(self, entry.operation)(**entry.params)
+        except Exception:
+            self.history.redo_stack.append(entry)
+            raise
+        finally:
+            self._redoing = False
+        return entry.describe()
+
+    def can_undo(self) -> bool:
+        return self.history.can_undo()
+
+    def can_redo(self) -> bool:
+        return self.history.can_redo()
+
+    def get_operation_log(self) -> list:
+        """The operations applied since loading (undone ones excluded), oldest first."""
+        return self.history.operation_log()
+
     def get_dataframe(self) -> pd.DataFrame:
         if self.df is None:
             raise ValueError("No data has been loaded yet. Please call load_data() first.")
@@ -87,19 +341,42 @@ class DataHandler:
             raise ValueError("No data has been loaded yet.")
         return self.df.describe()
 
+    def get_column_profile(self) -> pd.DataFrame:
+        """
+        One row per column: dtype, detected type (see detect_column_type), non-missing,
+        missing and unique counts, and mean/std/min/max for numerical columns.
+        """
+        if self.df is None:
+            raise ValueError("No data has been loaded yet.")
+        non_missing = self.df.notna().sum()
+        numerical_df = self.df.select_dtypes(include=np.number)
+        profile = pd.DataFrame({
+            'Column': self.df.columns,
+            'Dtype': [str(dtype) for dtype in self.df.dtypes],
+            'Type': [self.detect_column_type(self.df[column]) for column in self.df.columns],
+            'Non-Missing': non_missing.values,
+            'Missing': len(self.df) - non_missing.values,
+            'Unique': self.df.nunique().values,
+        })
+        for name, values in (('Mean', numerical_df.mean()), ('Std', numerical_df.std()),
+                             ('Min', numerical_df.min()), ('Max', numerical_df.max())):
+            profile[name] = values.reindex(self.df.columns).values
+        return profile
+
     def handle_missing_values(self, strategy: str, column: str = None, fill_value=None):
         if self.df is None:
             raise ValueError("No data loaded to handle missing values.")
 
+        params = {'strategy': strategy, 'column': column, 'fill_value': fill_value}
+
         if strategy == 'drop_rows':
             if column:
-                original_rows = self.df.shape[0]
-                self.df.dropna(subset=[column], inplace=True)
-                return original_rows - self.df.shape[0]
+                if column not in self.df.columns:
+                    raise ValueError(f"Column '{column}' not found.")
+                drop_mask = self.df[column].isnull()
             else:
-                original_rows = self.df.shape[0]
-                self.df.dropna(inplace=True)
-                return original_rows - self.df.shape[0]
+                drop_mask = self.df.isnull().any(axis=1)
+            return self._drop_rows(drop_mask, 'handle_missing_values', params)
 
         elif strategy.startswith('fill_'):
             if not column:
@@ -112,39 +389,145 @@ class DataHandler:
             initial_missing = col_data.isnull().sum()
 
             if initial_missing == 0:
+                self._record(HistoryEntry.columns('handle_missing_values', params, {}))
                 return 0
 
             if strategy == 'fill_mean':
                 if pd.api.types.is_numeric_dtype(col_data):
-                    self.df[column].fillna(col_data.mean(), inplace=True)
+                    filled = col_data.fillna(col_data.mean())
                 else:
                     raise ValueError(f"Column '{column}' is not numeric for 'fill_mean' strategy.")
             elif strategy == 'fill_median':
                 if pd.api.types.is_numeric_dtype(col_data):
-                    self.df[column].fillna(col_data.median(), inplace=True)
+                    filled = col_data.fillna(col_data.median())
                 else:
                     raise ValueError(f"Column '{column}' is not numeric for 'fill_median' strategy.")
             elif strategy == 'fill_mode':
-                self.df[column].fillna(col_data.mode()[0], inplace=True)
+                filled = col_data.fillna(col_data.mode()[0])
             elif strategy == 'fill_value':
                 if fill_value is None:
                     raise ValueError("Fill value must be provided for 'fill_value' strategy.")
-                try:
-                    # Attempt to convert fill_value to the column's dtype
-                    if pd.api.types.is_numeric_dtype(col_data):
-                        fill_value = pd.to_numeric(fill_value)
-                    elif pd.api.types.is_datetime64_any_dtype(col_data):
-                        fill_value = pd.to_datetime(fill_value)
-                except ValueError:
-                    pass # If conversion fails, use original fill_value
-
-                self.df[column].fillna(fill_value, inplace=True)
+                filled = col_data.fillna(self._coerce_fill_value(col_data, fill_value))
+            else:
+                raise ValueError(f"Unsupported missing value strategy: {strategy}")
             
+            self._replace_columns({column: filled}, 'handle_missing_values', params)
             return initial_missing
 
         else:
             raise ValueError(f"Unsupported missing value strategy: {strategy}")
 
+    @staticmethod
+    def _coerce_fill_value(col_data: pd.Series, fill_value):
+        try:
+            # Attempt to convert fill_value to the column's dtype
+            if pd.api.types.is_numeric_dtype(col_data):
+                return pd.to_numeric(fill_value)
+            elif pd.api.types.is_datetime64_any_dtype(col_data):
+                return pd.to_datetime(fill_value)
+        except ValueError:
+            pass # If conversion fails, use original fill_value
+        return fill_value
+
+    def impute_missing_values(self, strategies: dict, fill_values: dict = None, group_by: list = None) -> dict:
+        """
+        Fills missing values in several columns at once.
+        strategies maps a column to one of IMPUTATION_STRATEGIES; fill_values gives the value
+        for 'fill_value' columns. With group_by, means, medians, modes, forward/back fills and
+        interpolation are computed within each group of the key columns (rows with a missing
+        key are left alone).
+        All statistics are computed in one reduction per strategy and the filled columns
+        replace the old ones in a single step (one undo entry).
+        Returns {column: number of values filled}.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded to handle missing values.")
+        if not strategies:
+            raise ValueError("Please select at least one column to fill.")
+        fill_values = dict(fill_values or {})
+        group_by = list(group_by) if group_by else None
+
+        for column, strategy in strategies.items():
+            if column not in self.df.columns:
+                raise ValueError(f"Column '{column}' not found.")
+            if strategy not in IMPUTATION_STRATEGIES:
+                raise ValueError(f"Unsupported missing value strategy: {strategy}")
+            if strategy in _NUMERICAL_ONLY_STRATEGIES and not pd.api.types.is_numeric_dtype(self.df[column]):
+                raise ValueError(f"Column '{column}' is not numeric for '{strategy}' strategy.")
+            if strategy == 'fill_value' and fill_values.get(column) is None:
+                raise ValueError(f"Fill value must be provided for 'fill_value' strategy (column '{column}').")
+            if group_by and column in group_by:
+                raise ValueError(f"Column '{column}' is a group key and cannot be filled by group.")
+
+        params = {'strategies': dict(strategies), 'fill_values': fill_values or None, 'group_by': group_by}
+        missing_before = self.df[list(strategies)].isnull().sum()
+        targets = [column for column in strategies if missing_before[column] > 0]
+        by_strategy = {}
+        for column in targets:
+            by_strategy.setdefault(strategies[column], []).append(column)
+
+        if group_by:
+            new_columns = self._impute_by_group(by_strategy, fill_values, group_by)
+        else:
+            new_columns = {}
+            # Scalar fills: one reduction per statistic, then a single fillna(dict)
+            scalar_fills = {}
+            if 'fill_mean' in by_strategy:
+                scalar_fills.update(self.df[by_strategy['fill_mean']].mean())
+            if 'fill_median' in by_strategy:
+                scalar_fills.update(self.df[by_strategy['fill_median']].median())
+            if 'fill_mode' in by_strategy:
+                modes = self.df[by_strategy['fill_mode']].mode(dropna=True)
+                if len(modes):
+                    scalar_fills.update(modes.iloc[0])
+            for column in by_strategy.get('fill_value', []):
+                scalar_fills[column] = self._coerce_fill_value(self.df[column], fill_values[column])
+            scalar_fills = {column: value for column, value in scalar_fills.items() if pd.notna(value)}
+            if scalar_fills:
+                new_columns.update(self.df[list(scalar_fills)].fillna(scalar_fills).items())
+            if 'ffill' in by_strategy:
+                new_columns.update(self.df[by_strategy['ffill']].ffill().items())
+            if 'bfill' in by_strategy:
+                new_columns.update(self.df[by_strategy['bfill']].bfill().items())
+            if 'interpolate' in by_strategy:
+                new_columns.update(self.df[by_strategy['interpolate']].interpolate().items())
+
+        filled_counts = {column: int(missing_before[column] - new_columns[column].isnull().sum())
+                         for column in new_columns}
+        self._replace_columns(new_columns, 'impute_missing_values', params)
+        return filled_counts
+
+    def _impute_by_group(self, by_strategy: dict, fill_values: dict, group_by: list) -> dict:
+        group_index = self.get_group_index(group_by)
+        codes = group_index.codes
+        in_group = codes >= 0
+        own_rows = np.arange(len(self.df))
+        new_columns = {}
+        for strategy, columns in by_strategy.items():
+            for column in columns:
+                col_data = self.df[column]
+                missing = col_data.isnull().to_numpy()
+                if strategy == 'fill_value':
+                    new_columns[column] = col_data.fillna(self._coerce_fill_value(col_data, fill_values[column]))
+                    continue
+                if strategy in ('fill_mean', 'fill_median'):
+                    agg = strategy[len('fill_'):]
+                    group_values = group_index.aggregate(col_data, [agg])[agg]
+                    fill = np.where(in_group, group_values[np.maximum(codes, 0)], np.nan)
+                elif strategy == 'interpolate':
+                    fill = group_index.interpolate(col_data)
+                else:
+                    if strategy == 'fill_mode':
+                        mode_rows = group_index.mode_rows(col_data)
+                        source_rows = np.where(in_group, mode_rows[np.maximum(codes, 0)], -1)
+                        source_rows = np.where(source_rows >= 0, source_rows, own_rows)
+                    else:
+                        source_rows = group_index.fill_positions(~missing, strategy)
+                    # Taking values by row position keeps the column's dtype
+                    fill = col_data.to_numpy()[source_rows]
+                new_columns[column] = col_data.where(~missing, fill)
+        return new_columns
+
     def get_missing_values_summary(self) -> pd.DataFrame:
         if self.df is None:
             return pd.DataFrame(columns=['Column', 'Missing Count', 'Percentage'])
@@ -162,42 +545,170 @@ class DataHandler:
         })
         return missing_df.reset_index(drop=True)
 
-    def drop_duplicates(self) -> int:
+    def _duplicate_subset(self, subset: list = None) -> list:
+        if not subset:
+            return self.df.columns.tolist()
+        for column in subset:
+            if column not in self.df.columns:
+                raise ValueError(f"Column '{column}' not found.")
+        return list(subset)
+
+    def get_duplicate_groups(self, subset: list = None) -> np.ndarray:
+        """
+        Group id per row (-1 for rows without duplicates) comparing only the subset columns
+        (all columns by default). Rows are matched through 64-bit row hashes built from
+        per-column hashes, which are cached until the data changes, so checking several
+        key combinations hashes each column once. Hash matches are verified on the values.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded to find duplicates.")
+        subset = self._duplicate_subset(subset)
+        hashes = []
+        for column in subset:
+            cache_key = (column, self.data_version)
+            if cache_key not in self._column_hash_cache:
+                self._column_hash_cache[cache_key] = column_hash(self.df[column])
+            hashes.append(self._column_hash_cache[cache_key])
+        return duplicate_groups(self.df, subset, combine_hashes(hashes))
+
+    def _duplicate_mask(self, subset: list = None, keep: str = 'first') -> np.ndarray:
+        # The hashes only pay off once they are cached (e.g. after a duplicate report, or when
+        # trying several key combinations): hashing every column first is slower than pandas'
+        # duplicated(), which is therefore used while any subset column is not hashed yet
+        if keep not in DUPLICATE_KEEP_OPTIONS:
+            raise ValueError(f"Unsupported keep option: {keep}")
+        columns = self._duplicate_subset(subset)
+        if any((column, self.data_version) not in self._column_hash_cache for column in columns):
+            return self.df.duplicated(subset=columns, keep=False if keep == 'none' else keep).to_numpy()
+        return duplicate_mask(self.get_duplicate_groups(columns), keep)
+
+    def find_duplicates(self, subset: list = None, keep: str = 'first') -> pd.Series:
+        """
+        Boolean Series marking the rows drop_duplicates would remove. Uses the cached column
+        hashes of get_duplicate_groups when every subset column has them, and pandas'
+        duplicated() otherwise (faster on a first call, but it caches nothing).
+        """
+        if self.df is None:
+            raise ValueError("No data loaded to find duplicates.")
+        return pd.Series(self._duplicate_mask(subset, keep), index=self.df.index)
+
+    def get_duplicate_report(self, subset: list = None) -> pd.DataFrame:
+        """One line per group of duplicate rows (key values, number of copies, row labels)."""
+        group_ids = self.get_duplicate_groups(subset)
+        return duplicate_report(self.df, self._duplicate_subset(subset), group_ids)
+
+    def drop_duplicates(self, subset: list = None, keep: str = 'first') -> int:
+        """
+        Removes duplicate rows, comparing only the subset columns (all by default).
+        keep is 'first', 'last' or 'none' (remove every copy). Returns the number of rows removed.
+        """
         if self.df is None:
             raise ValueError("No data loaded to remove duplicates.")
+        if keep not in DUPLICATE_KEEP_OPTIONS:
+            raise ValueError(f"Unsupported keep option: {keep}")
         
-        original_rows = self.df.shape[0]
-        self.df.drop_duplicates(inplace=True)
-        return original_rows - self.df.shape[0]
+        params = {'subset': list(subset) if subset else None, 'keep': keep}
+        return self._drop_rows(self._duplicate_mask(subset, keep), 'drop_duplicates', params)
+
+    def _convert_column(self, column: str, new_type: str, format: str = None, decimal: str = None,
+                        thousands: str = None) -> dict:
+        # The last conversion is cached, so a preview (get_conversion_report) followed by the
+        # actual change parses the column only once
+        cache_key = (column, new_type, format, decimal, thousands, self.data_version)
+        if cache_key in self._conversion_cache:
+            return self._conversion_cache[cache_key]
+        original = self.df[column]
+        if new_type in ('int', 'float'):
+            result = to_numeric(original, decimal=decimal, thousands=thousands)
+            if new_type == 'int' and not pd.api.types.is_integer_dtype(result["values"]):
+                # A number with a fractional part (or out of the int64 range) fails like text
+                # that is not a number, rather than being truncated or rounded
+                values = result["values"]
+                numbers = values.to_numpy(dtype=float, na_value=np.nan)
+                integral = np.isfinite(numbers) & (numbers == np.trunc(numbers)) & (np.abs(numbers) < 2.0 ** 63)
+                not_integral = ~np.isnan(numbers) & ~integral
+                if not_integral.any():
+                    result = dict(result, values=values.mask(not_integral), failed=result["failed"] | not_integral)
+        elif new_type == 'datetime':
+            result = to_datetime(original, format=format)
+        elif new_type == 'str':
+            result = {"values": original.astype(str), "failed": np.zeros(len(original), dtype=bool)}
+        else:
+            raise ValueError(f"Unsupported new type: {new_type}")
+        self._conversion_cache.clear()
+        self._conversion_cache[cache_key] = result
+        return result
+
+    def get_conversion_report(self, column: str, new_type: str, format: str = None, max_rows: int = 100) -> dict:
+        """
+        Previews change_column_type without changing the data. Returns the number of values
+        that would fail to convert, up to max_rows of them (row label and original value),
+        and the datetime format or number separators that were detected.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded to change column type.")
+        if column not in self.df.columns:
+            raise ValueError(f"Column '{column}' not found.")
+        result = self._convert_column(column, new_type, format)
+        failed = result["failed"]
+        failed_rows = self.df[column][failed].head(max_rows)
+        return {
+            "column": column,
+            "new_type": new_type,
+            "converted": int(result["values"].notna().sum()),
+            "failed": int(failed.sum()),
+            "failed_rows": pd.DataFrame({'Row': failed_rows.index, 'Value': failed_rows.to_numpy()}),
+            "format": result.get("format"),
+            "decimal": result.get("decimal"),
+            "thousands": result.get("thousands"),
+        }
 
-    def change_column_type(self, column: str, new_type: str):
+    def change_column_type(self, column: str, new_type: str, errors: str = 'raise', format: str = None,
+                           decimal: str = None, thousands: str = None):
+        """
+        Converts a column to 'int', 'float', 'str' or 'datetime'.
+        Text is parsed by core.conversion: datetimes with an explicit (given or inferred)
+        format, numbers with thousands separators, decimal commas and Arabic-Indic digits.
+        The format and separators actually used are recorded in the operation log, so a
+        replayed pipeline parses new files the same way instead of inferring again.
+        For 'int', numbers with a fractional part (e.g. "2.7") cannot be converted: they are
+        never truncated or rounded. With errors='raise', values that cannot be converted
+        raise a ValueError naming their rows; with errors='coerce' they become missing (int
+        columns then use the nullable Int64 type). Missing values are never an error, except
+        for 'int' with errors='raise'.
+        """
         if self.df is None:
             raise ValueError("No data loaded to change column type.")
         if column not in self.df.columns:
             raise ValueError(f"Column '{column}' not found.")
+        if errors not in ('raise', 'coerce'):
+            raise ValueError(f"Unsupported errors option: {errors}")
 
         try:
-            if new_type == 'int':
-                # Convert to numeric first, then to int. Coerce errors to NaN.
-                self.df[column] = pd.to_numeric(self.df[column], errors='coerce')
-                # Check for any remaining NaNs after numeric conversion
-                if self.df[column].isnull().any():
-                     raise ValueError("Cannot convert column to integer: contains non-numeric or missing values. Please handle them first.")
-                self.df[column] = self.df[column].astype(int)
-            elif new_type == 'float':
-                self.df[column] = pd.to_numeric(self.df[column], errors='coerce')
-            elif new_type == 'str':
-                self.df[column] = self.df[column].astype(str)
-            elif new_type == 'datetime':
-                self.df[column] = pd.to_datetime(self.df[column], errors='coerce')
-                # Check for NaT (Not a Time) values introduced by errors
-                if self.df[column].isnull().any():
-                    num_errors = self.df[column].isnull().sum()
-                    raise ValueError(f"Cannot convert column to datetime: {num_errors} values could not be parsed as dates. Please check data format.")
-            else:
-                raise ValueError(f"Unsupported new type: {new_type}")
+            result = self._convert_column(column, new_type, format, decimal, thousands)
         except Exception as e:
             raise ValueError(f"Error converting column '{column}' to '{new_type}': {e}")
+
+        converted = result["values"]
+        failed = result["failed"]
+        if errors == 'raise' and failed.any():
+            failed_labels = self.df.index[failed]
+            listed = ", ".join(str(label) for label in failed_labels[:10]) + (", ..." if len(failed_labels) > 10 else "")
+            raise ValueError(f"Cannot convert column '{column}' to '{new_type}': {len(failed_labels)} values could not be converted (rows {listed}).")
+
+        if new_type == 'int':
+            if converted.isnull().any():
+                if errors == 'raise':
+                    raise ValueError("Cannot convert column to integer: contains non-numeric or missing values. Please handle them first.")
+                converted = converted.astype('Int64')
+            else:
+                converted = converted.astype(int)
+
+        # The column is only replaced once the whole conversion succeeded
+        self._replace_columns({column: converted}, 'change_column_type',
+                              {'column': column, 'new_type': new_type, 'errors': errors,
+                               'format': result.get("format") or format, 'decimal': result.get("decimal") or decimal,
+                               'thousands': result.get("thousands") if result.get("thousands") is not None else thousands})
             
     def rename_column(self, old_column_name: str, new_column_name: str):
         if self.df is None:
@@ -209,9 +720,12 @@ class DataHandler:
             raise ValueError(f"New column name '{new_column_name}' already exists.")
         
         try:
-            self.df.rename(columns={old_column_name: new_column_name}, inplace=True)
+            self.df = self.df.rename(columns={old_column_name: new_column_name})
         except Exception as e:
             raise ValueError(f"Error renaming column '{old_column_name}' to '{new_column_name}': {e}")
+        self._record(HistoryEntry.rename('rename_column',
+                                         {'old_column_name': old_column_name, 'new_column_name': new_column_name},
+                                         {old_column_name: new_column_name}))
 
     def get_basic_statistics(self, columns: list = None) -> pd.DataFrame:
         if self.df is None:
@@ -232,9 +746,163 @@ class DataHandler:
             
         return target_df.describe()
 
-    def perform_t_test(self, column1: str, column2: str) -> dict:
+    def get_fine_histogram(self, column: str) -> FineHistogram:
+        """
+        The fine-grained histogram of a numerical column (see core.histograms), built in
+        chunks on first use and cached per data version, so histograms with any bin count
+        or range are derived from it without rescanning the column.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded.")
+        if column not in self.df.columns:
+            raise ValueError(f"Column '{column}' not found.")
+        if not pd.api.types.is_numeric_dtype(self.df[column]):
+            raise ValueError(f"Column '{column}' is not numerical.")
+
+        cache_key = (column, self.data_version)
+        histogram = self._histogram_cache.get(cache_key)
+        if histogram is None:
+            values = self.df[column].to_numpy(dtype=float, na_value=np.nan)
+            histogram = FineHistogram.empty()
+            for start in range(0, len(values), HISTOGRAM_CHUNK_ROWS):
+                histogram = histogram.merge(FineHistogram.from_values(values[start:start + HISTOGRAM_CHUNK_ROWS]))
+            self._histogram_cache[cache_key] = histogram
+        return histogram
+
+    def get_histogram(self, column: str, bins: int = 20, value_range: tuple = None) -> dict:
+        """
+        Histogram of a numerical column with the given bin count over value_range (default:
+        the column's minimum to maximum). Returns {"counts", "edges", "missing"}.
+        """
+        histogram = self.get_fine_histogram(column)
+        counts, edges = histogram.rebin(bins, value_range)
+        return {"counts": counts, "edges": edges, "missing": histogram.missing}
+
+    def get_violin_densities(self, column: str, group_by: list = None, bandwidth: float = None,
+                             sort: bool = True) -> list:
+        """
+        Kernel density estimates of a numerical column for violin plots (see core.kde),
+        one for the whole column or one per group of the group_by columns, as a list of
+        (label, density) pairs; groups with fewer than two values are left out. Cached per
+        column, grouping, bandwidth (None = Scott's rule) and data version.
+        """
+        cache_key = (column, tuple(group_by or ()), bandwidth, sort, self.data_version)
+        densities = self._density_cache.get(cache_key)
+        if densities is not None:
+            return densities
+
+        if group_by:
+            labels, arrays = self.get_group_values(group_by, column, sort=sort)
+            densities = [(label, fft_kde(FineHistogram.from_values(values), bandwidth))
+                         for label, values in zip(labels, arrays) if len(values) >= 2]
+        else:
+            densities = [(column, fft_kde(self.get_fine_histogram(column), bandwidth))]
+        if not densities:
+            raise ValueError(f"Not enough values in '{column}' to estimate a density.")
+        self._density_cache[cache_key] = densities
+        return densities
+
+    def get_bootstrap_confidence_intervals(self, columns: list = None, n_resamples: int = 1000,
+                                           confidence_level: float = 0.95, seed: int = None,
+                                           n_jobs: int = None, progress_callback=None,
+                                           mp_context=None) -> dict:
+        """
+        Bootstrap confidence intervals for the mean, median and standard deviation of
+        numerical columns, plus pairwise correlations when several columns are selected.
+        Resamples are spread over a process pool; see core.resampling for details.
+        mp_context is the start method of that pool; pass 'spawn' from threads.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded to generate statistics.")
+
+        if not columns:
+            target_df = self.df.select_dtypes(include=np.number)
+        else:
+            for col in columns:
+                if col not in self.df.columns:
+                    raise ValueError(f"Column '{col}' not found in the DataFrame.")
+                if not pd.api.types.is_numeric_dtype(self.df[col]):
+                    raise ValueError(f"Column '{col}' is not numerical. Please select numerical columns for basic statistics.")
+            target_df = self.df[columns]
+
+        if target_df.empty:
+            raise ValueError("No numerical columns available for statistical analysis.")
+
+        return bootstrap_confidence_intervals(target_df, n_resamples=n_resamples,
+                                              confidence_level=confidence_level, seed=seed,
+                                              n_jobs=n_jobs, progress_callback=progress_callback,
+                                              mp_context=mp_context)
+
+    def get_group_index(self, keys: list, sort: bool = True) -> GroupIndex:
+        """
+        Returns the factorized group index for the given key columns, building it only once
+        per key set and data version. sort=False skips sorting the groups (faster for keys
+        with very many distinct values); groups then appear in order of first occurrence.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded to group by.")
+        if not keys:
+            raise ValueError("Please select at least one column to group by.")
+        for key in keys:
+            if key not in self.df.columns:
+                raise ValueError(f"Column '{key}' not found.")
+
+        cache_key = (tuple(keys), sort, self.data_version)
+        group_index = self._group_index_cache.get(cache_key)
+        if group_index is None:
+            group_index = GroupIndex.build(self.df, list(keys), sort=sort)
+            self._group_index_cache[cache_key] = group_index
+        return group_index
+
+    def group_by(self, keys: list, aggregations: dict, sort: bool = True) -> pd.DataFrame:
+        """
+        Computes per-group statistics.
+        aggregations maps a value column to a list of aggregation names
+        (see core.grouping.GROUP_AGGREGATIONS), e.g. {'price': ['mean', 'max']}.
+        Returns a DataFrame indexed by the group keys with one '<column> (<aggregation>)'
+        column per requested pair.
+        """
+        if not aggregations:
+            raise ValueError("Please select at least one column and aggregation.")
+        group_index = self.get_group_index(keys, sort=sort)
+
+        result = {}
+        for column, column_aggregations in aggregations.items():
+            if column not in self.df.columns:
+                raise ValueError(f"Column '{column}' not found.")
+            values = group_index.aggregate(self.df[column], list(column_aggregations))
+            for agg in column_aggregations:
+                result[f"{column} ({agg})"] = values[agg]
+        return pd.DataFrame(result, index=group_index.labels())
+
+    def get_group_values(self, keys: list, column: str, sort: bool = True) -> tuple:
+        """
+        Splits a numerical column by group, e.g. for per-group box plots or tests.
+        Returns (labels, arrays) with missing values removed from each array.
+        """
+        group_index = self.get_group_index(keys, sort=sort)
+        if column not in self.df.columns:
+            raise ValueError(f"Column '{column}' not found.")
+        if not pd.api.types.is_numeric_dtype(self.df[column]):
+            raise ValueError(f"Column '{column}' is not numerical.")
+
+        arrays = [values[~np.isnan(values)] for values in group_index.split(self.df[column].to_numpy(dtype=float, na_value=np.nan))]
+        labels = [" / ".join(str(v) for v in row) for row in group_index.groups.itertuples(index=False)]
+        return labels, arrays
+
+    def perform_t_test(self, column1: str, column2: str, method: str = 'parametric',
+                       n_permutations: int = 10000, seed: int = None, n_jobs: int = None,
+                       progress_callback=None, mp_context=None) -> dict:
+        """
+        Compares the means of two numerical columns.
+        method is 'parametric' (Welch's t-test), 'permutation' (shuffled group labels, stops
+        early once the p-value is resolved) or 'exact' (all label arrangements, small data only).
+        mp_context is the start method of the resampling workers; pass 'spawn' from threads.
+        """
         if self.df is None:
             raise ValueError("No data loaded to perform t-test.")
+        if method not in TEST_METHODS:
+            raise ValueError(f"Unsupported test method: {method}")
         
         if not all(col in self.df.columns for col in [column1, column2]):
             raise ValueError(f"One or both columns ('{column1}', '{column2}') not found.")
@@ -248,24 +916,48 @@ class DataHandler:
         if clean_df.empty:
             raise ValueError("No common non-missing data points for selected columns to perform t-test.")
 
+        # scipy.stats takes a while to import, so it is only loaded once a test is run
+        import scipy.stats as stats
+
         # Perform Independent Samples T-Test (Welch's t-test, which does not assume equal variances)
         t_statistic, p_value = stats.ttest_ind(clean_df[column1], clean_df[column2], equal_var=False)
+
+        permutation_result = {"n_permutations": None, "early_stopped": False}
+        if method != 'parametric':
+            permutation_result = permutation_t_test(clean_df[column1].to_numpy(), clean_df[column2].to_numpy(),
+                                                    exact=(method == 'exact'), n_permutations=n_permutations,
+                                                    seed=seed, n_jobs=n_jobs, progress_callback=progress_callback,
+                                                    mp_context=mp_context)
+            p_value = permutation_result["p_value"]
         
         return {
             "test_type": "Independent Samples T-Test",
+            "method": method,
             "column1": column1,
             "column2": column2,
             "t_statistic": t_statistic,
             "p_value": p_value,
+            "n_permutations": permutation_result["n_permutations"],
+            "early_stopped": permutation_result["early_stopped"],
             "interpretation": {
                 "en": f"The p-value ({p_value:.4f}) is {('less than' if p_value < 0.05 else 'greater than')} 0.05. Therefore, we {'reject' if p_value < 0.05 else 'fail to reject'} the null hypothesis. This suggests {'a significant difference' if p_value < 0.05 else 'no significant difference'} between the means of '{column1}' and '{column2}'.",
                 "ar": f"قيمة P ({p_value:.4f}) {'أقل من' if p_value < 0.05 else 'أكبر من'} 0.05. لذلك، نحن {'نرفض' if p_value < 0.05 else 'نفشل في رفض'} الفرضية الصفرية. هذا يشير إلى {'وجود فرق جوهري' if p_value < 0.05 else 'عدم وجود فرق جوهري'} بين متوسطي '{column1}' و '{column2}'."
             }
         }
 
-    def perform_chi_square_test(self, column1: str, column2: str) -> dict:
+    def perform_chi_square_test(self, column1: str, column2: str, method: str = 'parametric',
+                                n_permutations: int = 10000, seed: int = None, n_jobs: int = None,
+                                progress_callback=None, mp_context=None) -> dict:
+        """
+        Tests two categorical columns for independence.
+        method is 'parametric' (chi-square distribution), 'permutation' (shuffled labels,
+        stops early once the p-value is resolved) or 'exact' (Fisher's exact test, 2x2 tables only).
+        mp_context is the start method of the resampling workers, as for perform_t_test.
+        """
         if self.df is None:
             raise ValueError("No data loaded to perform Chi-Square test.")
+        if method not in TEST_METHODS:
+            raise ValueError(f"Unsupported test method: {method}")
         
         if not all(col in self.df.columns for col in [column1, column2]):
             raise ValueError(f"One or both columns ('{column1}', '{column2}') not found.")
@@ -281,15 +973,40 @@ class DataHandler:
         if contingency_table.empty:
             raise ValueError("Contingency table is empty. Check data for selected columns.")
 
+        import scipy.stats as stats
+
         # Perform Chi-Square test of independence
         chi2, p_value, dof, expected = stats.chi2_contingency(contingency_table)
+
+        n_permutations_run = None
+        early_stopped = False
+        if method == 'exact':
+            if contingency_table.shape != (2, 2):
+                raise ValueError("Exact test is only available for 2x2 contingency tables. Please use the permutation test instead.")
+            _, p_value = stats.fisher_exact(contingency_table.to_numpy())
+        elif method == 'permutation':
+            # The permutation statistic is computed without Yates' correction
+            chi2, _, _, expected = stats.chi2_contingency(contingency_table, correction=False)
+            pair = self.df[[column1, column2]].dropna()
+            x_codes = pd.Categorical(pair[column1], categories=contingency_table.index).codes
+            y_codes = pd.Categorical(pair[column2], categories=contingency_table.columns).codes
+            permutation_result = permutation_chi_square_test((x_codes, y_codes), expected, chi2,
+                                                             n_permutations=n_permutations, seed=seed,
+                                                             n_jobs=n_jobs, progress_callback=progress_callback,
+                                                             mp_context=mp_context)
+            p_value = permutation_result["p_value"]
+            n_permutations_run = permutation_result["n_permutations"]
+            early_stopped = permutation_result["early_stopped"]
         
         return {
             "test_type": "Chi-Square Test of Independence",
+            "method": method,
             "column1": column1,
             "column2": column2,
             "chi2_statistic": chi2,
             "p_value": p_value,
+            "n_permutations": n_permutations_run,
+            "early_stopped": early_stopped,
             "degrees_of_freedom": dof,
             "contingency_table": contingency_table.to_string(), # Convert to string for display
             "expected_frequencies": pd.DataFrame(expected, index=contingency_table.index, columns=contingency_table.columns).to_string(), # Convert to string for display
@@ -299,21 +1016,31 @@ class DataHandler:
             }
         }
     
-    def get_correlation_matrix(self) -> pd.DataFrame:
+    def get_correlation_matrix(self, cluster: bool = False) -> pd.DataFrame:
         """
         Calculates the Pearson correlation matrix for all numerical columns.
-        Returns a DataFrame representing the correlation matrix.
+        Returns a DataFrame representing the correlation matrix, with the columns in
+        hierarchical clustering order when cluster is set (see core.correlation).
+        Cached per data version.
         """
         if self.df is None:
             raise ValueError("No data loaded to calculate correlation.")
-        
+
+        cache_key = (cluster, self.data_version)
+        correlation_matrix = self._correlation_cache.get(cache_key)
+        if correlation_matrix is not None:
+            return correlation_matrix
+
         numerical_df = self.df.select_dtypes(include=np.number)
         
         if numerical_df.empty:
             raise ValueError("No numerical columns found to calculate correlation.")
-        
-        # Pearson correlation is the default for .corr()
-        correlation_matrix = numerical_df.corr(method='pearson')
+
+        if cluster:
+            correlation_matrix = clustered(self.get_correlation_matrix())
+        else:
+            correlation_matrix = pearson_matrix(numerical_df)
+        self._correlation_cache[cache_key] = correlation_matrix
         return correlation_matrix
 
     # --- دوال جديدة للتعامل مع القيم المتطرفة (Outliers) ---
@@ -350,6 +1077,38 @@ class DataHandler:
             return outliers[[column]].copy()
         return pd.DataFrame() # Return an empty DataFrame if no outliers are found
 
+    def get_outlier_summary(self, columns: list = None) -> pd.DataFrame:
+        """
+        IQR outlier bounds and counts for each numerical column (or the given columns),
+        computed for all columns at once.
+        """
+        if self.df is None:
+            raise ValueError("No data loaded to detect outliers.")
+        if columns:
+            for col in columns:
+                if col not in self.df.columns:
+                    raise ValueError(f"Column '{col}' not found.")
+                if not pd.api.types.is_numeric_dtype(self.df[col]):
+                    raise ValueError(f"Column '{col}' is not numerical. Outlier detection requires a numerical column.")
+            numerical_df = self.df[columns]
+        else:
+            numerical_df = self.df.select_dtypes(include=np.number)
+        if numerical_df.columns.empty:
+            raise ValueError("No numerical columns found to detect outliers.")
+
+        quartiles = numerical_df.quantile([0.25, 0.75])
+        iqr = quartiles.loc[0.75] - quartiles.loc[0.25]
+        lower_bound = quartiles.loc[0.25] - 1.5 * iqr
+        upper_bound = quartiles.loc[0.75] + 1.5 * iqr
+        outlier_counts = (numerical_df.lt(lower_bound) | numerical_df.gt(upper_bound)).sum()
+        return pd.DataFrame({
+            'Column': numerical_df.columns,
+            'Lower Bound': lower_bound.values,
+            'Upper Bound': upper_bound.values,
+            'Outlier Count': outlier_counts.values,
+            'Percentage': outlier_counts.values / len(self.df) * 100 if len(self.df) else 0.0,
+        })
+
     def handle_outliers(self, column: str, method: str):
         """
         Handles outliers in a numerical column using the IQR method.
@@ -372,23 +1131,20 @@ class DataHandler:
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
         
-        initial_rows = self.df.shape[0]
-        rows_affected = 0
-
         # Create a boolean mask for identifying outliers
         outlier_mask = (self.df[column] < lower_bound) | (self.df[column] > upper_bound)
+        params = {'column': column, 'method': method}
 
         if method == 'remove':
-            self.df = self.df[~outlier_mask].copy() # Use .copy() to avoid SettingWithCopyWarning
-            rows_affected = initial_rows - self.df.shape[0]
+            rows_affected = self._drop_rows(outlier_mask, 'handle_outliers', params)
         elif method == 'median':
             median_val = self.df[column].median()
             rows_affected = outlier_mask.sum()
-            self.df.loc[outlier_mask, column] = median_val
+            self._replace_columns({column: self.df[column].mask(outlier_mask, median_val)}, 'handle_outliers', params)
         elif method == 'mean':
             mean_val = self.df[column].mean()
             rows_affected = outlier_mask.sum()
-            self.df.loc[outlier_mask, column] = mean_val
+            self._replace_columns({column: self.df[column].mask(outlier_mask, mean_val)}, 'handle_outliers', params)
         else:
             raise ValueError(f"Unsupported outlier handling method: {method}")
         
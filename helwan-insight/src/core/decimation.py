@@ -0,0 +1,107 @@
+import numpy as np
+from matplotlib.dates import date2num
+
+# Above this many points per output point, lines are reduced with min/max decimation
+# (one vectorized pass) instead of LTTB (one loop iteration per bucket)
+LTTB_MAX_POINTS_PER_BUCKET = 20
+
+
+def _bucket_edges(n_points: int, n_buckets: int) -> np.ndarray:
+    return np.linspace(0, n_points, n_buckets + 1).astype(np.int64)
+
+
+def numeric_positions(values: np.ndarray) -> np.ndarray:
+    """
+    Float coordinates for x values: numbers as they are, datetimes as matplotlib date
+    numbers (the units of a date axis), anything else as row positions.
+    """
+    if np.issubdtype(values.dtype, np.datetime64):
+        return date2num(values)
+    if np.issubdtype(values.dtype, np.number) and not np.issubdtype(values.dtype, np.complexfloating):
+        return values.astype(float)
+    return np.arange(len(values), dtype=float)
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Splits the points into n_buckets runs of consecutive points and keeps the minimum and
+    maximum of each, so the drawn line covers exactly the same vertical range per pixel
+    column as the full data. Returns sorted indices (at most 2 * n_buckets).
+    """
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    edges = _bucket_edges(n, n_buckets)
+    starts = edges[:-1]
+    bucket_of = np.repeat(np.arange(n_buckets), np.diff(edges))
+    minima = np.minimum.reduceat(y, starts)
+    maxima = np.maximum.reduceat(y, starts)
+    # First position in each bucket that holds its minimum / maximum
+    is_min = np.flatnonzero(y == minima[bucket_of])
+    is_max = np.flatnonzero(y == maxima[bucket_of])
+    _, first_min = np.unique(bucket_of[is_min], return_index=True)
+    _, first_max = np.unique(bucket_of[is_max], return_index=True)
+    return np.union1d(is_min[first_min], is_max[first_max])
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: keeps the first and last points and, from each bucket
+    in between, the point forming the largest triangle with the previously kept point and
+    the average of the next bucket. Preserves the visual shape of a line far better than
+    taking every k-th point. Returns sorted indices (n_out of them).
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Bucket b spans edges[b]:edges[b + 1]; bucket 0 is the first point, bucket n_out - 1 the last
+    edges = np.r_[0, np.linspace(1, n - 1, n_out - 1).astype(np.int64), n]
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(1, n_out - 1):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        next_start, next_end = end, max(edges[bucket + 2], end + 1)
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs((x[previous] - average_x) * (bucket_y - y[previous])
+                       - (x[previous] - bucket_x) * (average_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket] = previous
+    return selected
+
+
+def decimate_line(x: np.ndarray, y: np.ndarray, n_pixels: int) -> np.ndarray:
+    """
+    Indices of the points to draw for a line n_pixels wide: all of them when they fit,
+    otherwise LTTB (about two points per pixel) or, for very long series, min/max per pixel.
+    x and y must be float arrays without NaNs.
+    """
+    n_pixels = max(int(n_pixels), 2)
+    budget = 2 * n_pixels
+    if len(y) <= budget:
+        return np.arange(len(y))
+    if len(y) > LTTB_MAX_POINTS_PER_BUCKET * budget:
+        return minmax_indices(y, n_pixels)
+    return lttb_indices(x, y, budget)
+
+
+def density_grid(x: np.ndarray, y: np.ndarray, bins: tuple, x_range: tuple = None, y_range: tuple = None) -> tuple:
+    """
+    Counts points per cell of a bins[0] x bins[1] grid (a 2-D histogram computed with one
+    bincount). Returns (counts with shape (bins[0], bins[1]), x_edges, y_edges).
+    """
+    nx, ny = max(int(bins[0]), 1), max(int(bins[1]), 1)
+    x_low, x_high = x_range if x_range else (float(x.min()), float(x.max()))
+    y_low, y_high = y_range if y_range else (float(y.min()), float(y.max()))
+    if x_high <= x_low:
+        x_high = x_low + 1.0
+    if y_high <= y_low:
+        y_high = y_low + 1.0
+    x_cells = np.clip(((x - x_low) / (x_high - x_low) * nx).astype(np.int64), 0, nx - 1)
+    y_cells = np.clip(((y - y_low) / (y_high - y_low) * ny).astype(np.int64), 0, ny - 1)
+    counts = np.bincount(x_cells * ny + y_cells, minlength=nx * ny).reshape(nx, ny)
+    return counts, np.linspace(x_low, x_high, nx + 1), np.linspace(y_low, y_high, ny + 1)
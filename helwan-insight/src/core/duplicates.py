@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+# Values accepted for the keep argument of duplicate removal ('none' drops every copy)
+DUPLICATE_KEEP_OPTIONS = ('first', 'last', 'none')
+
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def column_hash(series: pd.Series, numbers_as_float: bool = False) -> np.ndarray:
+    """
+    A 64-bit hash per value of a column. Numbers are normalized so -0.0 and 0.0 hash alike
+    (duplicated() treats them as equal); with numbers_as_float, integer columns hash like
+    the same values stored as floats (e.g. when one chunk of a file has missing values).
+    """
+    if pd.api.types.is_float_dtype(series) or (
+            numbers_as_float and pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)):
+        series = series.astype(float) + 0.0
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def combine_hashes(hashes: list) -> np.ndarray:
+    """Combines per-column hashes into one hash per row (order-dependent)."""
+    combined = np.zeros(len(hashes[0]) if hashes else 0, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column_hashes in hashes:
+            combined = (combined * _HASH_MULTIPLIER) ^ column_hashes
+    return combined
+
+
+def row_hashes(df: pd.DataFrame, columns: list = None, numbers_as_float: bool = False) -> np.ndarray:
+    columns = list(df.columns) if columns is None else list(columns)
+    return combine_hashes([column_hash(df[column], numbers_as_float) for column in columns])
+
+
+def _values_equal(left: pd.Series, right: pd.Series) -> np.ndarray:
+    # Element-wise equality where two missing values count as equal, as in duplicated()
+    left = left.reset_index(drop=True)
+    right = right.reset_index(drop=True)
+    same = left.eq(right).fillna(False).to_numpy(dtype=bool)
+    return same | (left.isna().to_numpy() & right.isna().to_numpy())
+
+
+def duplicate_groups(df: pd.DataFrame, columns: list, hashes: np.ndarray) -> np.ndarray:
+    """
+    Assigns every row that has at least one duplicate (on the given columns) a dense group
+    id, and -1 to unique rows. Rows are grouped by their 64-bit hash; every candidate row is
+    then compared with the first row of its hash group, and the (very rare) groups that
+    turn out to contain a hash collision are split exactly.
+    """
+    hash_codes, _ = pd.factorize(hashes, sort=False)
+    counts = np.bincount(hash_codes, minlength=1)
+    candidates = np.flatnonzero(counts[hash_codes] > 1)
+    group_ids = np.full(len(df), -1, dtype=np.int64)
+    if candidates.size == 0:
+        return group_ids
+
+    candidate_codes = hash_codes[candidates]
+    first_row = np.full(len(counts), -1, dtype=np.int64)
+    # Assigning in reverse leaves each hash group's first row in place
+    first_row[candidate_codes[::-1]] = candidates[::-1]
+    representatives = first_row[candidate_codes]
+
+    matches = np.ones(len(candidates), dtype=bool)
+    for column in columns:
+        values = df[column]
+        matches &= _values_equal(values.iloc[candidates], values.iloc[representatives])
+
+    if matches.all():
+        candidate_groups, _ = pd.factorize(candidate_codes, sort=False)
+    else:
+        # Hash collision: group the candidate rows exactly on their values
+        candidate_groups = (df.iloc[candidates][columns]
+                            .groupby(columns, dropna=False, sort=False).ngroup().to_numpy())
+        sizes = np.bincount(candidate_groups)
+        still_duplicated = sizes[candidate_groups] > 1
+        candidates = candidates[still_duplicated]
+        candidate_groups, _ = pd.factorize(candidate_groups[still_duplicated], sort=False)
+    group_ids[candidates] = candidate_groups
+    return group_ids
+
+
+def duplicate_mask(group_ids: np.ndarray, keep: str = 'first') -> np.ndarray:
+    """The rows to remove: every copy but the first or last one of each group, or all copies."""
+    if keep not in DUPLICATE_KEEP_OPTIONS:
+        raise ValueError(f"Unsupported keep option: {keep}")
+    mask = group_ids >= 0
+    if keep == 'none' or not mask.any():
+        return mask
+    positions = np.flatnonzero(mask)
+    ids = group_ids[positions]
+    # Group ids are dense, so the kept row of each group is found by assignment (the last
+    # write wins) instead of sorting
+    kept = np.empty(ids.max() + 1, dtype=np.intp)
+    if keep == 'first':
+        kept[ids[::-1]] = positions[::-1]
+    else:
+        kept[ids] = positions
+    mask[kept] = False
+    return mask
+
+
+def duplicate_report(df: pd.DataFrame, columns: list, group_ids: np.ndarray, max_rows_listed: int = 10) -> pd.DataFrame:
+    """
+    One line per duplicate group, largest first: the key values, the number of copies
+    and the index labels of (up to max_rows_listed of) the rows involved.
+    """
+    positions = np.flatnonzero(group_ids >= 0)
+    if positions.size == 0:
+        return pd.DataFrame(columns=list(columns) + ['Count', 'Rows'])
+    ids = group_ids[positions]
+    order = np.argsort(ids, kind='stable')
+    positions, ids = positions[order], ids[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(ids)) + 1]
+    counts = np.diff(np.r_[starts, len(ids)])
+
+    index_labels = df.index.to_numpy()[positions]
+    row_lists = []
+    for start, count in zip(starts, counts):
+        listed = ", ".join(str(label) for label in index_labels[start:start + min(count, max_rows_listed)])
+        row_lists.append(listed + (", ..." if count > max_rows_listed else ""))
+
+    report = df.iloc[positions[starts]][list(columns)].reset_index(drop=True)
+    report['Count'] = counts
+    report['Rows'] = row_lists
+    return report.sort_values('Count', ascending=False, kind='stable').reset_index(drop=True)
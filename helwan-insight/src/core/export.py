@@ -0,0 +1,175 @@
+import os
+import re
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from core.parallel import map_in_processes
+from core.plotting import prepare_plot_data, draw_plot
+
+# Formats of export_plots: one file per chart in a folder, or every chart as a page of one PDF
+EXPORT_FORMATS = ('png', 'svg', 'pdf', 'multipage_pdf')
+
+# Size (inches) and resolution of exported charts, as for saving the current plot
+EXPORT_FIGURE_SIZE = (10, 6)
+EXPORT_DPI = 300
+
+# Rows (one per column) of the summary statistics table on one exported page
+STATISTICS_ROWS_PER_PAGE = 25
+
+# The frame and translation function shared with the worker processes, set once per
+# worker by _init_export_worker
+_export_data = {}
+
+
+def _init_export_worker(data: dict):
+    global _export_data
+    _export_data = data
+
+
+def default_plot_type(series: pd.Series) -> str:
+    """The plot a column is exported as: histograms for numbers, lines for dates, bars otherwise."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'line'
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return 'histogram'
+    return 'bar'
+
+
+def _file_name(index: int, *parts) -> str:
+    # Numbered so the files sort in report order; characters unsafe in file names replaced
+    name = "_".join(str(part) for part in parts if part is not None)
+    return f"{index:03d}_" + re.sub(r'[^\w.-]+', '_', name).strip('_')
+
+
+def export_items(df: pd.DataFrame, columns: list = None, include_heatmap: bool = True,
+                 include_statistics: bool = True) -> list:
+    """
+    The charts of a report, in order: summary statistics tables, the correlation heatmap
+    and the default plot of each column, all of the given columns (default: every column).
+    """
+    if df is None or df.empty:
+        raise ValueError("No data available to export.")
+    columns = list(df.columns) if columns is None else list(columns)
+    for column in columns:
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found.")
+    numerical_df = df[columns].select_dtypes(include=['number'])
+
+    items = []
+    if include_statistics and not numerical_df.empty:
+        statistics = numerical_df.describe().T
+        pages = range(0, len(statistics), STATISTICS_ROWS_PER_PAGE)
+        for page, start in enumerate(pages, start=1):
+            items.append({"kind": "statistics", "table": statistics.iloc[start:start + STATISTICS_ROWS_PER_PAGE],
+                          "page": page, "pages": len(pages)})
+    if include_heatmap and len(numerical_df.columns) > 1:
+        items.append({"kind": "plot", "plot_type": 'heatmap', "column": None})
+    items += [{"kind": "plot", "plot_type": default_plot_type(df[column]), "column": column} for column in columns]
+    for index, item in enumerate(items, start=1):
+        if item["kind"] == "statistics":
+            item["name"] = _file_name(index, "statistics", item["page"])
+        else:
+            item["name"] = _file_name(index, item["plot_type"], item["column"])
+    return items
+
+
+def _draw_statistics_table(figure: Figure, item: dict, _):
+    ax = figure.add_subplot(111)
+    ax.axis('off')
+    table = item["table"]
+    cells = [[f"{value:.4g}" for value in row] for row in table.to_numpy(dtype=float)]
+    drawn = ax.table(cellText=cells, rowLabels=[str(label) for label in table.index],
+                     colLabels=[_(str(label)) for label in table.columns], loc='center')
+    drawn.auto_set_font_size(False)
+    drawn.set_fontsize(8)
+    title = _("Summary Statistics")
+    if item["pages"] > 1:
+        title += " " + _("(page {page} of {pages})").format(page=item["page"], pages=item["pages"])
+    ax.set_title(title)
+
+
+def _draw_item(item: dict) -> Figure:
+    figure = Figure(figsize=EXPORT_FIGURE_SIZE, dpi=EXPORT_DPI)
+    translate = _export_data.get("translate")
+    if item["kind"] == "statistics":
+        _draw_statistics_table(figure, item, translate or (lambda text: text))
+        return figure
+    # Line and scatter plots are decimated to the exported pixel size
+    options = {"pixel_size": (EXPORT_FIGURE_SIZE[0] * EXPORT_DPI, EXPORT_FIGURE_SIZE[1] * EXPORT_DPI)}
+    data = prepare_plot_data(item["plot_type"], item["column"], _export_data["df"], options)
+    draw_plot(figure, item["plot_type"], item["column"], data, translate, options)
+    return figure
+
+
+def _export_item(task: tuple):
+    # (item, path, file format): writes the chart to path, or returns the figure when path
+    # is None (pages of a multi-page PDF are written by the calling process, in order).
+    # Charts the data does not suit are reported instead of failing the whole export.
+    item, path, file_format = task
+    try:
+        figure = _draw_item(item)
+    except ValueError as e:
+        return ('skipped', str(e))
+    if path is None:
+        return ('figure', figure)
+    figure.savefig(path, format=file_format, dpi=EXPORT_DPI)
+    return ('file', path)
+
+
+def export_plots(df: pd.DataFrame, output_path: str, file_format: str = 'png', columns: list = None,
+                 include_heatmap: bool = True, include_statistics: bool = True, translate=None,
+                 n_jobs: int = None, progress_callback=None, mp_context=None) -> dict:
+    """
+    Renders the charts of export_items with the Agg backend across worker processes,
+    either as one file per chart in the output_path folder or, for 'multipage_pdf', as
+    the pages of the PDF file output_path. progress_callback is called as
+    (completed, total); mp_context is the start method of the workers (see
+    map_in_processes), translate must then be picklable. Returns {"files", "pages",
+    "skipped"}, skipped being (chart name, reason) pairs for charts the data does not suit.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    items = export_items(df, columns, include_heatmap, include_statistics)
+    if file_format == 'multipage_pdf':
+        tasks = [(item, None, 'pdf') for item in items]
+    else:
+        os.makedirs(output_path, exist_ok=True)
+        tasks = [(item, os.path.join(output_path, f"{item['name']}.{file_format}"), file_format) for item in items]
+
+    files, skipped = [], []
+    pages = next_index = 0
+    pdf = None
+    if file_format == 'multipage_pdf':
+        from matplotlib.backends.backend_pdf import PdfPages  # slow to import, rarely needed
+        pdf = PdfPages(output_path)
+    # Charts arrive in completion order; each is held until the ones before it are collected
+    waiting = {}
+
+    def collect(task_index: int, result: tuple):
+        nonlocal pages, next_index
+        waiting[task_index] = result
+        while next_index in waiting:
+            index = next_index
+            kind, value = waiting.pop(index)
+            if kind == 'skipped':
+                skipped.append((items[index]["name"], value))
+            elif kind == 'figure':
+                pdf.savefig(value)
+                pages += 1
+            else:
+                files.append(value)
+            next_index += 1
+
+    try:
+        map_in_processes(_export_item, tasks, n_jobs=n_jobs, initializer=_init_export_worker,
+                         initargs=({"df": df, "translate": translate},),
+                         progress_callback=progress_callback, result_callback=collect, keep_results=False,
+                         mp_context=mp_context)
+    finally:
+        _init_export_worker({})
+        if pdf is not None:
+            pdf.close()
+    if pdf is not None and pages:
+        files.append(output_path)
+    return {"files": files, "pages": pages, "skipped": skipped}
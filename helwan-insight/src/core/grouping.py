@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+
+GROUP_AGGREGATIONS = ('count', 'sum', 'mean', 'median', 'min', 'max', 'std', 'var', 'nunique')
+
+# Aggregations that also work on non-numerical value columns
+_ANY_DTYPE_AGGREGATIONS = ('count', 'nunique')
+
+
+class GroupIndex:
+    """
+    Factorized group labels for one or more key columns.
+    Every row gets an integer group code (-1 when one of its keys is missing), so repeated
+    aggregations, per-group plots and per-group tests do not need to hash the keys again.
+    Keys are always factorized with a hash table; with sort=True only the (usually much
+    smaller) table of distinct groups is sorted afterwards.
+    """
+
+    def __init__(self, keys: list, codes: np.ndarray, groups: pd.DataFrame, sorted_groups: bool):
+        self.keys = list(keys)
+        self.codes = codes
+        self.groups = groups
+        self.sorted_groups = sorted_groups
+        self.n_groups = len(groups)
+        self._order = None
+        self._boundaries = None
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, keys: list, sort: bool = True) -> 'GroupIndex':
+        n_rows = len(df)
+        codes = None
+        missing = np.zeros(n_rows, dtype=bool)
+        for position, key in enumerate(keys):
+            key_codes, key_uniques = pd.factorize(df[key], sort=False)
+            missing |= key_codes < 0
+            if position == 0:
+                codes = np.maximum(key_codes, 0)
+                continue
+            # Mixed-radix combination, re-factorized so the codes stay dense and cannot overflow
+            codes = codes * max(len(key_uniques), 1) + np.maximum(key_codes, 0)
+            codes, _ = pd.factorize(codes, sort=False)
+        codes = np.asarray(codes, dtype=np.int64)
+        if missing.any() and len(keys) > 1:
+            # Rows with a missing key belong to no group; re-factorize the rest so codes stay dense
+            dense = np.full(n_rows, -1, dtype=np.int64)
+            dense[~missing] = pd.factorize(codes[~missing], sort=False)[0]
+            codes = dense
+        elif missing.any():
+            codes[missing] = -1
+
+        # Codes are assigned in order of first appearance, so each group's first row is where
+        # the running maximum of the valid codes increases.
+        valid_positions = np.flatnonzero(codes >= 0)
+        valid_codes = codes[valid_positions]
+        if valid_codes.size:
+            running_max = np.maximum.accumulate(valid_codes)
+            is_first = np.r_[True, running_max[1:] > running_max[:-1]]
+            first_rows = valid_positions[is_first]
+        else:
+            first_rows = valid_positions
+        groups = df[keys].iloc[first_rows].reset_index(drop=True)
+
+        if sort and len(groups) > 1:
+            order = groups.sort_values(keys, kind='stable').index.to_numpy()
+            new_codes = np.empty(len(order), dtype=np.int64)
+            new_codes[order] = np.arange(len(order))
+            codes = np.where(codes >= 0, new_codes[np.maximum(codes, 0)], -1)
+            groups = groups.iloc[order].reset_index(drop=True)
+
+        return cls(keys, codes, groups, sorted_groups=sort)
+
+    def labels(self) -> pd.Index:
+        """The group labels as an Index (a MultiIndex when there are several keys)."""
+        if len(self.keys) == 1:
+            return pd.Index(self.groups[self.keys[0]], name=self.keys[0])
+        return pd.MultiIndex.from_frame(self.groups)
+
+    def _grouped_order(self):
+        # Row positions sorted by group, computed once and reused by every split
+        if self._order is None:
+            valid = np.flatnonzero(self.codes >= 0)
+            self._order = valid[np.argsort(self.codes[valid], kind='stable')]
+            counts = np.bincount(self.codes[valid], minlength=self.n_groups)
+            self._boundaries = np.cumsum(counts)[:-1]
+        return self._order, self._boundaries
+
+    def split(self, values) -> list:
+        """Splits a column (aligned with the indexed rows) into one array per group."""
+        values = np.asarray(values)
+        order, boundaries = self._grouped_order()
+        return np.split(values[order], boundaries)
+
+    def aggregate(self, values: pd.Series, aggregations: list) -> dict:
+        """Returns {aggregation: array with one value per group} for a single value column."""
+        unknown = [agg for agg in aggregations if agg not in GROUP_AGGREGATIONS]
+        if unknown:
+            raise ValueError(f"Unsupported aggregation(s): {', '.join(unknown)}")
+        is_numeric = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+        if not is_numeric and any(agg not in _ANY_DTYPE_AGGREGATIONS for agg in aggregations):
+            raise ValueError(f"Column '{values.name}' is not numerical. Only count and nunique are available for it.")
+
+        present = values.notna().to_numpy() & (self.codes >= 0)
+        codes = self.codes[present]
+        counts = np.bincount(codes, minlength=self.n_groups)
+        results = {}
+
+        if is_numeric:
+            data = values.to_numpy(dtype=float, na_value=np.nan)[present]
+            sums = np.bincount(codes, weights=data, minlength=self.n_groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = sums / counts
+                if 'std' in aggregations or 'var' in aggregations:
+                    # Two-pass variance: accurate even when the means are large
+                    squares = np.bincount(codes, weights=(data - means[codes]) ** 2, minlength=self.n_groups)
+                    variances = np.where(counts > 1, squares / (counts - 1), np.nan)
+            if any(agg in aggregations for agg in ('median', 'min', 'max')):
+                # Sort values within groups once; a trailing NaN keeps empty groups in bounds
+                sorted_data = np.append(data[np.lexsort((data, codes))], np.nan)
+                starts = np.r_[0, np.cumsum(counts)[:-1]]
+                non_empty = counts > 0
+
+        for agg in aggregations:
+            if agg == 'count':
+                results[agg] = counts
+            elif agg == 'nunique':
+                value_codes, _ = pd.factorize(values[present])
+                n_values = int(value_codes.max(initial=0)) + 1
+                pairs = np.unique(codes * n_values + value_codes)
+                results[agg] = np.bincount(pairs // n_values, minlength=self.n_groups)
+            elif agg == 'sum':
+                results[agg] = sums
+            elif agg == 'mean':
+                results[agg] = means
+            elif agg == 'var':
+                results[agg] = variances
+            elif agg == 'std':
+                results[agg] = np.sqrt(variances)
+            elif agg == 'min':
+                results[agg] = np.where(non_empty, sorted_data[starts], np.nan)
+            elif agg == 'max':
+                results[agg] = np.where(non_empty, sorted_data[starts + counts - 1], np.nan)
+            elif agg == 'median':
+                low = sorted_data[starts + np.maximum(counts - 1, 0) // 2]
+                high = sorted_data[starts + counts // 2]
+                results[agg] = np.where(non_empty, (low + high) / 2, np.nan)
+        return results
+
+    def mode_rows(self, values: pd.Series) -> np.ndarray:
+        """
+        For every group, the position of a row holding the group's most frequent value
+        (-1 when the group has no values). Ties go to the smallest value, as in Series.mode.
+        Returning row positions rather than values keeps the column's dtype when filling.
+        """
+        present_rows = np.flatnonzero(values.notna().to_numpy() & (self.codes >= 0))
+        result = np.full(self.n_groups, -1, dtype=np.int64)
+        if present_rows.size == 0:
+            return result
+        try:
+            value_codes, uniques = pd.factorize(values.iloc[present_rows], sort=True)
+        except TypeError:
+            # Mixed types cannot be sorted; ties then go to the first value seen
+            value_codes, uniques = pd.factorize(values.iloc[present_rows], sort=False)
+        n_values = len(uniques)
+        group_codes = self.codes[present_rows]
+        pairs, first_index, counts = np.unique(group_codes * n_values + value_codes,
+                                               return_index=True, return_counts=True)
+        pair_groups = pairs // n_values
+        # Per group: highest count first, then the smallest value
+        order = np.lexsort((pairs % n_values, -counts, pair_groups))
+        is_first = np.r_[True, pair_groups[order][1:] != pair_groups[order][:-1]]
+        best = order[is_first]
+        result[pair_groups[best]] = present_rows[first_index[best]]
+        return result
+
+    def _neighbours(self, present: np.ndarray) -> tuple:
+        # For every row (in grouped order): the grouped positions of the previous and next
+        # present rows of the same group, or -1 when there is none
+        order, _ = self._grouped_order()
+        n = len(order)
+        group_of = self.codes[order]
+        is_present = present[order]
+        positions = np.arange(n)
+        prev_pos = np.maximum.accumulate(np.where(is_present, positions, -1)) if n else positions
+        next_pos = np.minimum.accumulate(np.where(is_present, positions, n)[::-1])[::-1] if n else positions
+        prev_ok = (prev_pos >= 0) & (group_of[np.clip(prev_pos, 0, max(n - 1, 0))] == group_of)
+        next_ok = (next_pos < n) & (group_of[np.clip(next_pos, 0, max(n - 1, 0))] == group_of)
+        return order, positions, np.where(prev_ok, prev_pos, -1), np.where(next_ok, next_pos, -1)
+
+    def fill_positions(self, present: np.ndarray, method: str) -> np.ndarray:
+        """
+        For every row, the position of the row whose value fills it within its group: the
+        previous present row for 'ffill', the next one for 'bfill'. Rows that have no such
+        row (or no group) map to themselves, so taking values by these positions keeps the
+        column's dtype and leaves those rows unchanged.
+        """
+        if method not in ('ffill', 'bfill'):
+            raise ValueError(f"Unsupported fill method: {method}")
+        order, _, prev_pos, next_pos = self._neighbours(np.asarray(present, dtype=bool))
+        source_pos = prev_pos if method == 'ffill' else next_pos
+        result = np.arange(len(self.codes))
+        result[order] = np.where(source_pos >= 0, order[np.maximum(source_pos, 0)], order)
+        return result
+
+    def interpolate(self, values: pd.Series) -> np.ndarray:
+        """
+        Linear interpolation within each group, treating a group's rows as equally spaced
+        (like Series.interpolate). Values after a group's last present value repeat it;
+        values before its first one stay missing.
+        """
+        data = values.to_numpy(dtype=float, na_value=np.nan)
+        order, positions, prev_pos, next_pos = self._neighbours(~np.isnan(data))
+        grouped = data[order]
+        prev_values = grouped[np.maximum(prev_pos, 0)]
+        next_values = grouped[np.maximum(next_pos, 0)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = (positions - prev_pos) / (next_pos - prev_pos)
+            between = prev_values + (next_values - prev_values) * weight
+        filled = np.where(prev_pos < 0, grouped,
+                          np.where(next_pos < 0, prev_values, np.where(np.isnan(grouped), between, grouped)))
+        result = data.copy()
+        result[order] = filled
+        return result
@@ -0,0 +1,153 @@
+import math
+
+import numpy as np
+
+# Upper bound on the number of fine bins kept per column
+FINE_BINS = 4096
+
+
+class FineHistogram:
+    """
+    A histogram with many narrow bins from which coarser histograms (any bin count, any
+    range) are derived without another pass over the data. Bins are 2**exponent wide and
+    start at a multiple of that width, so histograms of separate chunks of a column merge
+    exactly: the narrower one is coarsened by summing pairs of bins until both line up.
+    """
+
+    def __init__(self, exponent: int, start: int, counts: np.ndarray, minimum: float, maximum: float,
+                 missing: int = 0, max_bins: int = FINE_BINS):
+        self.exponent = exponent
+        self.start = start  # index of the first bin, counted in bin widths from zero
+        self.counts = counts
+        self.minimum = minimum
+        self.maximum = maximum
+        self.missing = missing  # NaN and infinite values, not counted in any bin
+        self.max_bins = max_bins
+
+    @property
+    def width(self) -> float:
+        return math.ldexp(1.0, self.exponent)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def edges(self) -> np.ndarray:
+        return (self.start + np.arange(len(self.counts) + 1)) * self.width
+
+    @classmethod
+    def empty(cls, max_bins: int = FINE_BINS) -> "FineHistogram":
+        return cls(0, 0, np.zeros(0, dtype=np.int64), math.inf, -math.inf, 0, max_bins)
+
+    @classmethod
+    def from_values(cls, values, max_bins: int = FINE_BINS) -> "FineHistogram":
+        values = np.asarray(values, dtype=float)
+        finite = values[np.isfinite(values)]
+        missing = len(values) - len(finite)
+        if len(finite) == 0:
+            histogram = cls.empty(max_bins)
+            histogram.missing = missing
+            return histogram
+        minimum, maximum = float(finite.min()), float(finite.max())
+        span = maximum - minimum
+        if span > 0:
+            exponent = math.ceil(math.log2(span / (max_bins - 1)))
+        else:
+            # A single distinct value: a narrow bin around it
+            exponent = math.frexp(abs(minimum))[1] - 20 if minimum else 0
+        width = math.ldexp(1.0, exponent)
+        start = math.floor(minimum / width)
+        # The span rule leaves at most max_bins bins, so the counts fit after one bincount
+        bins = np.floor(finite / width).astype(np.int64) - start
+        counts = np.bincount(bins, minlength=math.floor(maximum / width) - start + 1)
+        histogram = cls(exponent, start, counts.astype(np.int64), minimum, maximum, missing, max_bins)
+        return histogram._fit()
+
+    def _coarsen(self, steps: int) -> "FineHistogram":
+        # Merges every 2**steps neighbouring bins into one
+        if steps <= 0 or len(self.counts) == 0:
+            return FineHistogram(self.exponent + max(steps, 0), self.start >> max(steps, 0), self.counts,
+                                 self.minimum, self.maximum, self.missing, self.max_bins)
+        # Shifting is floor division by 2**steps, also for negative bin indices
+        new_bins = (self.start + np.arange(len(self.counts), dtype=np.int64)) >> steps
+        firsts = np.flatnonzero(np.r_[True, new_bins[1:] != new_bins[:-1]])
+        return FineHistogram(self.exponent + steps, int(new_bins[0]), np.add.reduceat(self.counts, firsts),
+                             self.minimum, self.maximum, self.missing, self.max_bins)
+
+    def _fit(self) -> "FineHistogram":
+        histogram = self
+        while len(histogram.counts) > self.max_bins:
+            histogram = histogram._coarsen(1)
+        return histogram
+
+    def merge(self, other: "FineHistogram") -> "FineHistogram":
+        """The histogram of both sets of values together (neither histogram is changed)."""
+        if len(other.counts) == 0:
+            return FineHistogram(self.exponent, self.start, self.counts, self.minimum, self.maximum,
+                                 self.missing + other.missing, self.max_bins)
+        if len(self.counts) == 0:
+            return other.merge(self)
+        exponent = max(self.exponent, other.exponent)
+        # Widen the bins until both ranges together fit in max_bins (before allocating them)
+        while True:
+            low = min(self.start >> (exponent - self.exponent), other.start >> (exponent - other.exponent))
+            high = max((self.start + len(self.counts) - 1) >> (exponent - self.exponent),
+                       (other.start + len(other.counts) - 1) >> (exponent - other.exponent))
+            if high - low < self.max_bins:
+                break
+            exponent += 1
+        left = self._coarsen(exponent - self.exponent)
+        right = other._coarsen(exponent - other.exponent)
+        start = min(left.start, right.start)
+        counts = np.zeros(max(left.start + len(left.counts), right.start + len(right.counts)) - start, dtype=np.int64)
+        counts[left.start - start:left.start - start + len(left.counts)] += left.counts
+        counts[right.start - start:right.start - start + len(right.counts)] += right.counts
+        merged = FineHistogram(exponent, start, counts, min(self.minimum, other.minimum),
+                               max(self.maximum, other.maximum), self.missing + other.missing, self.max_bins)
+        return merged._fit()
+
+    def _clipped_edges(self) -> np.ndarray:
+        # The outer fine bins only hold values between the minimum and the maximum
+        edges = self.edges
+        edges[0] = self.minimum
+        edges[-1] = max(self.maximum, np.nextafter(edges[-2], np.inf))
+        return edges
+
+    def quantiles(self, probabilities) -> np.ndarray:
+        """Approximate quantiles (within one fine bin), reading the cumulative counts backwards."""
+        if len(self.counts) == 0:
+            raise ValueError("No numerical values available.")
+        cumulative = np.r_[0, np.cumsum(self.counts)].astype(float)
+        targets = np.clip(np.asarray(probabilities, dtype=float), 0, 1) * cumulative[-1]
+        return np.clip(np.interp(targets, cumulative, self._clipped_edges()), self.minimum, self.maximum)
+
+    def moments(self) -> tuple:
+        """Approximate (mean, standard deviation), taking each value at its fine bin's centre."""
+        if len(self.counts) == 0:
+            raise ValueError("No numerical values available.")
+        edges = self._clipped_edges()
+        centres = (edges[:-1] + edges[1:]) / 2
+        weights = self.counts / self.counts.sum()
+        mean = float(np.dot(weights, centres))
+        return mean, float(np.sqrt(max(np.dot(weights, (centres - mean) ** 2), 0.0)))
+
+    def rebin(self, bins: int, value_range: tuple = None) -> tuple:
+        """
+        Counts for bins equal-width bins over value_range (default: the data's minimum to
+        maximum), as (counts, edges). Counts are read off the cumulative fine histogram,
+        spreading each fine bin evenly over its width, so they are exact wherever an edge
+        falls on a fine bin edge and otherwise off by at most part of one fine bin (so bins
+        narrower than a fine bin come out flat; count the raw values for those).
+        """
+        if len(self.counts) == 0:
+            raise ValueError("No numerical values available for a histogram.")
+        low, high = value_range if value_range is not None else (self.minimum, self.maximum)
+        if high <= low:
+            high = low + self.width
+        edges = np.linspace(low, high, int(bins) + 1)
+        cumulative = np.r_[0, np.cumsum(self.counts)].astype(float)
+        below = np.interp(edges, self._clipped_edges(), cumulative)
+        below[edges >= self.maximum] = cumulative[-1]  # the top edge is inclusive
+        below[edges <= self.minimum] = 0
+        return np.diff(below), edges
@@ -0,0 +1,199 @@
+import os
+import pickle
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024  # bytes of undo data kept in RAM
+DEFAULT_MAX_DEPTH = 100
+
+
+class HistoryEntry:
+    """
+    One recorded DataHandler operation: its name and parameters (enough to redo or replay
+    it) plus the minimum needed to undo it:
+      'columns' - the previous versions of the replaced columns (unchanged columns are shared
+                  with the live DataFrame, never copied)
+      'rows'    - only the removed rows and their positions
+      'rename'  - the column name mapping, no data at all
+    nbytes is the size of the undo data; callers that already know it (e.g. from
+    DataHandler.get_column_memory_usage) pass it, as measuring object columns is slow.
+    """
+
+    def __init__(self, operation: str, params: dict, kind: str, payload, nbytes: int = None):
+        self.operation = operation
+        self.params = params
+        self.kind = kind
+        self._payload = payload
+        self.spill_path = None
+        self.nbytes = self._measure(payload) if nbytes is None else int(nbytes)
+
+    @classmethod
+    def columns(cls, operation: str, params: dict, old_columns: dict, nbytes: int = None) -> 'HistoryEntry':
+        return cls(operation, params, 'columns', old_columns, nbytes)
+
+    @classmethod
+    def rows(cls, operation: str, params: dict, removed_rows: pd.DataFrame, positions: np.ndarray,
+             nbytes: int = None) -> 'HistoryEntry':
+        return cls(operation, params, 'rows', (removed_rows, positions), nbytes)
+
+    @classmethod
+    def rename(cls, operation: str, params: dict, mapping: dict) -> 'HistoryEntry':
+        return cls(operation, params, 'rename', mapping)
+
+    def _measure(self, payload) -> int:
+        if self.kind == 'columns':
+            return int(sum(series.memory_usage(deep=True) for series in payload.values()))
+        if self.kind == 'rows':
+            removed_rows, positions = payload
+            return int(removed_rows.memory_usage(deep=True).sum() + positions.nbytes)
+        return 0
+
+    @property
+    def in_memory(self) -> bool:
+        return self.spill_path is None
+
+    def spill(self, directory: str):
+        """Moves the undo data to a file so it no longer occupies RAM."""
+        if not self.in_memory or self.nbytes == 0:
+            return
+        fd, path = tempfile.mkstemp(suffix='.pkl', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(self._payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._payload = None
+        self.spill_path = path
+
+    def payload(self):
+        if self.spill_path is not None:
+            with open(self.spill_path, 'rb') as f:
+                self._payload = pickle.load(f)
+            self.discard_spill()
+        return self._payload
+
+    def discard_spill(self):
+        if self.spill_path is not None:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
+
+    def release(self):
+        """Drops the undo data, keeping only the operation record (used by the redo stack)."""
+        self.discard_spill()
+        self._payload = None
+        self.nbytes = 0
+
+    def apply_undo(self, df: pd.DataFrame) -> pd.DataFrame:
+        payload = self.payload()
+        if self.kind == 'columns':
+            df = df.copy(deep=False)
+            for column, old_values in payload.items():
+                df[column] = old_values
+            return df
+        if self.kind == 'rows':
+            removed_rows, positions = payload
+            if len(removed_rows) == 0:
+                return df
+            total = len(df) + len(removed_rows)
+            kept_positions = np.ones(total, dtype=bool)
+            kept_positions[positions] = False
+            order = np.empty(total, dtype=np.intp)
+            order[np.flatnonzero(kept_positions)] = np.arange(len(df))
+            order[positions] = len(df) + np.arange(len(removed_rows))
+            return pd.concat([df, removed_rows]).iloc[order]
+        if self.kind == 'rename':
+            return df.rename(columns={new: old for old, new in payload.items()})
+        raise ValueError(f"Unknown history entry kind: {self.kind}")
+
+    def describe(self) -> dict:
+        return {"operation": self.operation, "params": dict(self.params)}
+
+
+class DataHistory:
+    """
+    Undo/redo stacks for a DataHandler.
+    Undo data beyond memory_budget bytes is spilled to disk, oldest first, and at most
+    max_depth operations are kept. The stacks are guarded by a lock, as spill_all may be
+    called from a background thread (see core.memory).
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, max_depth: int = DEFAULT_MAX_DEPTH):
+        self.memory_budget = memory_budget
+        self.max_depth = max_depth
+        self.undo_stack = []
+        self.redo_stack = []
+        self._spill_dir = None
+        self._lock = threading.RLock()
+
+    def record(self, entry: HistoryEntry, clear_redo: bool = True):
+        with self._lock:
+            self.undo_stack.append(entry)
+            if clear_redo:
+                self.redo_stack.clear()
+            while len(self.undo_stack) > self.max_depth:
+                self.undo_stack.pop(0).release()
+            self._enforce_budget()
+
+    def pop_undo(self) -> HistoryEntry:
+        with self._lock:
+            if not self.undo_stack:
+                raise ValueError("Nothing to undo.")
+            return self.undo_stack.pop()
+
+    def push_redo(self, entry: HistoryEntry):
+        entry.release()
+        self.redo_stack.append(entry)
+
+    def pop_redo(self) -> HistoryEntry:
+        if not self.redo_stack:
+            raise ValueError("Nothing to redo.")
+        return self.redo_stack.pop()
+
+    @property
+    def enabled(self) -> bool:
+        """False when no operations are kept (max_depth 0), so none need to be recorded."""
+        return self.max_depth > 0
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def memory_usage(self) -> int:
+        """Bytes of undo data currently held in RAM."""
+        with self._lock:
+            return sum(entry.nbytes for entry in self.undo_stack if entry.in_memory)
+
+    def operation_log(self) -> list:
+        """The applied operations, oldest first, as plain dicts."""
+        return [entry.describe() for entry in self.undo_stack]
+
+    def clear(self):
+        with self._lock:
+            for entry in self.undo_stack:
+                entry.release()
+            self.undo_stack.clear()
+            self.redo_stack.clear()
+
+    def spill_all(self) -> int:
+        """Spills all undo data held in RAM to disk; returns the bytes freed."""
+        with self._lock:
+            in_memory = self.memory_usage()
+            self._enforce_budget(0)
+            return in_memory - self.memory_usage()
+
+    def _enforce_budget(self, budget: int = None):
+        budget = self.memory_budget if budget is None else budget
+        in_memory = self.memory_usage()
+        for entry in self.undo_stack:
+            if in_memory <= budget:
+                break
+            if entry.in_memory and entry.nbytes:
+                if self._spill_dir is None:
+                    self._spill_dir = tempfile.TemporaryDirectory(prefix='helwan-insight-undo-')
+                in_memory -= entry.nbytes
+                entry.spill(self._spill_dir.name)
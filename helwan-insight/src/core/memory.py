@@ -0,0 +1,277 @@
+import os
+import pickle
+import sys
+import time
+import weakref
+
+from core.parallel import resolve_worker_count
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Environment variable setting the memory budget in megabytes (e.g. HELWAN_MEMORY_BUDGET_MB=4096);
+# without it the budget is DEFAULT_BUDGET_FRACTION of the physical memory
+MEMORY_BUDGET_ENV = 'HELWAN_MEMORY_BUDGET_MB'
+DEFAULT_BUDGET_FRACTION = 0.7
+
+# Datasets not used for this many seconds may be spilled to disk when over budget
+SPILL_IDLE_SECONDS = 60
+
+# Loading a file takes roughly this many times its size in memory (parsing buffers and
+# object columns included)
+LOAD_SIZE_FACTOR = {'.csv': 3, '.xlsx': 10, '.xls': 10}
+
+
+def physical_memory() -> int:
+    """Bytes of physical memory, or 0 if not known."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+def process_rss() -> int:
+    """Bytes of memory the process currently has resident (its peak where that is all we can tell)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def default_budget() -> int:
+    value = os.environ.get(MEMORY_BUDGET_ENV)
+    if value:
+        try:
+            return int(float(value) * 2 ** 20)
+        except ValueError:
+            pass
+    return int(physical_memory() * DEFAULT_BUDGET_FRACTION)
+
+
+def estimate_load_bytes(path: str) -> int:
+    """Rough memory needed to load a data file, from its size and type."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 0
+    return size * LOAD_SIZE_FACTOR.get(extension, 3)
+
+
+def _import_pyarrow():
+    # Imported on the first spill only, so loading and analysing data never pays for it
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _holds_objects(dtype) -> bool:
+    # Arrow gives Python objects (e.g. strings mixed with NaN) back as other dtypes
+    categories = getattr(dtype, 'categories', None)
+    if categories is not None:
+        dtype = categories.dtype
+    return dtype == object
+
+
+def spill_frame(df, directory: str, name: str) -> str:
+    """
+    Writes a DataFrame to directory for load_spilled_frame: as an Arrow IPC file (read back
+    memory-mapped) when pyarrow is installed and every column and the index round-trip
+    through Arrow unchanged, otherwise as a pickle. Returns the file path.
+    """
+    pyarrow = _import_pyarrow()
+    if pyarrow is not None and not _holds_objects(df.index.dtype) \
+            and not any(_holds_objects(dtype) for dtype in df.dtypes):
+        path = os.path.join(directory, f'{name}.arrow')
+        try:
+            table = pyarrow.Table.from_pandas(df, preserve_index=True)
+            with pyarrow.OSFile(path, 'wb') as sink, pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            return path
+        except (pyarrow.ArrowException, TypeError, ValueError):
+            pass
+    path = os.path.join(directory, f'{name}.pkl')
+    with open(path, 'wb') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def load_spilled_frame(path: str, dtypes=None):
+    """
+    Reads a file written by spill_frame; columns are cast back to dtypes (a Series)
+    where they differ.
+    """
+    if not path.endswith('.arrow'):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    pyarrow = _import_pyarrow()
+    with pyarrow.memory_map(path) as source:
+        df = pyarrow.ipc.open_file(source).read_all().to_pandas()
+    if dtypes is not None:
+        changed = {column: dtype for column, dtype in dtypes.items() if df[column].dtype != dtype}
+        if changed:
+            df = df.astype(changed)
+    return df
+
+
+def format_bytes(size: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class MemoryMonitor:
+    """
+    Accounts for the memory of the loaded datasets (per column, see
+    DataHandler.get_column_memory_usage), their undo data and caches, the registered plot
+    caches and the process RSS, against a budget. Over budget, enforce() frees memory in
+    order of cost to get back: plot caches, DataHandler caches, undo data (spilled to
+    disk) and finally datasets idle for SPILL_IDLE_SECONDS (spilled to memory-mapped Arrow
+    files, reloaded on next use). The stages are also available on their own, so that a
+    GUI can clear caches on the thread that uses them and write to disk in a worker.
+    would_exceed() lets callers warn before an operation estimated to go over the budget.
+    """
+
+    def __init__(self, budget: int = None):
+        self.budget = default_budget() if budget is None else budget
+        self._handlers = weakref.WeakSet()
+        self._caches = weakref.WeakKeyDictionary()  # cache -> name
+
+    def register_handler(self, handler):
+        self._handlers.add(handler)
+
+    def register_cache(self, name: str, cache):
+        """Registers a cache with a size property (bytes) and clear() (e.g. a PlotCache)."""
+        self._caches[cache] = name
+
+    def handlers(self) -> list:
+        return list(self._handlers)
+
+    def rss(self) -> int:
+        return process_rss()
+
+    def would_exceed(self, estimated_bytes: int) -> bool:
+        return bool(self.budget) and self.rss() + estimated_bytes > self.budget
+
+    def worker_limit(self, bytes_per_worker: int, n_jobs: int = None) -> int:
+        """
+        How many worker processes (at most n_jobs, see resolve_worker_count) needing
+        bytes_per_worker each fit in what is left of the budget; always at least one.
+        """
+        workers = resolve_worker_count(n_jobs)
+        if not self.budget or bytes_per_worker <= 0:
+            return workers
+        return int(max(1, min(workers, (self.budget - self.rss()) // bytes_per_worker)))
+
+    def snapshot(self) -> dict:
+        """Memory in use: {"rss", "budget", "datasets": [...], "caches": {name: bytes}}."""
+        datasets = []
+        for handler in self.handlers():
+            if handler.is_spilled:
+                data_bytes = 0
+            elif handler._df is not None:
+                data_bytes = int(handler.get_column_memory_usage().sum())
+            else:
+                continue
+            datasets.append({"name": os.path.basename(handler.file_path or '') or "-", "bytes": data_bytes,
+                             "undo_bytes": handler.history.memory_usage(),
+                             "cache_bytes": sum(handler.get_cache_sizes().values()), "spilled": handler.is_spilled})
+        caches = {}
+        for cache, name in list(self._caches.items()):
+            caches[name] = caches.get(name, 0) + cache.size
+        return {"rss": self.rss(), "budget": self.budget, "datasets": datasets, "caches": caches}
+
+    def excess(self) -> int:
+        """Bytes the process is over budget (0 or less when within it)."""
+        return self.rss() - self.budget if self.budget else 0
+
+    def enforce(self, active=None) -> list:
+        """
+        Frees memory while the process is over budget; active (a DataHandler in use, or a
+        list of them) is never spilled. Returns what was done as (kind, name, bytes freed)
+        tuples, kind being 'cache' (name is the registered cache name), 'data_caches',
+        'undo' or 'dataset' (name is the file name), for the caller to describe. Freed
+        memory is counted from the accounted sizes, as the RSS may not drop at once.
+        """
+        excess = self.excess()
+        actions = []
+        for stage, args in ((self.clear_caches, ()), (self.spill_history, ()),
+                            (self.spill_idle_datasets, (active,))):
+            if excess <= 0:
+                break
+            stage_actions, excess = stage(excess, *args)
+            actions += stage_actions
+        return actions
+
+    def clear_caches(self, excess: int) -> tuple:
+        """
+        Clears plot caches (largest first), then DataHandler caches, until excess bytes are
+        freed. Returns (actions, remaining excess). Call it from the thread using the caches.
+        """
+        actions = []
+        for cache, name in sorted(self._caches.items(), key=lambda item: item[0].size, reverse=True):
+            if cache.size:
+                excess -= cache.size
+                actions.append(('cache', name, cache.size))
+                cache.clear()
+            if excess <= 0:
+                return actions, excess
+        for handler in self.handlers():
+            freed = handler.clear_caches()
+            if freed:
+                excess -= freed
+                actions.append(('data_caches', None, freed))
+            if excess <= 0:
+                break
+        return actions, excess
+
+    def spill_history(self, excess: int) -> tuple:
+        """
+        Moves undo data to disk (see DataHistory.spill_all, which is thread-safe) until
+        excess bytes are freed. Returns (actions, remaining excess).
+        """
+        actions = []
+        for handler in self.handlers():
+            freed = handler.history.spill_all()
+            if freed:
+                excess -= freed
+                actions.append(('undo', None, freed))
+            if excess <= 0:
+                break
+        return actions, excess
+
+    def spill_idle_datasets(self, excess: int, active=None) -> tuple:
+        """
+        Moves datasets idle for SPILL_IDLE_SECONDS to disk, least recently used first, until
+        excess bytes are freed; active (a DataHandler or a list of them) is never spilled.
+        Returns (actions, remaining excess).
+        """
+        actions = []
+        active = active if isinstance(active, (list, tuple, set)) else [active]
+        now = time.monotonic()
+        idle = [handler for handler in self.handlers()
+                if all(handler is not in_use for in_use in active) and handler._df is not None
+                and now - handler.last_access >= SPILL_IDLE_SECONDS]
+        for handler in sorted(idle, key=lambda handler: handler.last_access):
+            freed = handler.spill_to_disk()
+            excess -= freed
+            actions.append(('dataset', os.path.basename(handler.file_path or ''), freed))
+            if excess <= 0:
+                break
+        return actions, excess
+
+
+# The monitor the application's datasets and caches report to
+memory_monitor = MemoryMonitor()
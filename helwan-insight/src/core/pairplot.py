@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from matplotlib.colors import LogNorm
+
+from core.decimation import density_grid
+from core.parallel import map_in_processes
+
+# Most columns a pair plot shows (the panel count grows with its square)
+MAX_PAIRPLOT_COLUMNS = 8
+
+# How off-diagonal panels show the data: a shared random sample of rows as points, or
+# the counts of all rows on a grid
+PAIRPLOT_MODES = ('sample', 'density')
+
+# Rows drawn as points per panel in 'sample' mode
+PAIRPLOT_SAMPLE_ROWS = 5_000
+
+PAIRPLOT_HISTOGRAM_BINS = 20
+PAIRPLOT_DENSITY_BINS = 50
+
+# Below this many rows times panels the panels are computed without worker processes
+_PARALLEL_MIN_WORK = 20_000_000
+
+# Column arrays shared with the worker processes, set once per worker by _init_pairplot_worker
+_pairplot_data = {}
+
+
+def _init_pairplot_worker(data: dict):
+    global _pairplot_data
+    _pairplot_data = data
+
+
+def select_pairplot_columns(df: pd.DataFrame, columns: list = None, max_columns: int = MAX_PAIRPLOT_COLUMNS) -> list:
+    """
+    The numerical columns to plot: the given ones (checked), or the first max_columns
+    numerical columns of the frame. Raises ValueError for more than max_columns columns.
+    """
+    numerical = list(df.select_dtypes(include=['number']).columns)
+    if not numerical:
+        raise ValueError("No numerical data available for pair plot.")
+    if not columns:
+        return numerical[:max_columns]
+    for column in columns:
+        if column not in numerical:
+            raise ValueError(f"Column '{column}' is not a numerical column.")
+    if len(columns) > max_columns:
+        raise ValueError(f"Please select at most {max_columns} columns for a pair plot.")
+    return list(columns)
+
+
+def _compute_panel(task: tuple):
+    # ('histogram', column) or ('density', x_column, y_column, bins); the extents come from
+    # the shared data so all panels of a row or column line up
+    kind = task[0]
+    if kind == 'histogram':
+        values = _pairplot_data[task[1]]
+        values = values[np.isfinite(values)]
+        low, high = _pairplot_data['__extents__'][task[1]]
+        return np.histogram(values, bins=PAIRPLOT_HISTOGRAM_BINS, range=(low, high if high > low else low + 1))
+    x_values, y_values = _pairplot_data[task[1]], _pairplot_data[task[2]]
+    complete = np.isfinite(x_values) & np.isfinite(y_values)
+    return density_grid(x_values[complete], y_values[complete], (task[3], task[3]),
+                        x_range=_pairplot_data['__extents__'][task[1]], y_range=_pairplot_data['__extents__'][task[2]])
+
+
+def draw_pairplot(figure, frame: pd.DataFrame, mode: str = 'sample', seed: int = 0, n_jobs: int = None,
+                  panel_callback=None, mp_context=None):
+    """
+    Draws a pair plot (histograms on the diagonal, scatter or density panels elsewhere) on
+    an empty figure. Panel data is computed in worker processes for large frames and each
+    panel is drawn as soon as its data arrives; panel_callback(completed, total) is called
+    after every panel, e.g. to show the figure so far. mp_context is the start method of the
+    worker processes (see core.parallel.map_in_processes).
+    """
+    if mode not in PAIRPLOT_MODES:
+        raise ValueError(f"Unsupported pair plot mode: {mode}")
+    columns = list(frame.columns)
+    n = len(columns)
+    shared = {column: frame[column].to_numpy(dtype=float, na_value=np.nan) for column in columns}
+    extents = {}
+    for column, values in shared.items():
+        finite = values[np.isfinite(values)]
+        extents[column] = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+    shared['__extents__'] = extents
+
+    axes = np.atleast_2d(figure.subplots(n, n, sharex='col', squeeze=False))
+    for i, column in enumerate(columns):
+        axes[n - 1, i].set_xlabel(column)
+        axes[i, 0].set_ylabel(column)
+    figure.tight_layout()
+
+    # Density panels are computed once per pair and drawn transposed below the diagonal;
+    # sampled panels need no computation beyond picking the rows
+    tasks = [('histogram', column) for column in columns]
+    if mode == 'density':
+        tasks += [('density', columns[j], columns[i], PAIRPLOT_DENSITY_BINS)
+                  for i in range(n) for j in range(n) if j > i]
+    else:
+        rng = np.random.default_rng(seed)
+        n_rows = len(frame)
+        rows = np.sort(rng.choice(n_rows, PAIRPLOT_SAMPLE_ROWS, replace=False)) if n_rows > PAIRPLOT_SAMPLE_ROWS else slice(None)
+        sample = {column: shared[column][rows] for column in columns}
+    total_panels = n * n
+    drawn = [0]
+
+    def panel_done():
+        drawn[0] += 1
+        if panel_callback:
+            panel_callback(drawn[0], total_panels)
+
+    def draw_result(task_index: int, result):
+        task = tasks[task_index]
+        if task[0] == 'histogram':
+            counts, edges = result
+            i = columns.index(task[1])
+            axes[i, i].hist(edges[:-1], bins=edges, weights=counts)
+            panel_done()
+            return
+        counts, x_edges, y_edges = result
+        j, i = columns.index(task[1]), columns.index(task[2])
+        norm = LogNorm(vmin=1, vmax=max(int(counts.max()), 2))
+        for ax, grid, extent in ((axes[i, j], counts.T, (x_edges[0], x_edges[-1], y_edges[0], y_edges[-1])),
+                                 (axes[j, i], counts, (y_edges[0], y_edges[-1], x_edges[0], x_edges[-1]))):
+            ax.imshow(np.ma.masked_equal(grid, 0), origin='lower', extent=extent, aspect='auto',
+                      interpolation='nearest', cmap='viridis', norm=norm)
+            panel_done()
+
+    if mode == 'sample':
+        for i, y_column in enumerate(columns):
+            for j, x_column in enumerate(columns):
+                if i != j:
+                    axes[i, j].scatter(sample[x_column], sample[y_column], s=5, alpha=0.6)
+                    panel_done()
+
+    # Small frames are not worth the cost of starting worker processes
+    work = len(frame) * len(tasks)
+    try:
+        map_in_processes(_compute_panel, tasks, n_jobs=1 if work < _PARALLEL_MIN_WORK else n_jobs,
+                         initializer=_init_pairplot_worker, initargs=(shared,), result_callback=draw_result,
+                         keep_results=False, mp_context=mp_context)
+    finally:
+        _init_pairplot_worker({})
+    figure.tight_layout()
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def resolve_worker_count(n_jobs: int = None) -> int:
+    """
+    Returns the number of worker processes to use.
+    None or a value <= 0 means one worker per available CPU.
+    """
+    if n_jobs is None or n_jobs <= 0:
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0)) or 1
+        return os.cpu_count() or 1
+    return n_jobs
+
+
+def map_in_processes(func, tasks: list, n_jobs: int = None, initializer=None, initargs: tuple = (),
+                     progress_callback=None, result_callback=None, keep_results: bool = True,
+                     mp_context=None) -> list:
+    """
+    Runs func(task) for every task across a pool of worker processes.
+    Results are returned in the same order as the tasks. The initializer runs once per
+    worker, so large shared inputs are transferred once instead of once per task.
+    With a single worker (or a single task) everything runs in the calling process.
+    progress_callback, if given, is called as progress_callback(completed, total).
+    result_callback, if given, is called as result_callback(task_index, result) as soon as
+    each result arrives (in completion order); if it raises, pending tasks are cancelled.
+    With keep_results=False, results are dropped once result_callback has seen them (the
+    returned list is all None), so large results such as figures are not all held at once.
+    mp_context is the multiprocessing start method ('spawn', 'forkserver', 'fork') or
+    context of the workers (default: the platform's); use 'spawn' from multi-threaded
+    processes such as the GUI, which fork does not copy safely.
+    """
+    tasks = list(tasks)
+    total = len(tasks)
+    results = [None] * total
+    if total == 0:
+        return results
+
+    workers = min(resolve_worker_count(n_jobs), total)
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for i, task in enumerate(tasks):
+            result = func(task)
+            if keep_results:
+                results[i] = result
+            if result_callback:
+                result_callback(i, result)
+            if progress_callback:
+                progress_callback(i + 1, total)
+        return results
+
+    if isinstance(mp_context, str):
+        mp_context = multiprocessing.get_context(mp_context)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=initializer,
+                             initargs=initargs) as executor:
+        futures = {executor.submit(func, task): i for i, task in enumerate(tasks)}
+        try:
+            for completed, future in enumerate(as_completed(futures), start=1):
+                i = futures.pop(future)
+                result = future.result()
+                if keep_results:
+                    results[i] = result
+                if result_callback:
+                    result_callback(i, result)
+                if progress_callback:
+                    progress_callback(completed, total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
+
+
+class WorkerPool:
+    """
+    A process pool that can be reused for several rounds of tasks, e.g. when a computation
+    stops early once its result is resolved. With a single worker the tasks run in the
+    calling process and no processes are started. mp_context is the start method of the
+    workers, as for map_in_processes.
+    """
+
+    def __init__(self, n_jobs: int = None, initializer=None, initargs: tuple = (), mp_context=None):
+        self.workers = resolve_worker_count(n_jobs)
+        self._executor = None
+        if self.workers > 1:
+            if isinstance(mp_context, str):
+                mp_context = multiprocessing.get_context(mp_context)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context,
+                                                 initializer=initializer, initargs=initargs)
+        elif initializer is not None:
+            initializer(*initargs)
+
+    def map(self, func, tasks: list) -> list:
+        if self._executor is None:
+            return [func(task) for task in tasks]
+        return list(self._executor.map(func, tasks))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
@@ -0,0 +1,289 @@
+import inspect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.data_handler import DataHandler
+from core.duplicates import row_hashes
+from core.history import DataHistory
+
+try:
+    import yaml
+except ImportError:  # YAML pipelines are optional; JSON always works
+    yaml = None
+
+PIPELINE_FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 100_000
+
+# DataHandler operations a pipeline may contain (and nothing else, so a pipeline file
+# can never call arbitrary methods such as save_data)
+REPLAYABLE_OPERATIONS = (
+    'handle_missing_values', 'impute_missing_values', 'drop_duplicates', 'change_column_type', 'rename_column',
+    'handle_outliers'
+)
+
+
+def _is_row_filter(step: dict) -> bool:
+    # Steps that only decide, row by row or by whole-row equality, whether a row is kept.
+    # Duplicate removal on a key subset (or keeping the last copy) depends on which rows
+    # earlier filters removed, so it is not fused.
+    if step["operation"] == 'drop_duplicates':
+        return not step["params"].get("subset") and step["params"].get("keep", 'first') == 'first'
+    return step["operation"] == 'handle_missing_values' and step["params"].get("strategy") == 'drop_rows'
+
+
+def _is_row_local(step: dict) -> bool:
+    # Steps whose result for a row does not depend on statistics of the other rows
+    if _is_row_filter(step):
+        return True
+    if step["operation"] == 'handle_missing_values':
+        return step["params"].get("strategy") == 'fill_value'
+    if step["operation"] == 'impute_missing_values':
+        strategies = step["params"].get("strategies") or {}
+        return all(strategy == 'fill_value' for strategy in strategies.values())
+    if step["operation"] == 'change_column_type':
+        # Unless pinned, the datetime format and number separators are inferred from the data
+        # at hand, and each chunk could infer different ones
+        params = step["params"]
+        if params.get("new_type") == 'datetime':
+            return params.get("format") is not None
+        if params.get("new_type") in ('int', 'float'):
+            return params.get("decimal") is not None and params.get("thousands") is not None
+        return True
+    return step["operation"] == 'rename_column'
+
+
+def _to_builtin(value):
+    # json cannot serialize numpy scalars, which end up in params via the GUI
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _new_headless_handler() -> DataHandler:
+    # Replays are never undone, so no undo data is kept at all
+    handler = DataHandler()
+    handler.history = DataHistory(max_depth=0)
+    return handler
+
+
+class _StepStage:
+    """A single pipeline step, replayed through the DataHandler method of the same name."""
+
+    def __init__(self, step: dict):
+        self.step = step
+
+    def reset(self):
+        pass
+
+    def apply(self, handler: DataHandler, streaming: bool = False):
+        getattr(handler, self.step["operation"])(**self.step["params"])
+
+    def describe(self) -> str:
+        return self.step["operation"]
+
+
+class _RowFilterStage:
+    """
+    Consecutive row filters (missing-value row drops and duplicate removal) fused into one
+    mask, so the DataFrame is copied once instead of once per step. The union of the masks
+    gives the same rows as applying the steps one after another: identical rows are always
+    dropped together by the missing-value filters.
+    When streaming, duplicates across chunks are found through 64-bit row hashes alone:
+    keeping the rows themselves to compare would hold every distinct row in memory, which
+    streaming is meant to avoid. Streamed duplicate removal is therefore probabilistic - a
+    row whose hash collides with an earlier, different row is dropped too (with n distinct
+    rows this happens with probability about n**2 / 2**65, e.g. 3e-8 for 10^6 rows).
+    In-memory replays compare the values of rows with equal hashes and are exact.
+    """
+
+    def __init__(self, steps: list):
+        self.steps = steps
+        self._seen_hashes = set()
+
+    def reset(self):
+        self._seen_hashes = set()
+
+    def _duplicate_mask(self, handler: DataHandler, drop_mask: np.ndarray, streaming: bool) -> np.ndarray:
+        if not streaming:
+            return handler._duplicate_mask()
+        # Hash numbers as floats so a column read as int in one chunk and as float in another
+        # (because that chunk has missing values) still hashes equal values alike
+        hashes = row_hashes(handler.df, numbers_as_float=True)
+        seen = self._seen_hashes
+        is_duplicate = pd.Series(hashes).duplicated().to_numpy() | np.fromiter(
+            (h in seen for h in hashes.tolist()), dtype=bool, count=len(hashes))
+        seen.update(hashes[~(is_duplicate | drop_mask)].tolist())
+        return is_duplicate
+
+    def apply(self, handler: DataHandler, streaming: bool = False):
+        df = handler.get_dataframe()
+        drop_mask = np.zeros(len(df), dtype=bool)
+        remove_duplicates = False
+        for step in self.steps:
+            if step["operation"] == 'drop_duplicates':
+                remove_duplicates = True
+                continue
+            column = step["params"].get("column")
+            if column:
+                if column not in df.columns:
+                    raise ValueError(f"Column '{column}' not found.")
+                drop_mask |= df[column].isnull().to_numpy()
+            else:
+                drop_mask |= df.isnull().any(axis=1).to_numpy()
+        if remove_duplicates:
+            drop_mask |= self._duplicate_mask(handler, drop_mask, streaming)
+        if drop_mask.any():
+            handler.df = df[~drop_mask]
+            handler._mark_data_changed()
+
+    def describe(self) -> str:
+        return " + ".join(step["operation"] for step in self.steps)
+
+
+class Pipeline:
+    """
+    An ordered list of DataHandler operations ({"operation": ..., "params": {...}}) recorded
+    in the GUI, saved as JSON (or YAML when PyYAML is installed) and replayed on new files.
+    """
+
+    def __init__(self, steps: list = None):
+        self.steps = [self._validate_step(step) for step in (steps or [])]
+
+    @staticmethod
+    def _validate_step(step) -> dict:
+        if not isinstance(step, dict) or "operation" not in step:
+            raise ValueError(f"Invalid pipeline step: {step!r}")
+        operation = step["operation"]
+        params = step.get("params") or {}
+        if operation not in REPLAYABLE_OPERATIONS:
+            raise ValueError(f"Unsupported pipeline operation: {operation}")
+        if not isinstance(params, dict):
+            raise ValueError(f"Parameters of pipeline step '{operation}' must be a mapping.")
+        try:
+            inspect.signature(getattr(DataHandler, operation)).bind(None, **params)
+        except TypeError as e:
+            raise ValueError(f"Invalid parameters for pipeline step '{operation}': {e}")
+        return {"operation": operation, "params": dict(params)}
+
+    @classmethod
+    def from_handler(cls, handler: DataHandler) -> 'Pipeline':
+        """The operations applied to the handler's data since it was loaded."""
+        return cls(handler.get_operation_log())
+
+    @classmethod
+    def load(cls, path: str) -> 'Pipeline':
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if path.endswith(('.yaml', '.yml')):
+                    if yaml is None:
+                        raise ValueError("PyYAML is required to read YAML pipelines. Please install it or use JSON.")
+                    data = yaml.safe_load(f)
+                else:
+                    data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Failed to read pipeline file: {e}")
+        if yaml is not None and path.endswith(('.yaml', '.yml')) and data is None:
+            data = {}
+        if not isinstance(data, dict) or not isinstance(data.get("steps", []), list):
+            raise ValueError("Invalid pipeline file: expected a mapping with a 'steps' list.")
+        if data.get("version", PIPELINE_FORMAT_VERSION) > PIPELINE_FORMAT_VERSION:
+            raise ValueError(f"Pipeline format version {data['version']} is newer than this version of Helwan-Insight supports.")
+        return cls(data.get("steps", []))
+
+    def to_dict(self) -> dict:
+        return {"version": PIPELINE_FORMAT_VERSION, "steps": [dict(step) for step in self.steps]}
+
+    def save(self, path: str):
+        # Round trip through JSON first so numpy values become plain numbers in both formats
+        data = json.loads(json.dumps(self.to_dict(), default=_to_builtin))
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                if path.endswith(('.yaml', '.yml')):
+                    if yaml is None:
+                        raise ValueError("PyYAML is required to write YAML pipelines. Please install it or use JSON.")
+                    yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+                else:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            raise IOError(f"Failed to save pipeline file: {e}")
+
+    def apply(self, handler: DataHandler) -> int:
+        """
+        Replays the steps one by one on the handler's current data. Every step is recorded
+        in the handler's history, so each one can be undone on its own.
+        Returns the number of steps applied.
+        """
+        for step in self.steps:
+            getattr(handler, step["operation"])(**step["params"])
+        return len(self.steps)
+
+    def can_stream(self) -> bool:
+        """True when every step can be applied to a chunk of rows independently of the others."""
+        return all(_is_row_local(step) for step in self.steps)
+
+    def stages(self) -> list:
+        """The steps with consecutive row filters fused into a single stage."""
+        stages = []
+        for step in self.steps:
+            if _is_row_filter(step):
+                if stages and isinstance(stages[-1], _RowFilterStage):
+                    stages[-1].steps.append(step)
+                else:
+                    stages.append(_RowFilterStage([step]))
+            else:
+                stages.append(_StepStage(step))
+        return stages
+
+    def run(self, input_path: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+        """
+        Replays the pipeline on a file without the GUI and writes the result.
+        CSV to CSV runs of row-local pipelines are streamed chunk_size rows at a time, so
+        memory use does not grow with the file; anything else is processed in memory.
+        Streamed duplicate removal compares row hashes only (see _RowFilterStage); use
+        chunk_size=0, which disables streaming, for exact value comparison.
+        """
+        stages = self.stages()
+        for stage in stages:
+            stage.reset()
+        streamed = bool(chunk_size) and self.can_stream() and input_path.endswith('.csv') and output_path.endswith('.csv')
+        handler = _new_headless_handler()
+
+        if streamed:
+            rows_in = rows_out = 0
+            try:
+                chunks = pd.read_csv(input_path, chunksize=chunk_size)
+            except Exception as e:
+                raise ValueError(f"Failed to load CSV file: {e}")
+            try:
+                with open(output_path, 'w', encoding='utf-8-sig', newline='') as output, chunks:
+                    for position, chunk in enumerate(chunks):
+                        rows_in += len(chunk)
+                        handler.df = chunk
+                        for stage in stages:
+                            stage.apply(handler, streaming=True)
+                        rows_out += len(handler.df)
+                        handler.df.to_csv(output, header=(position == 0), index=False)
+            except Exception:
+                # Do not leave a half-written output file behind
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                raise
+        else:
+            handler.file_path = input_path
+            rows_in = len(handler.load_data())
+            for stage in stages:
+                stage.apply(handler)
+            rows_out = len(handler.df)
+            handler.save_data(output_path)
+
+        return {
+            "input": input_path,
+            "output": output_path,
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "streamed": streamed,
+            "stages": [stage.describe() for stage in stages],
+        }
@@ -0,0 +1,102 @@
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Default byte budgets of the prepared plot data and rendered figure caches
+DATA_CACHE_BYTES = 256 * 1024 ** 2
+FIGURE_CACHE_BYTES = 256 * 1024 ** 2
+
+
+class Uncacheable(Exception):
+    """Raised by freeze for values that cannot be part of a cache key (e.g. data arrays)."""
+
+
+def freeze(value):
+    """
+    A hashable stand-in for plot options: containers become tuples, functions are
+    identified by name and bound object, so the same plot spec always gives the same key.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, (np.ndarray, pd.Series)) for item in value):
+            raise Uncacheable()
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, functools.partial):
+        return ('partial', freeze(value.func), freeze(value.args), freeze(value.keywords))
+    if hasattr(value, '__self__') and hasattr(value, '__func__'):
+        return ('method', value.__func__.__qualname__, id(value.__self__))
+    if callable(value):
+        return ('function', getattr(value, '__qualname__', repr(value)), id(value))
+    raise Uncacheable()
+
+
+def estimate_size(value) -> int:
+    """Approximate bytes held by cached data (arrays, frames, and containers and objects holding them)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=False)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, dict):
+        return 64 + sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return 64 + sum(estimate_size(item) for item in value)
+    if hasattr(value, '__dict__'):
+        return 64 + sum(estimate_size(item) for item in vars(value).values())
+    return 64
+
+
+class PlotCache:
+    """
+    A thread-safe least-recently-used cache bounded by the total (estimated) byte size of
+    its values. Entries larger than the whole budget are not stored.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size: int):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _key, (_value, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def holds(self, value) -> bool:
+        """Whether this very object is cached (so it must not be reused or modified)."""
+        with self._lock:
+            return any(cached is value for cached, _size in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
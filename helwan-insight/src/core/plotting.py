@@ -0,0 +1,516 @@
+import time
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LogNorm
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from core.correlation import pearson_matrix, clustered
+from core.decimation import numeric_positions, decimate_line, density_grid
+from core.histograms import FineHistogram
+from core.kde import fft_kde
+from core.pairplot import select_pairplot_columns, draw_pairplot, MAX_PAIRPLOT_COLUMNS
+from core.plot_cache import PlotCache, estimate_size
+from core.tracing import traced
+
+# Plot types render_plot understands
+PLOT_TYPES = ('histogram', 'bar', 'boxplot', 'scatter', 'line', 'pie', 'heatmap', 'pairplot', 'violin', 'group_boxplot',
+              'xy_scatter')
+
+# Plot types drawn from the whole frame rather than one column
+FRAME_PLOT_TYPES = ('heatmap', 'pairplot')
+
+# Plot types drawn at the level of detail of the output size, which can be zoomed and
+# panned along x (options["x_range"]) and are then re-decimated from the full data
+ZOOMABLE_PLOT_TYPES = ('histogram', 'line', 'scatter', 'xy_scatter', 'heatmap')
+# Zoomable plot types that also zoom along y (options["y_range"])
+XY_ZOOMABLE_PLOT_TYPES = ('xy_scatter', 'heatmap')
+
+DEFAULT_DPI = 100
+
+# Bin count of histograms when options["bins"] is not given
+DEFAULT_HISTOGRAM_BINS = 20
+
+# Scatter plots with more points than this per pixel of width are drawn as a density grid
+SCATTER_POINTS_PER_PIXEL = 25
+# Size in pixels of one cell of that grid
+DENSITY_CELL_PIXELS = 4
+
+# Stages reported through progress_callback: preparing data, drawing, rasterizing
+RENDER_STAGES = 3
+
+# Heatmaps write the value into each cell when at most this many cells are in view
+HEATMAP_ANNOTATE_MAX_CELLS = 400
+# and label every row and column in view up to this many of them
+HEATMAP_MAX_TICK_LABELS = 60
+
+# Least time between two previews of a plot drawn piece by piece (pair plots)
+PREVIEW_INTERVAL_SECONDS = 0.25
+
+
+class RenderCancelled(Exception):
+    """Raised inside render_plot when its request was superseded by a newer one."""
+
+
+def _identity(text):
+    return text
+
+
+def prepare_plot_data(plot_type: str, column: str, df: pd.DataFrame, options: dict = None) -> dict:
+    """
+    Does the data work for a plot (value counts, correlations, dropping missing values...)
+    and checks that the data suits the plot. Raises ValueError with a user-facing message.
+    Histograms are re-binned (options["bins"], options["x_range"]) from a FineHistogram,
+    taken from options["histogram_source"](column) when given (e.g. a cached one from
+    DataHandler.get_fine_histogram) and otherwise built from the column; when zoomed in
+    below the width of a fine bin they are counted from the column values in view. Violins are drawn
+    from (label, density) pairs given by options["violin_source"](column) (e.g.
+    DataHandler.get_violin_densities) or estimated from the column (see core.kde).
+    Heatmaps show the correlation matrix from options["correlation_source"]() (e.g.
+    DataHandler.get_correlation_matrix) or computed from the frame, reordered by
+    hierarchical clustering when options["cluster"] is set.
+    """
+    options = options or {}
+    if plot_type not in PLOT_TYPES:
+        raise ValueError(f"The selected plot type '{plot_type}' is not yet supported for '{column}'.")
+    if plot_type == 'group_boxplot':
+        groups = [(label, values) for label, values in zip(options["labels"], options["values"]) if len(values)]
+        if not groups:
+            raise ValueError("No data available to plot.")
+        return {"groups": groups}
+
+    if df is None or df.empty:
+        raise ValueError("No data available to plot.")
+    if plot_type == 'pairplot':
+        columns = select_pairplot_columns(df, options.get("columns"), options.get("max_columns", MAX_PAIRPLOT_COLUMNS))
+        return {"frame": df[columns]}
+    if plot_type == 'heatmap':
+        source = options.get("correlation_source")
+        if source:
+            matrix = source()
+        else:
+            numerical_df = df.select_dtypes(include=['number'])
+            if numerical_df.empty:
+                raise ValueError("No numerical data available for heatmap.")
+            matrix = pearson_matrix(numerical_df)
+            if options.get("cluster"):
+                matrix = clustered(matrix)
+        return _prepare_heatmap(matrix, options)
+
+    if column is None or column not in df.columns:
+        raise ValueError("Selected column does not exist in the data.")
+    col_data = df[column]
+
+    if plot_type == 'histogram':
+        if not pd.api.types.is_numeric_dtype(col_data):
+            raise ValueError("Histogram requires a numerical column.")
+        source = options.get("histogram_source")
+        histogram = source(column) if source else FineHistogram.from_values(col_data.to_numpy(dtype=float, na_value=np.nan))
+        bins, x_range = options.get("bins", DEFAULT_HISTOGRAM_BINS), options.get("x_range")
+        if x_range is not None and (max(x_range) - min(x_range)) / bins < histogram.width:
+            # The fine histogram cannot resolve bins this narrow, so count the values in view
+            values = col_data.to_numpy(dtype=float, na_value=np.nan)
+            low, high = sorted(x_range)
+            counts, edges = np.histogram(values[(values >= low) & (values <= high)], bins=bins, range=(low, high))
+        else:
+            counts, edges = histogram.rebin(bins, x_range)
+        return {"counts": counts, "edges": edges}
+    if plot_type == 'bar':
+        value_counts = col_data.value_counts()
+        top = len(value_counts) > 10
+        if top:
+            value_counts = value_counts.nlargest(10)
+        return {"counts": value_counts, "top": top}
+    if plot_type == 'boxplot':
+        return {"values": col_data.dropna().to_numpy()}
+    if plot_type == 'scatter':
+        if not pd.api.types.is_numeric_dtype(col_data):
+            raise ValueError("Scatter plot requires numerical data for the selected column.")
+        return _prepare_scatter(df.index.to_numpy(), col_data.to_numpy(), options)
+    if plot_type == 'xy_scatter':
+        y_column = options.get("y_column")
+        if y_column not in df.columns:
+            raise ValueError("Selected column does not exist in the data.")
+        if not (pd.api.types.is_numeric_dtype(col_data) and pd.api.types.is_numeric_dtype(df[y_column])):
+            raise ValueError("X/Y plot requires two numerical columns.")
+        return _prepare_scatter(col_data.to_numpy(), df[y_column].to_numpy(), options)
+    if plot_type == 'line':
+        if pd.api.types.is_datetime64_any_dtype(col_data):
+            data = _prepare_line(col_data.to_numpy(), df.index.to_numpy(), options)
+            data["x_is_column"] = True
+        else:
+            data = _prepare_line(df.index.to_numpy(), col_data.to_numpy(), options)
+            data["x_is_column"] = False
+        return data
+    if plot_type == 'pie':
+        if pd.api.types.is_numeric_dtype(col_data) and col_data.nunique() == len(col_data):
+            raise ValueError("Pie chart is best suited for categorical or discrete numerical data.")
+        return {"counts": col_data.value_counts()}
+    if plot_type == 'violin':
+        if not pd.api.types.is_numeric_dtype(col_data):
+            raise ValueError("Violin plot requires a numerical column.")
+        source = options.get("violin_source")
+        if source:
+            return {"densities": source(column)}
+        return {"densities": [(column, fft_kde(FineHistogram.from_values(col_data.to_numpy(dtype=float, na_value=np.nan))))]}
+    return {}
+
+
+def _visible_points(x: np.ndarray, y: np.ndarray, options: dict) -> tuple:
+    # Float coordinates of both axes and the positions of the points inside options["x_range"]
+    # and options["y_range"]
+    x_numbers, y_numbers = numeric_positions(x), numeric_positions(y)
+    visible = ~(np.isnan(x_numbers) | np.isnan(y_numbers))
+    for numbers, view_range in ((x_numbers, options.get("x_range")), (y_numbers, options.get("y_range"))):
+        if view_range is not None:
+            visible &= (numbers >= view_range[0]) & (numbers <= view_range[1])
+    return x_numbers, y_numbers, np.flatnonzero(visible)
+
+
+def _prepare_line(x: np.ndarray, y: np.ndarray, options: dict) -> dict:
+    # Keeps about two points per pixel of width (LTTB or min/max per pixel column)
+    x_numbers, y_numbers, positions = _visible_points(x, y, options)
+    width = options.get("pixel_size", (800, 600))[0]
+    if options.get("x_range") is None and len(positions) <= 2 * width:
+        # Everything fits: draw all rows, keeping the gaps at missing values
+        return {"x": x, "y": y, "total": len(positions), "shown": len(positions)}
+    shown = positions[decimate_line(x_numbers[positions], y_numbers[positions], width)]
+    return {"x": x[shown], "y": y[shown], "total": len(positions), "shown": len(shown)}
+
+
+def _prepare_scatter(x: np.ndarray, y: np.ndarray, options: dict) -> dict:
+    # Too many points to tell apart (or options["density"]): count them per cell of a grid a
+    # few pixels wide, covering the visible extent, instead
+    x_numbers, y_numbers, positions = _visible_points(x, y, options)
+    width, height = options.get("pixel_size", (800, 600))
+    data = {"total": len(positions), "x_is_date": np.issubdtype(x.dtype, np.datetime64)}
+    if not options.get("density") and len(positions) <= SCATTER_POINTS_PER_PIXEL * width:
+        data.update(x=x[positions], y=y[positions], shown=len(positions))
+        return data
+    if len(positions) == 0:
+        raise ValueError("No data available to plot.")
+    counts, x_edges, y_edges = density_grid(
+        x_numbers[positions], y_numbers[positions],
+        (width // DENSITY_CELL_PIXELS, height // DENSITY_CELL_PIXELS),
+        x_range=options.get("x_range"), y_range=options.get("y_range"))
+    data.update(density=counts, x_edges=x_edges, y_edges=y_edges, shown=None)
+    return data
+
+
+def _draw_scatter(figure: Figure, ax, data: dict, options: dict, _):
+    if data["shown"] is None:
+        # One image pixel per grid cell, empty cells left blank
+        counts = np.ma.masked_equal(data["density"].T, 0)
+        extent = (data["x_edges"][0], data["x_edges"][-1], data["y_edges"][0], data["y_edges"][-1])
+        image = ax.imshow(counts, origin='lower', extent=extent, aspect='auto', interpolation='nearest',
+                          cmap='viridis', norm=LogNorm(vmin=1, vmax=max(int(data["density"].max()), 2)))
+        figure.colorbar(image, ax=ax, label=_("Points per cell"))
+        if data["x_is_date"]:
+            ax.xaxis_date()
+    else:
+        ax.scatter(data["x"], data["y"])
+    if options.get("x_range") is not None:
+        ax.set_xlim(*options["x_range"])
+    if options.get("y_range") is not None:
+        ax.set_ylim(*options["y_range"])
+    _draw_level_of_detail_note(ax, data, _)
+
+
+def _cell_window(view_range, n: int) -> tuple:
+    # The first and past-the-end cell of a matrix axis within a view range (at least one cell)
+    if view_range is None:
+        return 0, n
+    low, high = sorted(view_range)
+    first = min(max(int(np.floor(low)), 0), n - 1)
+    return first, max(min(int(np.ceil(high)), n), first + 1)
+
+
+def _strongest_blocks(values: np.ndarray, block: tuple) -> np.ndarray:
+    # Reduces each block_rows x block_columns block of cells to its value farthest from zero,
+    # so strong correlations stay visible however far the matrix is zoomed out
+    block_rows, block_columns = block
+    rows, columns = values.shape
+    padded = np.full((-(-rows // block_rows) * block_rows, -(-columns // block_columns) * block_columns), np.nan)
+    padded[:rows, :columns] = values
+    blocks = padded.reshape(padded.shape[0] // block_rows, block_rows, padded.shape[1] // block_columns, block_columns)
+    blocks = blocks.transpose(0, 2, 1, 3).reshape(blocks.shape[0], blocks.shape[2], -1)
+    strongest = np.where(np.isnan(blocks), -1, np.abs(blocks)).argmax(axis=2)
+    return np.take_along_axis(blocks, strongest[..., None], axis=2)[..., 0]
+
+
+def _prepare_heatmap(matrix: pd.DataFrame, options: dict) -> dict:
+    # Cuts the cells in view (options["x_range"], options["y_range"], in cells) out of the
+    # matrix and, where there are more of them than pixels, reduces them to one per pixel
+    n = len(matrix.columns)
+    if n == 0:
+        raise ValueError("No numerical data available for heatmap.")
+    first_column, last_column = _cell_window(options.get("x_range"), n)
+    first_row, last_row = _cell_window(options.get("y_range"), n)
+    values = matrix.to_numpy(dtype=float)[first_row:last_row, first_column:last_column]
+    width, height = options.get("pixel_size", (800, 600))
+    block = (-(-values.shape[0] // height), -(-values.shape[1] // width))
+    if block != (1, 1):
+        # Self-correlations are always 1; blocks on the diagonal show the strongest other pair
+        values = values.copy()
+        diagonal = np.arange(max(first_row, first_column), min(last_row, last_column))
+        values[diagonal - first_row, diagonal - first_column] = np.nan
+        values = _strongest_blocks(values, block)
+    return {"values": values, "labels": [str(label) for label in matrix.columns], "block": block,
+            "window": (first_column, last_column, first_row, last_row)}
+
+
+def _label_heatmap_axis(axis, labels: list, first: int, last: int, rotation: int):
+    # Every label when few cells are in view, otherwise a selection at whole cell positions
+    if last - first <= HEATMAP_MAX_TICK_LABELS:
+        axis.set_ticks(np.arange(first, last) + 0.5)
+        axis.set_ticklabels(labels[first:last], rotation=rotation, fontsize=8 if last - first > 20 else None)
+        return
+    axis.set_major_locator(MaxNLocator(nbins=20, integer=True))
+    axis.set_major_formatter(FuncFormatter(
+        lambda position, _index: labels[int(position)] if 0 <= int(position) < len(labels) else ""))
+    for label in axis.get_ticklabels():
+        label.set_rotation(rotation)
+
+
+def _draw_heatmap(figure: Figure, ax, data: dict, options: dict, _):
+    # One image for the whole matrix; the cells are one unit wide, row 0 at the top
+    first_column, last_column, first_row, last_row = data["window"]
+    block_rows, block_columns = data["block"]
+    values = data["values"]
+    extent = (first_column, first_column + values.shape[1] * block_columns,
+              first_row + values.shape[0] * block_rows, first_row)
+    image = ax.imshow(values, cmap='coolwarm', vmin=-1, vmax=1, extent=extent, aspect='auto', interpolation='nearest')
+    figure.colorbar(image, ax=ax)
+    n = len(data["labels"])
+    x_low, x_high = sorted(options.get("x_range") or (0, n))
+    y_low, y_high = sorted(options.get("y_range") or (0, n))
+    ax.set_xlim(x_low, x_high)
+    ax.set_ylim(y_high, y_low)
+    _label_heatmap_axis(ax.xaxis, data["labels"], first_column, last_column, rotation=90)
+    _label_heatmap_axis(ax.yaxis, data["labels"], first_row, last_row, rotation=0)
+
+    if data["block"] == (1, 1) and values.size <= HEATMAP_ANNOTATE_MAX_CELLS:
+        for (row, column), value in np.ndenumerate(values):
+            if not np.isnan(value):
+                ax.text(first_column + column + 0.5, first_row + row + 0.5, f"{value:.2f}", ha='center', va='center',
+                        fontsize=8, color='white' if abs(value) > 0.6 else 'black')
+    elif data["block"] != (1, 1):
+        _draw_corner_note(ax, _("Blocks of {rows} x {columns} cells, strongest correlation shown").format(
+            rows=block_rows, columns=block_columns))
+    ax.set_title(_("Correlation Heatmap"))
+    figure.tight_layout()
+
+
+def _draw_level_of_detail_note(ax, data: dict, _):
+    # Tells the reader the view does not show every row
+    if data["shown"] is None:
+        note = _("Density of {total} points").format(total=f"{data['total']:,}")
+    elif data["shown"] < data["total"]:
+        note = _("Decimated: {shown} of {total} points").format(shown=f"{data['shown']:,}", total=f"{data['total']:,}")
+    else:
+        return
+    _draw_corner_note(ax, note)
+
+
+def _draw_corner_note(ax, note: str):
+    ax.text(0.99, 0.01, note, transform=ax.transAxes, ha='right', va='bottom', fontsize=8, color='dimgray',
+            bbox={"boxstyle": "round", "facecolor": "white", "alpha": 0.8, "edgecolor": "lightgray"})
+
+
+def draw_plot(figure: Figure, plot_type: str, column: str, data: dict, translate=None, options: dict = None,
+              panel_callback=None, mp_context=None):
+    """
+    Draws prepared plot data onto an empty figure. Plots drawn panel by panel (pair plots)
+    call panel_callback(completed, total) after each panel; their panel data may be computed
+    in worker processes started with mp_context.
+    """
+    _ = translate or _identity
+    options = options or {}
+
+    if plot_type == 'pairplot':
+        draw_pairplot(figure, data["frame"], options.get("mode", 'sample'), n_jobs=options.get("n_jobs"),
+                      panel_callback=panel_callback, mp_context=mp_context)
+        return
+
+    ax = figure.add_subplot(111)
+    if plot_type == 'histogram':
+        # One weighted value per bin draws the pre-computed counts as ordinary histogram bars
+        ax.hist(data["edges"][:-1], bins=data["edges"], weights=data["counts"])
+        if options.get("x_range") is not None:
+            ax.set_xlim(*options["x_range"])
+        ax.grid(True)
+        ax.set_title(_("Histogram of {column}").format(column=column))
+        ax.set_xlabel(_(column))
+        ax.set_ylabel(_("Frequency"))
+    elif plot_type == 'bar':
+        counts = data["counts"]
+        ax.bar(counts.index.astype(str), counts.values)
+        if data["top"]:
+            ax.set_title(_("Bar Chart of Top 10 {column}").format(column=column))
+        else:
+            ax.set_title(_("Bar Chart of {column}").format(column=column))
+        ax.set_xlabel(_(column))
+        ax.set_ylabel(_("Count"))
+        figure.autofmt_xdate(rotation=45)
+    elif plot_type == 'boxplot':
+        ax.boxplot(data["values"])
+        ax.set_xticks([1])
+        ax.set_xticklabels([column])
+        ax.set_title(_("Box Plot of {column}").format(column=column))
+        ax.set_ylabel(_(column))
+    elif plot_type == 'scatter':
+        _draw_scatter(figure, ax, data, options, _)
+        ax.set_title(_("Scatter Plot of {column}").format(column=column))
+        ax.set_xlabel(_("Index"))
+        ax.set_ylabel(_(column))
+    elif plot_type == 'xy_scatter':
+        _draw_scatter(figure, ax, data, options, _)
+        ax.set_title(_("{y_column} vs {x_column}").format(y_column=options["y_column"], x_column=column))
+        ax.set_xlabel(_(column))
+        ax.set_ylabel(_(options["y_column"]))
+    elif plot_type == 'line':
+        ax.plot(data["x"], data["y"])
+        if options.get("x_range") is not None:
+            ax.set_xlim(*options["x_range"])
+        _draw_level_of_detail_note(ax, data, _)
+        if data["x_is_column"]:
+            ax.set_xlabel(_(column))
+            ax.set_ylabel(_("Index"))
+        else:
+            ax.set_xlabel(_("Index"))
+            ax.set_ylabel(_(column))
+        ax.set_title(_("Line Plot of {column}").format(column=column))
+        figure.autofmt_xdate()
+    elif plot_type == 'pie':
+        counts = data["counts"]
+        ax.pie(counts, labels=counts.index.astype(str), autopct='%1.1f%%', startangle=90)
+        ax.set_title(_("Pie Chart of {column}").format(column=column))
+        ax.axis('equal')
+    elif plot_type == 'heatmap':
+        _draw_heatmap(figure, ax, data, options, _)
+    elif plot_type == 'violin':
+        _draw_violins(figure, ax, column, data["densities"], options, _)
+    elif plot_type == 'group_boxplot':
+        _draw_group_boxplot(figure, ax, column, data["groups"], options, _)
+
+
+def _draw_violins(figure: Figure, ax, column: str, densities: list, options: dict, _):
+    # Densities share one scale, so every violin encloses the same area (as in seaborn)
+    keys = options.get("keys")
+    max_groups = options.get("max_groups", 30)
+    title = _("Violin Plot of {column}").format(column=column)
+    if keys:
+        title = _("Violin Plot of {column} by {keys}").format(column=column, keys=", ".join(keys))
+    if len(densities) > max_groups:
+        densities = sorted(densities, key=lambda item: item[1]["n"], reverse=True)[:max_groups]
+        title += " " + _("(largest {n} groups)").format(n=max_groups)
+    import seaborn as sns  # only needed here, and slow to import
+
+    scale = 0.4 / max(float(density["density"].max()) for _label, density in densities)
+    colors = sns.color_palette(n_colors=len(densities))
+    for position, ((_label, density), color) in enumerate(zip(densities, colors), start=1):
+        half_widths = density["density"] * scale
+        ax.fill_betweenx(density["grid"], position - half_widths, position + half_widths,
+                         facecolor=color, edgecolor='dimgray', linewidth=1)
+        for quartile, style in zip(density["quartiles"], ((0, (3, 3)), (0, (6, 3)), (0, (3, 3)))):
+            half_width = np.interp(quartile, density["grid"], half_widths)
+            ax.plot([position - half_width, position + half_width], [quartile, quartile],
+                    color='dimgray', linestyle=style, linewidth=1)
+    ax.set_xticks(range(1, len(densities) + 1))
+    if keys:
+        ax.set_xticklabels([label for label, _density in densities], rotation=45, ha='right')
+        ax.set_xlabel(", ".join(keys))
+    else:
+        ax.set_xticklabels([column])
+    ax.set_title(title)
+    ax.set_ylabel(_(column))
+    figure.tight_layout()
+
+
+def _draw_group_boxplot(figure: Figure, ax, column: str, groups: list, options: dict, _):
+    keys = options.get("keys", [])
+    max_groups = options.get("max_groups", 30)
+    title = _("Box Plot of {column} by {keys}").format(column=column, keys=", ".join(keys))
+    if len(groups) > max_groups:
+        # Keep the largest groups so the plot stays readable
+        groups = sorted(groups, key=lambda group: len(group[1]), reverse=True)[:max_groups]
+        title += " " + _("(largest {n} groups)").format(n=max_groups)
+    ax.boxplot([group_values for _label, group_values in groups])
+    ax.set_xticks(range(1, len(groups) + 1))
+    ax.set_xticklabels([label for label, _values in groups], rotation=45, ha='right')
+    ax.set_title(title)
+    ax.set_xlabel(", ".join(keys))
+    ax.set_ylabel(_(column))
+    figure.tight_layout()
+
+
+@traced('plot', rows='df')
+def render_plot(plot_type: str, column: str = None, df: pd.DataFrame = None, options: dict = None,
+                translate=None, width: int = 800, height: int = 600, dpi: int = DEFAULT_DPI,
+                progress_callback=None, cancel_event=None, figure: Figure = None,
+                partial_result_callback=None, data_cache: PlotCache = None, cache_key: tuple = None,
+                mp_context=None) -> Figure:
+    """
+    Prepares and renders a plot into an offscreen Agg figure of width x height pixels.
+    Uses no pyplot or Qt state, so it can run in a worker thread. progress_callback is
+    called as (completed, RENDER_STAGES); when cancel_event (a threading.Event) is set,
+    RenderCancelled is raised at the next stage boundary. Line and scatter plots are
+    decimated to the level of detail the output size can show.
+    A figure from an earlier render that is no longer in use can be passed to be cleared
+    and drawn into again. For plots drawn panel by panel, partial_result_callback receives
+    the pixels drawn so far (see figure_to_rgba) every PREVIEW_INTERVAL_SECONDS.
+    With a data_cache and a cache_key identifying the plot spec and data version, the
+    prepared plot data is reused across renders (e.g. at another size or language).
+    mp_context is the start method of any worker processes; pass 'spawn' from threads.
+    """
+    def stage_done(completed: int):
+        if cancel_event is not None and cancel_event.is_set():
+            raise RenderCancelled()
+        if progress_callback:
+            progress_callback(completed, RENDER_STAGES)
+
+    stage_done(0)
+    options = dict(options or {}, pixel_size=(max(width, 1), max(height, 1)))
+    data = data_key = None
+    if data_cache is not None and cache_key is not None:
+        # Decimated plots are prepared for one output size
+        data_key = cache_key + ((options["pixel_size"],) if plot_type in ZOOMABLE_PLOT_TYPES else ())
+        data = data_cache.get(data_key)
+    if data is None:
+        data = prepare_plot_data(plot_type, column, df, options)
+        if data_key is not None:
+            data_cache.put(data_key, data, estimate_size(data))
+    stage_done(1)
+    if figure is None:
+        figure = Figure(figsize=(max(width, 1) / dpi, max(height, 1) / dpi), dpi=dpi)
+    else:
+        figure.clear()
+        figure.set_dpi(dpi)
+        figure.set_size_inches(max(width, 1) / dpi, max(height, 1) / dpi)
+    if not isinstance(figure.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(figure)
+
+    last_preview = [time.monotonic()]
+
+    def panel_done(completed: int, total: int):
+        if cancel_event is not None and cancel_event.is_set():
+            raise RenderCancelled()
+        if partial_result_callback and completed < total and \
+                time.monotonic() - last_preview[0] >= PREVIEW_INTERVAL_SECONDS:
+            figure.canvas.draw()
+            partial_result_callback(figure_to_rgba(figure).copy())
+            last_preview[0] = time.monotonic()
+
+    draw_plot(figure, plot_type, column, data, translate, options, panel_callback=panel_done,
+              mp_context=mp_context)
+    stage_done(2)
+    figure.canvas.draw()
+    stage_done(RENDER_STAGES)
+    return figure
+
+
+def figure_to_rgba(figure: Figure) -> np.ndarray:
+    """The rendered pixels of an Agg figure as a (height, width, 4) uint8 array."""
+    return np.asarray(figure.canvas.buffer_rgba())
@@ -0,0 +1,280 @@
+import base64
+import html
+import io
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from core.data_handler import DataHandler
+from core.export import default_plot_type
+from core.parallel import map_in_processes
+from core.plotting import prepare_plot_data, draw_plot
+
+# Formats of the charts embedded in a report: PNG images, or SVG (vector) drawings
+REPORT_IMAGE_FORMATS = ('png', 'svg')
+
+# Size (inches) and resolution of the small per-column charts and of the heatmap. Line
+# charts are decimated to these pixel sizes and heatmaps reduced to them (see core.plotting)
+COLUMN_CHART_SIZE = (4.5, 2.8)
+HEATMAP_CHART_SIZE = (7, 6)
+REPORT_DPI = 100
+
+# Tests run when none are requested: chi-square tests between pairs of categorical
+# columns with at most this many categories, up to REPORT_MAX_DEFAULT_TESTS pairs
+REPORT_MAX_TEST_CATEGORIES = 20
+REPORT_MAX_DEFAULT_TESTS = 10
+
+# Strongest column pairs listed under the heatmap
+REPORT_TOP_CORRELATIONS = 10
+
+_STYLE = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }
+h1 { border-bottom: 2px solid #444; padding-bottom: .3em; }
+h2 { margin-top: 2em; border-bottom: 1px solid #bbb; }
+table { border-collapse: collapse; margin: .5em 0; font-size: .9em; }
+th, td { border: 1px solid #ccc; padding: .25em .6em; text-align: right; }
+th { background: #f0f0f0; }
+td:first-child, th:first-child { text-align: left; }
+.column { display: flex; gap: 1.5em; align-items: flex-start; border-bottom: 1px dashed #ddd; padding: 1em 0; }
+.note { color: #777; font-style: italic; }
+img, svg { max-width: 100%; height: auto; }
+"""
+
+# The frame and translation function shared with the worker processes, set once per
+# worker by _init_report_worker
+_report_data = {}
+
+
+def _init_report_worker(data: dict):
+    global _report_data
+    _report_data = data
+
+
+def _handler(df: pd.DataFrame) -> DataHandler:
+    handler = DataHandler()
+    handler.df = df
+    return handler
+
+
+def default_tests(df: pd.DataFrame) -> list:
+    """Chi-square tests between pairs of low-cardinality categorical columns."""
+    handler = _handler(df)
+    categorical = [column for column in df.columns
+                   if handler.detect_column_type(df[column]) == "Categorical"
+                   and 1 < df[column].nunique() <= REPORT_MAX_TEST_CATEGORIES]
+    pairs = itertools.islice(itertools.combinations(categorical, 2), REPORT_MAX_DEFAULT_TESTS)
+    return [('chisquare', column1, column2) for column1, column2 in pairs]
+
+
+def report_sections(df: pd.DataFrame, columns: list = None, tests: list = None) -> list:
+    """
+    The sections of a report, in order: overview, missing values, correlations, outliers,
+    tests ((kind, column1, column2) with kind 'ttest' or 'chisquare'; default:
+    default_tests) and one profile per column (default: every column).
+    """
+    if df is None or df.empty:
+        raise ValueError("No data available for the report.")
+    columns = list(df.columns) if columns is None else list(columns)
+    for column in columns:
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found.")
+    tests = default_tests(df) if tests is None else list(tests)
+    for kind, column1, column2 in tests:
+        if kind not in ('ttest', 'chisquare'):
+            raise ValueError(f"Unsupported test: {kind}")
+
+    sections = [('overview', None), ('missing', None), ('correlations', None), ('outliers', None)]
+    if tests:
+        sections.append(('tests', tests))
+    sections += [('column', column) for column in columns]
+    return sections
+
+
+def _table_html(table: pd.DataFrame, index: bool = False) -> str:
+    return table.to_html(index=index, border=0, na_rep='', escape=True,
+                         float_format=lambda value: f"{value:.4g}")
+
+
+def _figure_html(figure, image_format: str) -> str:
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=image_format, dpi=REPORT_DPI, bbox_inches='tight')
+    if image_format == 'svg':
+        svg = buffer.getvalue().decode('utf-8')
+        # Only the <svg> element is embedded, without the XML prolog and doctype
+        return svg[svg.index('<svg'):]
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return f'<img src="data:image/png;base64,{encoded}" alt="">'
+
+
+def _chart_html(plot_type: str, column: str, df: pd.DataFrame, size: tuple, options: dict = None) -> str:
+    translate = _report_data.get("translate")
+    options = dict(options or {}, pixel_size=(size[0] * REPORT_DPI, size[1] * REPORT_DPI))
+    data = prepare_plot_data(plot_type, column, df, options)
+    figure = Figure(figsize=size, dpi=REPORT_DPI)
+    draw_plot(figure, plot_type, column, data, translate, options)
+    return _figure_html(figure, _report_data.get("image_format", 'png'))
+
+
+def _overview_html(handler: DataHandler, _) -> str:
+    df = handler.df
+    rows = [
+        (_("Rows"), f"{len(df):,}"),
+        (_("Columns"), f"{len(df.columns):,}"),
+        (_("Numerical Columns"), f"{len(handler.get_numerical_columns()):,}"),
+        (_("Categorical Columns"), f"{len(handler.get_categorical_columns()):,}"),
+        (_("Missing Cells"), f"{int(df.isna().to_numpy().sum()):,}"),
+        (_("Duplicate Rows"), f"{int(handler.find_duplicates().sum()):,}"),
+        (_("Memory Usage"), f"{df.memory_usage(deep=True).sum() / 2 ** 20:.1f} MB"),
+    ]
+    return _table_html(pd.DataFrame(rows, columns=[_("Property"), _("Value")]))
+
+
+def _missing_html(handler: DataHandler, _) -> str:
+    summary = handler.get_missing_values_summary()
+    if summary.empty:
+        return f'<p class="note">{html.escape(_("No missing values found."))}</p>'
+    return _table_html(summary.rename(columns=_))
+
+
+def _correlations_html(handler: DataHandler, _) -> str:
+    if len(handler.get_numerical_columns()) < 2:
+        return f'<p class="note">{html.escape(_("At least two numerical columns are needed for correlations."))}</p>'
+    matrix = handler.get_correlation_matrix(cluster=True)
+    chart = _chart_html('heatmap', None, handler.df, HEATMAP_CHART_SIZE, {"correlation_source": lambda: matrix})
+    # Each pair once (upper triangle), strongest first
+    values = matrix.to_numpy()
+    rows, cols = np.triu_indices(len(matrix), k=1)
+    strengths = np.abs(values[rows, cols])
+    order = np.argsort(np.nan_to_num(strengths, nan=-1.0))[::-1][:REPORT_TOP_CORRELATIONS]
+    pairs = pd.DataFrame({
+        _("Column 1"): matrix.index[rows[order]],
+        _("Column 2"): matrix.columns[cols[order]],
+        _("Correlation"): values[rows[order], cols[order]],
+    })
+    return chart + f"<h3>{html.escape(_('Strongest Correlations'))}</h3>" + _table_html(pairs)
+
+
+def _outliers_html(handler: DataHandler, _) -> str:
+    if not handler.get_numerical_columns():
+        return f'<p class="note">{html.escape(_("No numerical columns found to detect outliers."))}</p>'
+    return _table_html(handler.get_outlier_summary().rename(columns=_))
+
+
+def _tests_html(handler: DataHandler, tests: list, _) -> str:
+    rows = []
+    for kind, column1, column2 in tests:
+        try:
+            if kind == 'ttest':
+                result = handler.perform_t_test(column1, column2)
+                statistic = result["t_statistic"]
+            else:
+                result = handler.perform_chi_square_test(column1, column2)
+                statistic = result["chi2_statistic"]
+        except ValueError as e:
+            rows.append((_("T-Test") if kind == 'ttest' else _("Chi-Square Test"), column1, column2,
+                         np.nan, np.nan, _(str(e))))
+            continue
+        rows.append((_(result["test_type"]), column1, column2, statistic, result["p_value"],
+                     _("Significant") if result["p_value"] < 0.05 else _("Not significant")))
+    table = pd.DataFrame(rows, columns=[_("Test"), _("Column 1"), _("Column 2"), _("Statistic"),
+                                        _("P-Value"), _("Result (at 0.05)")])
+    return _table_html(table)
+
+
+def _format_value(value) -> str:
+    if isinstance(value, (float, np.floating)):
+        return f"{value:.4g}"
+    if isinstance(value, (int, np.integer)):
+        return f"{value:,}"
+    return str(value)
+
+
+def _column_html(df: pd.DataFrame, column: str, _) -> str:
+    profile = _handler(df[[column]]).get_column_profile().iloc[0].drop('Column').dropna()
+    table = _table_html(pd.DataFrame({_("Property"): [_(name) for name in profile.index],
+                                      _("Value"): [_format_value(value) for value in profile.values]}))
+    try:
+        chart = _chart_html(default_plot_type(df[column]), column, df, COLUMN_CHART_SIZE)
+    except ValueError as e:
+        chart = f'<p class="note">{html.escape(_(str(e)))}</p>'
+    return f'<div class="column"><div>{table}</div><div>{chart}</div></div>'
+
+
+def _section_html(task: tuple) -> tuple:
+    # (kind, argument) -> (heading, body html, reason skipped or None), computed in a worker
+    # process. A section the data does not suit shows the reason instead of failing the report.
+    kind, argument = task
+    df = _report_data["df"]
+    _ = _report_data.get("translate") or (lambda text: text)
+    headings = {'overview': _("Dataset Overview"), 'missing': _("Missing Values"),
+                'correlations': _("Correlations"), 'outliers': _("Outliers (IQR Method)"),
+                'tests': _("Statistical Tests")}
+    heading = headings.get(kind) or argument
+    handler = _handler(df)
+    try:
+        if kind == 'overview':
+            body = _overview_html(handler, _)
+        elif kind == 'missing':
+            body = _missing_html(handler, _)
+        elif kind == 'correlations':
+            body = _correlations_html(handler, _)
+        elif kind == 'outliers':
+            body = _outliers_html(handler, _)
+        elif kind == 'tests':
+            body = _tests_html(handler, argument, _)
+        else:
+            body = _column_html(df, argument, _)
+    except ValueError as e:
+        return (heading, f'<p class="note">{html.escape(_(str(e)))}</p>', str(e))
+    return (heading, body, None)
+
+
+def generate_report(df: pd.DataFrame, output_path: str, columns: list = None, tests: list = None,
+                    image_format: str = 'png', title: str = None, translate=None, n_jobs: int = None,
+                    progress_callback=None, mp_context=None) -> dict:
+    """
+    Writes a self-contained HTML report of the frame to output_path: overview, missing
+    values, correlation heatmap, outliers, test results and per-column profiles with
+    small charts (see report_sections). The sections are computed across worker processes
+    and the charts embedded as PNG or SVG images. progress_callback is called as
+    (completed, total); mp_context is the start method of the workers (see
+    map_in_processes), translate must then be picklable. Returns {"path", "sections",
+    "skipped"}, skipped being (section heading, reason) pairs for sections the data does
+    not suit.
+    """
+    if image_format not in REPORT_IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    _ = translate or (lambda text: text)
+    sections = report_sections(df, columns, tests)
+    try:
+        results = map_in_processes(_section_html, sections, n_jobs=n_jobs, initializer=_init_report_worker,
+                                   initargs=({"df": df, "translate": translate, "image_format": image_format},),
+                                   progress_callback=progress_callback, mp_context=mp_context)
+    finally:
+        _init_report_worker({})
+
+    title = title or _("Helwan-Insight Report")
+    parts = [
+        '<!DOCTYPE html>',
+        '<html><head><meta charset="utf-8">',
+        f'<title>{html.escape(title)}</title>',
+        f'<style>{_STYLE}</style>',
+        '</head><body>',
+        f'<h1>{html.escape(title)}</h1>',
+        f'<p class="note">{html.escape(_("Generated on {date}").format(date=time.strftime("%Y-%m-%d %H:%M")))}</p>',
+    ]
+    in_columns = False
+    for (kind, _argument), (heading, body, _reason) in zip(sections, results):
+        if kind == 'column' and not in_columns:
+            parts.append(f'<h2>{html.escape(_("Column Profiles"))}</h2>')
+            in_columns = True
+        tag = 'h3' if kind == 'column' else 'h2'
+        parts.append(f'<section><{tag}>{html.escape(str(heading))}</{tag}>{body}</section>')
+    parts.append('</body></html>')
+    with open(output_path, 'w', encoding='utf-8') as output:
+        output.write("\n".join(parts))
+    skipped = [(heading, reason) for heading, _body, reason in results if reason]
+    return {"path": output_path, "sections": len(sections), "skipped": skipped}
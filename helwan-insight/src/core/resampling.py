@@ -0,0 +1,386 @@
+from itertools import combinations, islice
+from math import comb
+
+import numpy as np
+import pandas as pd
+
+from core.parallel import WorkerPool, map_in_processes
+
+BOOTSTRAP_STATISTICS = ('mean', 'median', 'std')
+
+# Number of resamples handled by a single worker task. Tasks are fixed-size so that the
+# random streams (and therefore the results) do not depend on the number of workers.
+RESAMPLES_PER_TASK = 250
+
+# Upper bound on the number of sampled values materialized at once inside a task.
+_MAX_BATCH_ELEMENTS = 4_000_000
+
+# Permutations evaluated by one worker task. The early-stopping check runs after every
+# task, in task order, so the same seed stops after the same number of permutations on
+# any machine.
+PERMUTATIONS_PER_TASK = 1000
+
+# Largest number of label arrangements enumerated by the exact tests.
+EXACT_MAX_ARRANGEMENTS = 1_000_000
+
+# z-score used to decide that a Monte Carlo p-value is resolved relative to alpha (99.9%).
+_EARLY_STOP_Z = 3.29
+
+# Data shared with the worker processes, set once per worker by _init_bootstrap_worker.
+_bootstrap_data = {}
+
+# Same idea for the permutation tests.
+_permutation_data = {}
+
+
+def _init_bootstrap_worker(data: dict):
+    global _bootstrap_data
+    _bootstrap_data = data
+
+
+def _batch_sizes(n_resamples: int, elements_per_resample: int) -> list:
+    batch = max(1, min(n_resamples, _MAX_BATCH_ELEMENTS // max(elements_per_resample, 1)))
+    sizes = [batch] * (n_resamples // batch)
+    if n_resamples % batch:
+        sizes.append(n_resamples % batch)
+    return sizes
+
+
+def _bootstrap_univariate(values: np.ndarray, statistics: tuple, n_resamples: int, rng) -> dict:
+    n = values.shape[0]
+    estimates = {stat: [] for stat in statistics}
+    for size in _batch_sizes(n_resamples, n):
+        # One (size, n) matrix of row indices per batch instead of one draw per resample
+        samples = values[rng.integers(0, n, size=(size, n))]
+        if 'mean' in statistics:
+            estimates['mean'].append(samples.mean(axis=1))
+        if 'median' in statistics:
+            estimates['median'].append(np.median(samples, axis=1))
+        if 'std' in statistics:
+            estimates['std'].append(samples.std(axis=1, ddof=1))
+    return {stat: np.concatenate(parts) for stat, parts in estimates.items()}
+
+
+def _bootstrap_correlation(matrix: np.ndarray, n_resamples: int, rng) -> np.ndarray:
+    n, k = matrix.shape
+    estimates = []
+    for size in _batch_sizes(n_resamples, n * k):
+        samples = matrix[rng.integers(0, n, size=(size, n))]
+        centered = samples - samples.mean(axis=1, keepdims=True)
+        cov = np.einsum('rni,rnj->rij', centered, centered)
+        scale = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            estimates.append(cov / (scale[:, :, None] * scale[:, None, :]))
+    return np.concatenate(estimates)
+
+
+def _run_bootstrap_task(task: tuple):
+    kind, key, statistics, n_resamples, seed = task
+    rng = np.random.default_rng(seed)
+    if kind == 'correlation':
+        return _bootstrap_correlation(_bootstrap_data[key], n_resamples, rng)
+    return _bootstrap_univariate(_bootstrap_data[key], statistics, n_resamples, rng)
+
+
+def _split_resamples(n_resamples: int) -> list:
+    sizes = [RESAMPLES_PER_TASK] * (n_resamples // RESAMPLES_PER_TASK)
+    if n_resamples % RESAMPLES_PER_TASK:
+        sizes.append(n_resamples % RESAMPLES_PER_TASK)
+    return sizes
+
+
+def bootstrap_confidence_intervals(data: pd.DataFrame, statistics: tuple = BOOTSTRAP_STATISTICS,
+                                   n_resamples: int = 1000, confidence_level: float = 0.95,
+                                   include_correlation: bool = True, seed: int = None,
+                                   n_jobs: int = None, progress_callback=None, mp_context=None) -> dict:
+    """
+    Computes percentile bootstrap confidence intervals for the given numerical columns.
+    Univariate statistics resample each column's non-missing values; correlations resample
+    complete rows. The same seed always gives the same intervals, whatever n_jobs is.
+    Returns a dict with a 'statistics' DataFrame (estimate and CI bounds per statistic,
+    one column per data column) and a 'correlation' DataFrame (one row per column pair),
+    which is None when fewer than two columns are given. mp_context is the start method of
+    the worker processes (see core.parallel.map_in_processes).
+    """
+    unknown = [stat for stat in statistics if stat not in BOOTSTRAP_STATISTICS]
+    if unknown:
+        raise ValueError(f"Unsupported bootstrap statistic(s): {', '.join(unknown)}")
+    if n_resamples < 1:
+        raise ValueError("Number of bootstrap resamples must be at least 1.")
+    if not 0 < confidence_level < 1:
+        raise ValueError("Confidence level must be between 0 and 1.")
+
+    columns = data.columns.tolist()
+    shared = {}
+    for col in columns:
+        values = data[col].dropna().to_numpy(dtype=float)
+        if values.shape[0] < 2:
+            raise ValueError(f"Column '{col}' needs at least two non-missing values for bootstrapping.")
+        shared[col] = values
+
+    with_correlation = include_correlation and len(columns) > 1
+    if with_correlation:
+        complete = data.dropna().to_numpy(dtype=float)
+        if complete.shape[0] < 2:
+            raise ValueError("Not enough complete rows to bootstrap correlations.")
+        shared['__correlation__'] = complete
+
+    # Fixed task layout + one spawned seed per task keeps the results reproducible
+    task_specs = [('univariate', col, tuple(statistics), size) for col in columns for size in _split_resamples(n_resamples)]
+    if with_correlation:
+        task_specs += [('correlation', '__correlation__', (), size) for size in _split_resamples(n_resamples)]
+    seeds = np.random.SeedSequence(seed).spawn(len(task_specs))
+    tasks = [spec + (task_seed,) for spec, task_seed in zip(task_specs, seeds)]
+
+    # Small problems are not worth the cost of starting worker processes
+    total_work = sum(values.size for values in shared.values()) * n_resamples
+    workers = 1 if total_work < 5_000_000 else n_jobs
+    try:
+        results = map_in_processes(_run_bootstrap_task, tasks, n_jobs=workers,
+                                   initializer=_init_bootstrap_worker, initargs=(shared,),
+                                   progress_callback=progress_callback, mp_context=mp_context)
+    finally:
+        _init_bootstrap_worker({})
+
+    alpha = (1 - confidence_level) / 2
+    point_estimates = {
+        'mean': lambda values: values.mean(),
+        'median': lambda values: np.median(values),
+        'std': lambda values: values.std(ddof=1),
+    }
+
+    rows = {}
+    for stat in statistics:
+        rows[stat] = {}
+        rows[f"{stat} CI lower"] = {}
+        rows[f"{stat} CI upper"] = {}
+    for col in columns:
+        col_results = [res for spec, res in zip(task_specs, results) if spec[0] == 'univariate' and spec[1] == col]
+        for stat in statistics:
+            estimates = np.concatenate([res[stat] for res in col_results])
+            lower, upper = np.quantile(estimates, [alpha, 1 - alpha])
+            rows[stat][col] = point_estimates[stat](shared[col])
+            rows[f"{stat} CI lower"][col] = lower
+            rows[f"{stat} CI upper"][col] = upper
+    statistics_df = pd.DataFrame.from_dict(rows, orient='index', columns=columns)
+
+    correlation_df = None
+    if with_correlation:
+        estimates = np.concatenate([res for spec, res in zip(task_specs, results) if spec[0] == 'correlation'])
+        observed = np.corrcoef(shared['__correlation__'], rowvar=False)
+        lower, upper = np.nanquantile(estimates, [alpha, 1 - alpha], axis=0)
+        pairs = []
+        for i in range(len(columns)):
+            for j in range(i + 1, len(columns)):
+                pairs.append({
+                    'Pair': f"{columns[i]} ~ {columns[j]}",
+                    'Correlation': observed[i, j],
+                    'CI Lower': lower[i, j],
+                    'CI Upper': upper[i, j],
+                })
+        correlation_df = pd.DataFrame(pairs).set_index('Pair')
+
+    return {
+        "n_resamples": n_resamples,
+        "confidence_level": confidence_level,
+        "seed": seed,
+        "statistics": statistics_df,
+        "correlation": correlation_df,
+    }
+
+
+def _init_permutation_worker(data: dict):
+    global _permutation_data
+    _permutation_data = data
+
+
+def _welch_t_from_sums(sum_a, sumsq_a, n_a, sum_b, sumsq_b, n_b):
+    mean_a = sum_a / n_a
+    mean_b = sum_b / n_b
+    var_a = (sumsq_a - n_a * mean_a ** 2) / (n_a - 1)
+    var_b = (sumsq_b - n_b * mean_b ** 2) / (n_b - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (mean_a - mean_b) / np.sqrt(var_a / n_a + var_b / n_b)
+
+
+def _t_statistics_for_groups(group_a_idx: np.ndarray) -> np.ndarray:
+    """Welch t statistics for a batch of group-A index sets (one row per arrangement)."""
+    pooled = _permutation_data['pooled']
+    pooled_sq = _permutation_data['pooled_sq']
+    n = pooled.shape[0]
+    n_a = group_a_idx.shape[1]
+    sum_a = pooled[group_a_idx].sum(axis=1)
+    sumsq_a = pooled_sq[group_a_idx].sum(axis=1)
+    return _welch_t_from_sums(sum_a, sumsq_a, n_a,
+                              _permutation_data['total'] - sum_a, _permutation_data['total_sq'] - sumsq_a, n - n_a)
+
+
+def _chi2_statistics_for_labels(permuted_y: np.ndarray) -> np.ndarray:
+    """Chi-square statistics for a batch of permuted column-2 codes (one row per permutation)."""
+    x = _permutation_data['x_codes']
+    n_rows, n_cols = _permutation_data['shape']
+    expected = _permutation_data['expected']
+    batch = permuted_y.shape[0]
+    cells = n_rows * n_cols
+    flat = (x * n_cols)[None, :] + permuted_y + (np.arange(batch) * cells)[:, None]
+    observed = np.bincount(flat.ravel(), minlength=batch * cells).reshape(batch, n_rows, n_cols)
+    return ((observed - expected) ** 2 / expected).sum(axis=(1, 2))
+
+
+def _run_permutation_task(task: tuple) -> tuple:
+    """Returns (hits, evaluated) where hits counts statistics at least as extreme as observed."""
+    kind, size, seed, arrangements = task
+    observed = _permutation_data['observed']
+    # Tolerance so that arrangements equal to the observed one are not lost to rounding
+    threshold = observed - 1e-9 * max(1.0, observed)
+    n = _permutation_data['n']
+
+    if arrangements is not None:
+        stats_values = np.abs(_t_statistics_for_groups(arrangements))
+        return int(np.count_nonzero(stats_values >= threshold)), arrangements.shape[0]
+
+    rng = np.random.default_rng(seed)
+    hits = 0
+    for batch in _batch_sizes(size, n):
+        # Every row of the batch is an independent shuffle of the labels
+        shuffled = rng.permuted(np.tile(np.arange(n), (batch, 1)), axis=1)
+        if kind == 't_test':
+            stats_values = np.abs(_t_statistics_for_groups(shuffled[:, :_permutation_data['n_a']]))
+        else:
+            stats_values = _chi2_statistics_for_labels(_permutation_data['y_codes'][shuffled])
+        hits += int(np.count_nonzero(stats_values >= threshold))
+    return hits, size
+
+
+def _monte_carlo_p_value(kind: str, shared: dict, n_permutations: int, alpha: float, seed, n_jobs: int,
+                         progress_callback, mp_context=None) -> tuple:
+    """
+    Runs shuffles in fixed-size tasks, one round of tasks per worker at a time, and stops
+    after the first task (in task order) at which the p-value is clearly above or below
+    alpha; the rest of that round is discarded. Returns (p_value, permutations_run).
+    """
+    task_sizes = _split_permutations(n_permutations)
+    seeds = np.random.SeedSequence(seed).spawn(len(task_sizes))
+    tasks = [(kind, size, task_seed, None) for size, task_seed in zip(task_sizes, seeds)]
+
+    hits = 0
+    evaluated = 0
+    workers = 1 if shared['n'] * n_permutations < 2_000_000 else n_jobs
+    try:
+        with WorkerPool(workers, initializer=_init_permutation_worker, initargs=(shared,),
+                        mp_context=mp_context) as pool:
+            resolved = False
+            for start in range(0, len(tasks), pool.workers):
+                for task_hits, task_evaluated in pool.map(_run_permutation_task, tasks[start:start + pool.workers]):
+                    hits += task_hits
+                    evaluated += task_evaluated
+                    p_value = (hits + 1) / (evaluated + 1)
+                    standard_error = np.sqrt(p_value * (1 - p_value) / evaluated)
+                    if abs(p_value - alpha) > _EARLY_STOP_Z * standard_error:
+                        resolved = True
+                        break
+                if progress_callback:
+                    progress_callback(evaluated, n_permutations)
+                if resolved:
+                    break
+    finally:
+        _init_permutation_worker({})
+
+    if progress_callback and evaluated < n_permutations:
+        progress_callback(n_permutations, n_permutations)
+    return (hits + 1) / (evaluated + 1), evaluated
+
+
+def _split_permutations(n_permutations: int) -> list:
+    sizes = [PERMUTATIONS_PER_TASK] * (n_permutations // PERMUTATIONS_PER_TASK)
+    if n_permutations % PERMUTATIONS_PER_TASK:
+        sizes.append(n_permutations % PERMUTATIONS_PER_TASK)
+    return sizes
+
+
+def permutation_t_test(sample_a: np.ndarray, sample_b: np.ndarray, exact: bool = False,
+                       n_permutations: int = 10000, alpha: float = 0.05, seed: int = None,
+                       n_jobs: int = None, progress_callback=None, mp_context=None) -> dict:
+    """
+    Two-sided permutation test for the difference in means using the Welch t statistic.
+    With exact=True every assignment of the pooled values to the two groups is enumerated,
+    otherwise labels are shuffled at random until the p-value is resolved against alpha
+    or n_permutations shuffles have been run. mp_context is the start method of the worker
+    processes (see core.parallel.map_in_processes).
+    """
+    sample_a = np.asarray(sample_a, dtype=float)
+    sample_b = np.asarray(sample_b, dtype=float)
+    n_a, n_b = sample_a.shape[0], sample_b.shape[0]
+    if n_a < 2 or n_b < 2:
+        raise ValueError("Each group needs at least two values for a permutation t-test.")
+
+    # The variances are computed from sums of squares, which lose all precision for values far
+    # from zero (e.g. timestamps); shifting every value by the pooled mean leaves t unchanged
+    pooled = np.concatenate([sample_a, sample_b])
+    center = pooled.mean()
+    pooled -= center
+    sample_a, sample_b = pooled[:n_a], pooled[n_a:]
+    observed = abs(float(_welch_t_from_sums(sample_a.sum(), (sample_a ** 2).sum(), n_a,
+                                            sample_b.sum(), (sample_b ** 2).sum(), n_b)))
+    shared = {
+        'pooled': pooled,
+        'pooled_sq': pooled ** 2,
+        'total': pooled.sum(),
+        'total_sq': (pooled ** 2).sum(),
+        'n': pooled.shape[0],
+        'n_a': n_a,
+        'observed': observed,
+    }
+
+    if not exact:
+        p_value, evaluated = _monte_carlo_p_value('t_test', shared, n_permutations, alpha, seed, n_jobs,
+                                                  progress_callback, mp_context)
+        return {"p_value": p_value, "n_permutations": evaluated, "early_stopped": evaluated < n_permutations}
+
+    n_arrangements = comb(pooled.shape[0], n_a)
+    if n_arrangements > EXACT_MAX_ARRANGEMENTS:
+        raise ValueError(f"Exact test would need {n_arrangements:,} arrangements (limit {EXACT_MAX_ARRANGEMENTS:,}). "
+                         "Please use the permutation test instead.")
+
+    arrangements = combinations(range(pooled.shape[0]), n_a)
+    tasks = []
+    while True:
+        chunk = list(islice(arrangements, PERMUTATIONS_PER_TASK))
+        if not chunk:
+            break
+        tasks.append(('t_test', len(chunk), None, np.array(chunk, dtype=np.intp)))
+
+    workers = 1 if n_arrangements * pooled.shape[0] < 2_000_000 else n_jobs
+    try:
+        results = map_in_processes(_run_permutation_task, tasks, n_jobs=workers,
+                                   initializer=_init_permutation_worker, initargs=(shared,),
+                                   progress_callback=progress_callback, mp_context=mp_context)
+    finally:
+        _init_permutation_worker({})
+
+    hits = sum(task_hits for task_hits, _ in results)
+    return {"p_value": hits / n_arrangements, "n_permutations": n_arrangements, "early_stopped": False}
+
+
+def permutation_chi_square_test(contingency_codes: tuple, expected: np.ndarray, observed_chi2: float,
+                                n_permutations: int = 10000, alpha: float = 0.05, seed: int = None,
+                                n_jobs: int = None, progress_callback=None, mp_context=None) -> dict:
+    """
+    Permutation test of independence: the column-2 labels are shuffled against column 1 and
+    the chi-square statistic recomputed from the permuted contingency tables. Row and column
+    totals are unchanged by shuffling, so the expected frequencies are computed only once.
+    contingency_codes is a pair of integer code arrays (one entry per observation).
+    mp_context is the start method of the worker processes, as for permutation_t_test.
+    """
+    x_codes, y_codes = contingency_codes
+    shared = {
+        'x_codes': np.asarray(x_codes, dtype=np.intp),
+        'y_codes': np.asarray(y_codes, dtype=np.intp),
+        'shape': expected.shape,
+        'expected': expected,
+        'n': len(x_codes),
+        'observed': observed_chi2,
+    }
+    p_value, evaluated = _monte_carlo_p_value('chi_square', shared, n_permutations, alpha, seed, n_jobs,
+                                              progress_callback, mp_context)
+    return {"p_value": p_value, "n_permutations": evaluated, "early_stopped": evaluated < n_permutations}
@@ -0,0 +1,456 @@
+import asyncio
+import io
+import json
+import math
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from core.data_handler import DataHandler, TEST_METHODS
+from core.history import DataHistory
+from core.memory import memory_monitor, estimate_load_bytes, format_bytes
+
+try:
+    import pyarrow
+except ImportError:  # Arrow slices are optional; paged JSON always works
+    pyarrow = None
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Rows of a JSON preview page (default and largest allowed), and rows per Arrow record
+# batch when a slice is streamed
+DEFAULT_PAGE_ROWS = 1000
+MAX_PAGE_ROWS = 50_000
+ARROW_BATCH_ROWS = 65_536
+
+# Largest request body accepted (requests only carry small JSON documents)
+MAX_BODY_BYTES = 1 << 20
+
+_REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error', 507: 'Insufficient Storage'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_safe(value):
+    # numpy scalars become Python numbers, NaN and infinities become null
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _records(frame) -> list:
+    return json.loads(frame.to_json(orient='records', date_format='iso', double_precision=15))
+
+
+class Dataset:
+    """
+    A loaded file kept in memory (or spilled to disk while idle, see core.memory);
+    operations on it are serialised by its lock.
+    """
+
+    def __init__(self, dataset_id: str, path: str, handler: DataHandler):
+        self.id = dataset_id
+        self.path = path
+        self.handler = handler
+        self.mtime = os.path.getmtime(path)
+        self.lock = threading.Lock()
+        # The server never changes the data, so its shape is described once (and listing the
+        # datasets does not reload spilled ones)
+        df = handler.df
+        self._summary = {"id": self.id, "path": self.path, "rows": len(df),
+                         "columns": [str(column) for column in df.columns],
+                         "dtypes": [str(dtype) for dtype in df.dtypes], "data_version": handler.data_version}
+
+    def info(self) -> dict:
+        return dict(self._summary, spilled=self.handler.is_spilled)
+
+    def is_current(self) -> bool:
+        """Whether the file is unchanged since it was loaded."""
+        return os.path.exists(self.path) and os.path.getmtime(self.path) == self.mtime
+
+
+class AnalysisServer:
+    """
+    Local HTTP/JSON server keeping datasets loaded between requests. Loading and analyses
+    run in a thread pool (the frames are shared, not copied), so the event loop keeps
+    serving other requests. Endpoints:
+
+        GET    /health
+        GET    /datasets                          loaded datasets
+        POST   /datasets                          {"path", "id"?, "force"?}: load a file (reused while
+                                                  unchanged; 507 if it would exceed the memory
+                                                  budget, unless forced)
+        GET    /datasets/<id>                     shape and dtypes
+        DELETE /datasets/<id>                     unload
+        GET    /datasets/<id>/describe
+        GET    /datasets/<id>/profile
+        GET    /datasets/<id>/missing
+        GET    /datasets/<id>/correlation?cluster=1
+        GET    /datasets/<id>/outliers?columns=a,b
+        POST   /datasets/<id>/tests               {"test": "ttest"|"chisquare", "column1", "column2",
+                                                   "method"?, "n_permutations"?, "seed"?}
+        GET    /datasets/<id>/rows?offset=&limit=&columns=a,b&format=json|arrow
+                                                  a JSON page (with next_offset), or the whole
+                                                  slice streamed as an Arrow IPC stream
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_workers: int = None):
+        self.host = host
+        self.port = port
+        # Loads register datasets from executor threads while the event loop lists them, so
+        # both go through the lock; _loading holds the pending load of each path
+        self.datasets = {}
+        self._datasets_lock = threading.Lock()
+        self._loading = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='helwan-analysis')
+        self._server = None
+
+    # --- Operations (run in the thread pool) ---
+
+    def load_dataset(self, path: str, dataset_id: str = None, force: bool = False) -> Dataset:
+        """
+        Loads path as dataset_id (default: a new id). A file that is loaded and unchanged is
+        not loaded again: its dataset is returned, or the request is rejected (409) when it
+        names another id. An id used for another file is rejected too; the same file under
+        its own id is reloaded once changed. Concurrent requests for a file share one load.
+        """
+        path = os.path.abspath(path)
+        while True:
+            with self._datasets_lock:
+                loading = self._loading.get(path)
+                if loading is None:
+                    existing = self.datasets.get(dataset_id) if dataset_id else None
+                    if existing is not None and existing.path != path:
+                        raise HTTPError(409, f"Dataset id '{dataset_id}' is already used for '{existing.path}'.")
+                    for dataset in self.datasets.values():
+                        if dataset.path == path and dataset.is_current():
+                            if dataset_id is None or dataset.id == dataset_id:
+                                return dataset
+                            raise HTTPError(409, f"'{path}' is already loaded as dataset '{dataset.id}'.")
+                    loading = self._loading[path] = Future()
+                    break
+            # Another request is loading the file; its result (or error) decides this one too
+            loading.result()
+
+        try:
+            dataset = self._load(path, dataset_id, force)
+            with self._datasets_lock:
+                self.datasets[dataset.id] = dataset
+            loading.set_result(dataset)
+            return dataset
+        except BaseException as e:
+            loading.set_exception(e)
+            raise
+        finally:
+            with self._datasets_lock:
+                del self._loading[path]
+
+    def _load(self, path: str, dataset_id: str, force: bool) -> Dataset:
+        estimated_bytes = estimate_load_bytes(path)
+        if memory_monitor.would_exceed(estimated_bytes):
+            memory_monitor.enforce()
+            if not force and memory_monitor.would_exceed(estimated_bytes):
+                raise HTTPError(507, f"Loading '{path}' needs about {format_bytes(estimated_bytes)}, more than the "
+                                     f"memory budget leaves ({format_bytes(memory_monitor.rss())} of "
+                                     f"{format_bytes(memory_monitor.budget)} in use); pass \"force\": true to load it anyway.")
+        handler = DataHandler(path)
+        # Nothing is ever undone through the server
+        handler.history = DataHistory(max_depth=0)
+        handler.load_data()
+        return Dataset(dataset_id or uuid.uuid4().hex[:12], path, handler)
+
+    def loaded_datasets(self) -> list:
+        with self._datasets_lock:
+            return list(self.datasets.values())
+
+    def _dataset(self, dataset_id: str) -> Dataset:
+        with self._datasets_lock:
+            dataset = self.datasets.get(dataset_id)
+        if dataset is None:
+            raise HTTPError(404, f"Dataset '{dataset_id}' is not loaded.")
+        return dataset
+
+    def run_analysis(self, dataset: Dataset, name: str, query: dict, body: dict):
+        handler = dataset.handler
+        with dataset.lock:
+            if name == 'describe':
+                return _records(handler.get_dataframe_describe().rename_axis('Statistic').reset_index())
+            if name == 'profile':
+                return _records(handler.get_column_profile())
+            if name == 'missing':
+                return _records(handler.get_missing_values_summary())
+            if name == 'correlation':
+                matrix = handler.get_correlation_matrix(cluster=query.get('cluster', '0') in ('1', 'true'))
+                return {"columns": [str(column) for column in matrix.columns],
+                        "values": _json_safe(matrix.to_numpy().tolist())}
+            if name == 'outliers':
+                columns = query['columns'].split(',') if query.get('columns') else None
+                return _records(handler.get_outlier_summary(columns))
+            if name == 'tests':
+                return self._run_test(handler, body)
+        raise HTTPError(404, f"Unknown analysis '{name}'.")
+
+    @staticmethod
+    def _run_test(handler: DataHandler, body: dict) -> dict:
+        test = body.get('test')
+        method = body.get('method', 'parametric')
+        if method not in TEST_METHODS:
+            raise ValueError(f"Unsupported test method: {method}")
+        kwargs = {"method": method, "n_permutations": int(body.get('n_permutations', 10000)),
+                  "seed": body.get('seed'), "n_jobs": body.get('n_jobs'),
+                  # Tests run on executor threads, which fork does not copy safely
+                  "mp_context": 'spawn'}
+        if test == 'ttest':
+            result = handler.perform_t_test(body.get('column1'), body.get('column2'), **kwargs)
+        elif test == 'chisquare':
+            result = handler.perform_chi_square_test(body.get('column1'), body.get('column2'), **kwargs)
+        else:
+            raise ValueError("The test must be 'ttest' or 'chisquare'.")
+        return _json_safe(result)
+
+    @staticmethod
+    def _slice(dataset: Dataset, query: dict, default_limit: int = None):
+        df = dataset.handler.df
+        try:
+            offset = max(int(query.get('offset', 0)), 0)
+            limit = int(query['limit']) if 'limit' in query else default_limit
+        except ValueError:
+            raise ValueError("offset and limit must be integers.")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        if query.get('columns'):
+            columns = query['columns'].split(',')
+            missing = [column for column in columns if column not in df.columns]
+            if missing:
+                raise ValueError(f"Columns not found: {', '.join(missing)}")
+            df = df[columns]
+        end = len(df) if limit is None else min(offset + limit, len(df))
+        return df.iloc[offset:end], offset, end
+
+    def rows_page(self, dataset: Dataset, query: dict) -> dict:
+        with dataset.lock:
+            page, offset, end = self._slice(dataset, query, DEFAULT_PAGE_ROWS)
+            if len(page) > MAX_PAGE_ROWS:
+                raise ValueError(f"At most {MAX_PAGE_ROWS} rows can be requested per page.")
+            total = len(dataset.handler.df)
+            return {"offset": offset, "rows": _records(page), "total_rows": total,
+                    "next_offset": end if end < total else None}
+
+    # --- HTTP ---
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _in_executor(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split(maxsplit=2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (version.strip() == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                await self._handle_request(reader, writer, method.upper(), target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader, writer, method: str, target: str, headers: dict, keep_alive: bool):
+        try:
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY_BYTES:
+                raise HTTPError(413, "Request body too large.")
+            body = {}
+            if length:
+                try:
+                    body = json.loads(await reader.readexactly(length))
+                except json.JSONDecodeError as e:
+                    raise HTTPError(400, f"Invalid JSON body: {e}")
+            url = urlsplit(target)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            parts = [part for part in url.path.split('/') if part]
+            await self._route(writer, method, parts, query, body, keep_alive)
+        except HTTPError as e:
+            await self._send_json(writer, e.status, {"error": str(e)}, keep_alive)
+        except (ValueError, KeyError, TypeError, IOError) as e:
+            await self._send_json(writer, 400, {"error": str(e)}, keep_alive)
+        except Exception as e:
+            await self._send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"}, keep_alive)
+
+    async def _route(self, writer, method: str, parts: list, query: dict, body: dict, keep_alive: bool):
+        if parts == ['health']:
+            return await self._send_json(writer, 200, {"status": "ok", "datasets": len(self.datasets),
+                                                       "arrow": pyarrow is not None}, keep_alive)
+        if not parts or parts[0] != 'datasets' or len(parts) > 3:
+            raise HTTPError(404, "Not found.")
+        if len(parts) == 1:
+            if method == 'GET':
+                return await self._send_json(writer, 200, [dataset.info() for dataset in self.loaded_datasets()],
+                                             keep_alive)
+            if method == 'POST':
+                if not body.get('path'):
+                    raise ValueError("A 'path' to load is required.")
+                dataset = await self._in_executor(self.load_dataset, body['path'], body.get('id'),
+                                                  bool(body.get('force')))
+                await self._send_json(writer, 201, dataset.info(), keep_alive)
+                return await self._free_memory(dataset)
+            raise HTTPError(405, "Use GET or POST.")
+
+        dataset = self._dataset(parts[1])
+        if len(parts) == 2:
+            if method == 'GET':
+                return await self._send_json(writer, 200, dataset.info(), keep_alive)
+            if method == 'DELETE':
+                with self._datasets_lock:
+                    self.datasets.pop(dataset.id, None)
+                return await self._send_json(writer, 200, {"deleted": dataset.id}, keep_alive)
+            raise HTTPError(405, "Use GET or DELETE.")
+
+        name = parts[2]
+        if name == 'rows':
+            if method != 'GET':
+                raise HTTPError(405, "Use GET.")
+            if query.get('format', 'json') == 'arrow':
+                return await self._stream_arrow(writer, dataset, query, keep_alive)
+            await self._send_json(writer, 200, await self._in_executor(self.rows_page, dataset, query), keep_alive)
+            return await self._free_memory(dataset)
+        if method != ('POST' if name == 'tests' else 'GET'):
+            raise HTTPError(405, f"Use {'POST' if name == 'tests' else 'GET'}.")
+        result = await self._in_executor(self.run_analysis, dataset, name, query, body)
+        await self._send_json(writer, 200, result, keep_alive)
+        await self._free_memory(dataset)
+
+    async def _free_memory(self, active: Dataset):
+        # After answering, so the client does not wait: over budget, caches are dropped and
+        # idle datasets (not the one just used, nor any being worked on) are spilled
+        in_use = [active.handler] + [dataset.handler for dataset in self.loaded_datasets() if dataset.lock.locked()]
+        try:
+            await self._in_executor(memory_monitor.enforce, in_use)
+        except OSError:
+            # e.g. no room left for the spill file; the data simply stays in memory
+            pass
+
+    @staticmethod
+    def _head(status: int, content_type: str, keep_alive: bool, length: int = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines.append(f"Content-Length: {length}" if length is not None else "Transfer-Encoding: chunked")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    async def _send_json(self, writer, status: int, payload, keep_alive: bool):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(self._head(status, 'application/json; charset=utf-8', keep_alive, len(data)) + data)
+        await writer.drain()
+
+    async def _stream_arrow(self, writer, dataset: Dataset, query: dict, keep_alive: bool):
+        # The slice is sent as one Arrow IPC stream in HTTP chunks, a record batch at a time;
+        # each batch is encoded in the thread pool and the bytes taken out of the sink
+        if pyarrow is None:
+            raise ValueError("Arrow output needs the pyarrow package; use format=json instead.")
+        frame, _offset, _end = await self._in_executor(self._locked_slice, dataset, query)
+        sink = io.BytesIO()
+        stream = schema = None
+
+        def encode(start: int) -> bytes:
+            nonlocal stream, schema
+            if stream is None:
+                # The schema is inferred from the whole slice, not from an empty or first
+                # batch: an object column (e.g. booleans with gaps) would otherwise get type null
+                schema = pyarrow.Schema.from_pandas(frame, preserve_index=False)
+                stream = pyarrow.ipc.new_stream(sink, schema)
+            if start is None:
+                stream.close()
+            else:
+                stream.write_batch(pyarrow.RecordBatch.from_pandas(frame.iloc[start:start + ARROW_BATCH_ROWS],
+                                                                   schema=schema, preserve_index=False))
+            data = sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+            return data
+
+        starts = [*range(0, len(frame), ARROW_BATCH_ROWS), None]
+        # The first batch is encoded before anything is sent, so data Arrow cannot hold is
+        # still answered with an error response
+        try:
+            chunk = await self._in_executor(encode, starts[0])
+        except (pyarrow.ArrowException, TypeError) as e:
+            raise ValueError(f"The data cannot be sent as Arrow: {e}; use format=json instead.")
+        writer.write(self._head(200, 'application/vnd.apache.arrow.stream', keep_alive))
+        try:
+            for start in starts[1:]:
+                if chunk:
+                    writer.write(f"{len(chunk):x}\r\n".encode('latin-1') + chunk + b"\r\n")
+                    await writer.drain()
+                chunk = await self._in_executor(encode, start)
+            if chunk:
+                writer.write(f"{len(chunk):x}\r\n".encode('latin-1') + chunk + b"\r\n")
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except Exception:
+            # The response has started: an error body cannot follow, so the connection is
+            # closed without the final chunk and the client sees an incomplete stream
+            writer.close()
+
+    def _locked_slice(self, dataset: Dataset, query: dict):
+        with dataset.lock:
+            return self._slice(dataset, query)
+
+
+def run_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_workers: int = None,
+               preload: list = None, ready_callback=None):
+    """Runs an AnalysisServer until interrupted, with the files in preload loaded first."""
+    server = AnalysisServer(host, port, max_workers)
+    for path in preload or []:
+        server.load_dataset(path)
+
+    async def main():
+        await server.start()
+        if ready_callback:
+            ready_callback(server)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    finally:
+        server.close()
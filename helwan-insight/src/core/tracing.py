@@ -0,0 +1,215 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak memory is then not recorded
+    resource = None
+
+# Environment variable that turns tracing on from startup (e.g. HELWAN_TRACE=1)
+TRACE_ENV = 'HELWAN_TRACE'
+
+# Spans kept; older ones are dropped first
+DEFAULT_MAX_SPANS = 20_000
+
+
+def _peak_rss() -> int:
+    # Peak resident memory of the process so far, in bytes (ru_maxrss is in KB on Linux)
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Span:
+    """
+    One timed operation: wall and CPU time (of its thread) in seconds, rows processed
+    (None if not known) and by how many bytes the process's peak memory grew meanwhile.
+    """
+    __slots__ = ('name', 'category', 'start', 'wall', 'cpu', 'rows', 'peak_memory_delta', 'thread_id', 'thread_name')
+
+    def __init__(self, name: str, category: str, rows: int = None):
+        self.name = name
+        self.category = category
+        self.rows = rows
+        self.start = self.wall = self.cpu = None
+        self.peak_memory_delta = 0
+        self.thread_id = self.thread_name = None
+
+
+class _NoSpan:
+    # What span() returns while tracing is off: entering and leaving it does nothing
+    __slots__ = ()
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ('tracer', 'span', '_cpu', '_peak')
+
+    def __init__(self, tracer: 'Tracer', span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        thread = threading.current_thread()
+        self.span.thread_id, self.span.thread_name = thread.ident, thread.name
+        self._peak = _peak_rss()
+        self._cpu = time.thread_time()
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc_info):
+        span = self.span
+        span.wall = time.perf_counter() - span.start
+        span.cpu = time.thread_time() - self._cpu
+        span.peak_memory_delta = _peak_rss() - self._peak
+        self.tracer._spans.append(span)
+        return False
+
+
+class Tracer:
+    """
+    Records Spans of the operations it is asked to time. While disabled (the default
+    unless HELWAN_TRACE is set), span() returns a shared do-nothing context and traced
+    functions only check one flag, so the instrumentation can stay in the hot paths.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = DEFAULT_MAX_SPANS):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self._spans = deque(maxlen=max_spans)
+
+    def span(self, name: str, category: str = 'app', rows: int = None):
+        """Context manager timing its block: `with tracer.span('load', 'data') as span: span.rows = n`."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _ActiveSpan(self, Span(name, category, rows))
+
+    def spans(self) -> list:
+        """The recorded spans, oldest first."""
+        return list(self._spans)
+
+    def clear(self):
+        self._spans.clear()
+
+    def to_chrome_trace(self, spans: list = None) -> dict:
+        """The spans as Chrome trace events (chrome://tracing, Perfetto)."""
+        spans = self.spans() if spans is None else spans
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}}
+                  for thread_id, thread_name in {(span.thread_id, span.thread_name) for span in spans}]
+        events += [{
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (span.start - self.origin) * 1e6,
+            "dur": span.wall * 1e6,
+            "pid": pid,
+            "tid": span.thread_id,
+            "args": {"cpu_ms": span.cpu * 1000, "rows": span.rows, "peak_memory_delta": span.peak_memory_delta},
+        } for span in spans]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> int:
+        """Writes the spans to path as Chrome trace JSON; returns how many were written."""
+        spans = self.spans()
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(self.to_chrome_trace(spans), output)
+        return len(spans)
+
+
+# The tracer the application's instrumentation reports to
+tracer = Tracer(enabled=bool(os.environ.get(TRACE_ENV)))
+
+
+def summarize_spans(spans: list) -> list:
+    """Totals per operation, slowest in total first: dicts of name, category, count, wall, cpu, max_wall, rows."""
+    totals = {}
+    for span in spans:
+        total = totals.setdefault((span.category, span.name), {
+            "name": span.name, "category": span.category, "count": 0, "wall": 0.0, "cpu": 0.0, "max_wall": 0.0,
+            "rows": 0})
+        total["count"] += 1
+        total["wall"] += span.wall
+        total["cpu"] += span.cpu
+        total["max_wall"] = max(total["max_wall"], span.wall)
+        total["rows"] += span.rows or 0
+    return sorted(totals.values(), key=lambda total: total["wall"], reverse=True)
+
+
+def _row_count(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def traced(category: str, name: str = None, rows: str = None):
+    """
+    Decorator recording each call of a function as a span (named after the function).
+    rows names the argument whose length is the number of rows processed.
+    """
+    def decorate(func):
+        span_name = name or func.__qualname__
+        signature = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            row_count = None
+            if rows is not None:
+                nonlocal signature
+                if signature is None:
+                    import inspect
+                    signature = inspect.signature(func)
+                bound = signature.bind_partial(*args, **kwargs)
+                row_count = _row_count(bound.arguments.get(rows))
+            with tracer.span(span_name, category, row_count):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def trace_methods(category: str, rows_attribute: str = None):
+    """
+    Class decorator tracing every public method of the class. With rows_attribute, the
+    length of that attribute after the call (e.g. a DataFrame) is recorded as the rows.
+    """
+    def decorate(cls):
+        for attribute, method in list(vars(cls).items()):
+            if attribute.startswith('_') or not callable(method) or isinstance(method, (staticmethod, classmethod)):
+                continue
+            setattr(cls, attribute, _traced_method(method, f"{cls.__name__}.{attribute}", category, rows_attribute))
+        return cls
+    return decorate
+
+
+def _traced_method(method, span_name: str, category: str, rows_attribute: str):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not tracer.enabled:
+            return method(self, *args, **kwargs)
+        with tracer.span(span_name, category) as span:
+            result = method(self, *args, **kwargs)
+            if rows_attribute is not None:
+                span.rows = _row_count(getattr(self, rows_attribute, None))
+            return result
+    return wrapper
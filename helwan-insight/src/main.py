@@ -1,3 +1,7 @@
+import time
+
+_START = time.perf_counter()
+
 import sys
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTranslator, QLocale, QLibraryInfo
@@ -6,15 +10,22 @@ import os
 
 from ui.main_window import MainWindow # <--- هذا هو سطر الاستدعاء المهم
 from utils.i18n import setup_translation
+from utils.startup import StartupTimer, startup_timing_requested, STARTUP_TIMING_FLAG
 
 
 def main():
+    # Startup-time measurement mode: python main.py --startup-timing (or HELWAN_STARTUP_TIMING=1)
+    timer = StartupTimer(enabled=startup_timing_requested(sys.argv), start=_START)
+    timer.mark("imports")
+    argv = [arg for arg in sys.argv if arg != STARTUP_TIMING_FLAG]
+
     # ✅ نضيف السطرين دول هنا
     from PyQt5.QtCore import Qt, QCoreApplication
     QCoreApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QCoreApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
+    timer.mark("application")
 
     initial_locale = QLocale.system().name()
     if initial_locale.startswith('ar'):
@@ -26,8 +37,13 @@ def main():
     qt_locale_name = QLocale(initial_locale).name()
     if qt_translator.load("qt_" + qt_locale_name, QLibraryInfo.location(QLibraryInfo.TranslationsPath)):
         app.installTranslator(qt_translator)
+    timer.mark("translation")
 
     main_win = MainWindow(_translator_func=translator_func)
+    timer.mark("window")
+    # The analysis modules are loaded in the background after the first paint
+    main_win.first_painted.connect(lambda: timer.mark("first paint"))
+    main_win.background_loading_finished.connect(lambda: timer.mark("background loading"))
     main_win.showMaximized()
     sys.exit(app.exec_())
 
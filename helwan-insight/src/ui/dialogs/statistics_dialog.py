@@ -7,7 +7,10 @@ from PyQt5.QtCore import Qt, QMimeData
 from PyQt5.QtGui import QClipboard
 import numpy as np
 
+from core.tracing import traced
+
 class StatisticsDialog(QDialog):
+    @traced('dialog')
     def __init__(self, stats_df: pd.DataFrame, _translator_func, parent=None):
         super().__init__(parent)
         self._ = _translator_func # Store the translator function
@@ -1,27 +1,41 @@
 import sys
-import pandas as pd
+from typing import TYPE_CHECKING
 from PyQt5.QtWidgets import (
 	QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
 	QWidget, QAction, QFileDialog, QMessageBox, QLabel, QStackedWidget,
-	QMenuBar, QDialog, QFormLayout, QLineEdit, QComboBox, QDialogButtonBox
+	QMenuBar, QDialog, QFormLayout, QLineEdit, QComboBox, QDialogButtonBox,
+	QListWidget, QAbstractItemView, QPushButton, QCheckBox, QProgressBar, QDockWidget
 )
-from PyQt5.QtCore import Qt, QTranslator, QLocale, QLibraryInfo
+from PyQt5.QtCore import Qt, QTranslator, QLocale, QLibraryInfo, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon # <--- تأكد من استيراد QIcon هنا
 
 import gettext
 import os # <--- تأكد من استيراد os هنا
 
-from core.data_handler import DataHandler
+# Only Qt is imported up front so the window paints quickly; pandas, matplotlib, scipy and
+# the modules built on them are imported where first used (and preloaded in the background
+# after the first paint, see utils.startup)
 from ui.widgets.data_preview_table import DataPreviewTable
-from ui.widgets.eda_dashboard import EDADashboard
-from ui.dialogs.statistics_dialog import StatisticsDialog
+from ui.workers import TaskWorker
+from core.memory import memory_monitor, estimate_load_bytes, format_bytes
+from core.tracing import traced
+from utils.i18n import Translation, no_translation
+from utils.startup import PRELOAD_MODULES, preload_modules
+
+if TYPE_CHECKING:
+	import pandas as pd
 
 from PyQt5.QtWidgets import (
 	QWidget, QVBoxLayout, QStackedWidget, QSizePolicy
 )
 from PyQt5.QtWidgets import QScrollArea
+
+# How often (ms) memory use is checked against the budget (see core.memory)
+MEMORY_CHECK_INTERVAL_MS = 5000
+
 # --- MissingValuesDialog Class ---
 class MissingValuesDialog(QDialog):
+	@traced('dialog')
 	def __init__(self, df_columns: list, numerical_cols: list, categorical_cols: list, _translator_func, parent=None):
 		super().__init__(parent)
 		self._ = _translator_func
@@ -47,11 +61,20 @@ class MissingValuesDialog(QDialog):
 			self._("Fill with Mean"),
 			self._("Fill with Median"),
 			self._("Fill with Mode"),
-			self._("Fill with Specific Value")
+			self._("Fill with Specific Value"),
+			self._("Forward Fill"),
+			self._("Backward Fill"),
+			self._("Interpolate (Linear)")
 		])
 		self.strategy_combo.currentIndexChanged.connect(self.toggle_fill_value_input)
 		self.layout.addRow(self._("Select Strategy:"), self.strategy_combo)
 
+		# الملء داخل كل مجموعة (اختياري)
+		self.group_combo = QComboBox()
+		self.group_combo.addItem(self._("(No Grouping)"))
+		self.group_combo.addItems(df_columns)
+		self.layout.addRow(self._("Fill Within Groups Of:"), self.group_combo)
+
 		self.fill_value_input = QLineEdit()
 		self.fill_value_input.setPlaceholderText(self._("Enter value to fill with"))
 		self.fill_value_input.setVisible(False)
@@ -76,7 +99,10 @@ class MissingValuesDialog(QDialog):
 			self._("Fill with Mean"): 'fill_mean',
 			self._("Fill with Median"): 'fill_median',
 			self._("Fill with Mode"): 'fill_mode',
-			self._("Fill with Specific Value"): 'fill_value'
+			self._("Fill with Specific Value"): 'fill_value',
+			self._("Forward Fill"): 'ffill',
+			self._("Backward Fill"): 'bfill',
+			self._("Interpolate (Linear)"): 'interpolate'
 		}
 		strategy = strategy_map.get(selected_strategy_display)
 
@@ -90,10 +116,13 @@ class MissingValuesDialog(QDialog):
 		else:
 			column = selected_column_display
 
-		return strategy, column, fill_val
+		group_by = [self.group_combo.currentText()] if self.group_combo.currentIndex() > 0 else None
+
+		return strategy, column, fill_val, group_by
 
 # --- ChangeColumnTypeDialog Class ---
 class ChangeColumnTypeDialog(QDialog):
+	@traced('dialog')
 	def __init__(self, df_columns: list, _translator_func, parent=None):
 		super().__init__(parent)
 		self._ = _translator_func
@@ -113,8 +142,15 @@ class ChangeColumnTypeDialog(QDialog):
 			self._("Text"),
 			self._("Date/Time")
 		])
+		self.type_combo.currentIndexChanged.connect(self.toggle_format_input)
 		self.layout.addRow(self._("New Type:"), self.type_combo)
 
+		# صيغة التاريخ اختيارية؛ تُستنتج تلقائياً إذا تُركت فارغة
+		self.format_input = QLineEdit()
+		self.format_input.setPlaceholderText(self._("Auto-detect (e.g. %d/%m/%Y)"))
+		self.layout.addRow(self._("Date Format:"), self.format_input)
+		self.toggle_format_input()
+
 		self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
 		self.buttons.accepted.connect(self.accept)
 		self.buttons.rejected.connect(self.reject)
@@ -131,11 +167,18 @@ class ChangeColumnTypeDialog(QDialog):
 			self._("Date/Time"): 'datetime'
 		}
 		new_type = type_map.get(type_display)
+		date_format = (self.format_input.text().strip() or None) if new_type == 'datetime' else None
 		
-		return column, new_type
+		return column, new_type, date_format
+
+	def toggle_format_input(self):
+		is_datetime = self.type_combo.currentText() == self._("Date/Time")
+		self.format_input.setVisible(is_datetime)
+		self.layout.labelForField(self.format_input).setVisible(is_datetime)
 
 # --- RenameColumnDialog Class ---
 class RenameColumnDialog(QDialog):
+	@traced('dialog')
 	def __init__(self, df_columns: list, _translator_func, parent=None):
 		super().__init__(parent)
 		self._ = _translator_func
@@ -162,15 +205,192 @@ class RenameColumnDialog(QDialog):
 		new_name = self.new_name_input.text().strip()
 		return old_name, new_name
 
+# --- DuplicatesDialog Class ---
+class DuplicatesDialog(QDialog):
+	@traced('dialog')
+	def __init__(self, df_columns: list, _translator_func, report_callback=None, parent=None):
+		super().__init__(parent)
+		self._ = _translator_func
+		self.report_callback = report_callback
+		self.setWindowTitle(self._("Drop Duplicates"))
+		self.setGeometry(200, 200, 400, 350)
+
+		self.layout = QFormLayout(self)
+
+		# لا اختيار = مقارنة كل الأعمدة
+		self.columns_list = QListWidget()
+		self.columns_list.setSelectionMode(QAbstractItemView.MultiSelection)
+		self.columns_list.addItems(df_columns)
+		self.layout.addRow(self._("Compare Columns (none = all):"), self.columns_list)
+
+		self.keep_combo = QComboBox()
+		self.keep_combo.addItems([
+			self._("Keep First Occurrence"),
+			self._("Keep Last Occurrence"),
+			self._("Remove All Copies")
+		])
+		self.layout.addRow(self._("Keep:"), self.keep_combo)
+
+		self.report_button = QPushButton(self._("Show Duplicate Groups"))
+		self.report_button.clicked.connect(self.show_report)
+		self.layout.addRow(self.report_button)
+
+		self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+		self.buttons.accepted.connect(self.accept)
+		self.buttons.rejected.connect(self.reject)
+		self.layout.addRow(self.buttons)
+
+	def show_report(self):
+		if self.report_callback:
+			self.report_callback(self.get_selected_options()[0])
+
+	def get_selected_options(self):
+		subset = [item.text() for item in self.columns_list.selectedItems()] or None
+		keep_map = {
+			self._("Keep First Occurrence"): 'first',
+			self._("Keep Last Occurrence"): 'last',
+			self._("Remove All Copies"): 'none'
+		}
+		keep = keep_map.get(self.keep_combo.currentText(), 'first')
+		return subset, keep
+
+class PairPlotDialog(QDialog):
+	@traced('dialog')
+	def __init__(self, numerical_cols: list, max_columns: int, _translator_func, parent=None):
+		super().__init__(parent)
+		self._ = _translator_func
+		self.max_columns = max_columns
+		self.setWindowTitle(self._("Generate Pair Plot"))
+		self.setGeometry(200, 200, 400, 350)
+
+		self.layout = QFormLayout(self)
+
+		self.columns_list = QListWidget()
+		self.columns_list.setSelectionMode(QAbstractItemView.MultiSelection)
+		self.columns_list.addItems(numerical_cols)
+		for i in range(min(max_columns, self.columns_list.count())):
+			self.columns_list.item(i).setSelected(True)
+		self.layout.addRow(self._("Columns (at most {n}):").format(n=max_columns), self.columns_list)
+
+		self.mode_combo = QComboBox()
+		self.mode_combo.addItems([
+			self._("Sampled Points"),
+			self._("Density (All Rows)")
+		])
+		self.layout.addRow(self._("Panels:"), self.mode_combo)
+
+		self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+		self.buttons.accepted.connect(self.accept)
+		self.buttons.rejected.connect(self.reject)
+		self.layout.addRow(self.buttons)
+
+	def get_selected_options(self):
+		columns = [item.text() for item in self.columns_list.selectedItems()]
+		mode_map = {
+			self._("Sampled Points"): 'sample',
+			self._("Density (All Rows)"): 'density'
+		}
+		mode = mode_map.get(self.mode_combo.currentText(), 'sample')
+		return columns, mode
+
+class ExportDialog(QDialog):
+	@traced('dialog')
+	def __init__(self, df_columns: list, _translator_func, parent=None):
+		super().__init__(parent)
+		self._ = _translator_func
+		self.setWindowTitle(self._("Export All Plots"))
+		self.setGeometry(200, 200, 400, 400)
+
+		self.layout = QFormLayout(self)
+
+		self.format_combo = QComboBox()
+		self.format_combo.addItems([
+			self._("PNG Images (Folder)"),
+			self._("SVG Images (Folder)"),
+			self._("PDF Files (Folder)"),
+			self._("Single Multi-page PDF")
+		])
+		self.layout.addRow(self._("Format:"), self.format_combo)
+
+		self.columns_list = QListWidget()
+		self.columns_list.setSelectionMode(QAbstractItemView.MultiSelection)
+		self.columns_list.addItems(df_columns)
+		for i in range(self.columns_list.count()):
+			self.columns_list.item(i).setSelected(True)
+		self.layout.addRow(self._("Plot Columns:"), self.columns_list)
+
+		self.heatmap_checkbox = QCheckBox(self._("Correlation Heatmap"))
+		self.heatmap_checkbox.setChecked(True)
+		self.layout.addRow(self.heatmap_checkbox)
+
+		self.statistics_checkbox = QCheckBox(self._("Summary Statistics Tables"))
+		self.statistics_checkbox.setChecked(True)
+		self.layout.addRow(self.statistics_checkbox)
+
+		self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+		self.buttons.accepted.connect(self.accept)
+		self.buttons.rejected.connect(self.reject)
+		self.layout.addRow(self.buttons)
+
+	def get_selected_options(self):
+		format_map = {
+			self._("PNG Images (Folder)"): 'png',
+			self._("SVG Images (Folder)"): 'svg',
+			self._("PDF Files (Folder)"): 'pdf',
+			self._("Single Multi-page PDF"): 'multipage_pdf'
+		}
+		file_format = format_map.get(self.format_combo.currentText(), 'png')
+		columns = [item.text() for item in self.columns_list.selectedItems()]
+		return file_format, columns, self.heatmap_checkbox.isChecked(), self.statistics_checkbox.isChecked()
+
+class ReportDialog(QDialog):
+	@traced('dialog')
+	def __init__(self, df_columns: list, _translator_func, parent=None):
+		super().__init__(parent)
+		self._ = _translator_func
+		self.setWindowTitle(self._("Generate Report"))
+		self.setGeometry(200, 200, 400, 400)
+
+		self.layout = QFormLayout(self)
+
+		self.image_format_combo = QComboBox()
+		self.image_format_combo.addItems([
+			self._("PNG Images"),
+			self._("SVG (Vector) Images")
+		])
+		self.layout.addRow(self._("Chart Format:"), self.image_format_combo)
+
+		self.columns_list = QListWidget()
+		self.columns_list.setSelectionMode(QAbstractItemView.MultiSelection)
+		self.columns_list.addItems(df_columns)
+		for i in range(self.columns_list.count()):
+			self.columns_list.item(i).setSelected(True)
+		self.layout.addRow(self._("Profiled Columns:"), self.columns_list)
+
+		self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+		self.buttons.accepted.connect(self.accept)
+		self.buttons.rejected.connect(self.reject)
+		self.layout.addRow(self.buttons)
+
+	def get_selected_options(self):
+		image_format = 'svg' if self.image_format_combo.currentIndex() == 1 else 'png'
+		columns = [item.text() for item in self.columns_list.selectedItems()]
+		return image_format, columns
+
 # --- MainWindow Class ---
 class MainWindow(QMainWindow):
+	# Emitted once the window has painted for the first time, and once the modules of the
+	# analysis features have been preloaded in the background after that
+	first_painted = pyqtSignal()
+	background_loading_finished = pyqtSignal()
+
 	def __init__(self, _translator_func=None, parent=None):
 		super().__init__(parent)
 
 		if _translator_func:
 			self._ = _translator_func
 		else:
-			self._ = lambda text: text
+			self._ = no_translation
 
 		self.setWindowTitle(self._("Helwan-Insight - Data Analysis Tool"))
 
@@ -194,6 +414,13 @@ class MainWindow(QMainWindow):
 
 		self.df = None
 		self.data_handler = None
+		self.export_worker = None
+		self.report_worker = None
+		self.preload_worker = None
+		self.memory_worker = None
+		self.eda_dashboard = None
+		self.performance_dock = None
+		self._painted = False
 
 		self.current_app_translator = None
 		self.current_qt_translator = None
@@ -204,8 +431,59 @@ class MainWindow(QMainWindow):
 
 		self.retranslate_ui()
 		self.set_status_bar_message(self._("Ready"))
+		self.first_painted.connect(self.start_background_loading)
 		self.showMaximized()
 
+	def paintEvent(self, event):
+		super().paintEvent(event)
+		if not self._painted:
+			self._painted = True
+			self.first_painted.emit()
+
+	def start_background_loading(self):
+		# Imports the heavy modules off the GUI thread; the dashboard widgets are then built
+		# on the GUI thread (widgets cannot be created in another thread)
+		if self.preload_worker is not None:
+			return
+		self.preload_worker = TaskWorker(preload_modules, args=(PRELOAD_MODULES,), parent=self)
+		self.preload_worker.result_ready.connect(self.on_background_loading_finished)
+		self.preload_worker.error_occurred.connect(self.on_background_loading_finished)
+		self.preload_worker.start()
+
+	def closeEvent(self, event):
+		# An import cannot be interrupted, nor a memory check writing to disk; let them finish
+		# before their threads go away
+		if self.preload_worker is not None:
+			self.preload_worker.wait()
+		if self.memory_worker is not None:
+			self.memory_worker.wait()
+		super().closeEvent(event)
+
+	def on_background_loading_finished(self, _result=None):
+		self.ensure_eda_dashboard()
+		self.background_loading_finished.emit()
+
+	def toggle_performance_panel(self, visible: bool):
+		if self.performance_dock is None:
+			if not visible:
+				return
+			from ui.widgets.performance_panel import PerformancePanel
+			self.performance_dock = QDockWidget(self._("Performance"), self)
+			self.performance_dock.setObjectName("performance_dock")
+			self.performance_dock.setWidget(PerformancePanel(parent=self))
+			self.performance_dock.visibilityChanged.connect(self.performance_action.setChecked)
+			self.addDockWidget(Qt.BottomDockWidgetArea, self.performance_dock)
+		self.performance_dock.setVisible(visible)
+
+	def ensure_eda_dashboard(self):
+		"""The EDA dashboard, built on first use unless the background loading built it already."""
+		if self.eda_dashboard is None:
+			from ui.widgets.eda_dashboard import EDADashboard
+			self.eda_dashboard = EDADashboard(parent=self)
+			self.eda_dashboard_layout.addWidget(self.eda_dashboard)
+			self.eda_dashboard.plot_requested.connect(self.handle_plot_request)
+		return self.eda_dashboard
+
 
 
 
@@ -236,15 +514,11 @@ class MainWindow(QMainWindow):
 		data_preview_layout.addWidget(self.data_preview_table)
 		self.stacked_widget.addWidget(self.data_preview_page)
 
-		# ✅ EDA Dashboard Page
+		# ✅ EDA Dashboard Page (the dashboard itself is added by ensure_eda_dashboard)
 		self.eda_dashboard_page = QWidget()
-		eda_dashboard_layout = QVBoxLayout(self.eda_dashboard_page)
-		self.eda_dashboard = EDADashboard(parent=self)
-		eda_dashboard_layout.addWidget(self.eda_dashboard)
+		self.eda_dashboard_layout = QVBoxLayout(self.eda_dashboard_page)
 		self.stacked_widget.addWidget(self.eda_dashboard_page)
 
-		self.eda_dashboard.plot_requested.connect(self.handle_plot_request)
-
 		# 🟢 عرض الصفحة الأولى
 		self.stacked_widget.setCurrentWidget(self.data_preview_page)
 
@@ -287,12 +561,41 @@ class MainWindow(QMainWindow):
 		save_plot_action.triggered.connect(self.save_current_plot_as_image)
 		self.file_menu.addAction(save_plot_action)
 
+		# Export All Plots
+		self.export_plots_action = QAction(QIcon(), self._("&Export All Plots..."), self)
+		self.export_plots_action.setToolTip(self._("Export every column's plot, the heatmap and statistics tables"))
+		self.export_plots_action.triggered.connect(self.export_all_plots)
+		self.file_menu.addAction(self.export_plots_action)
+
+		# Generate Report
+		self.generate_report_action = QAction(QIcon(), self._("&Generate Report..."), self)
+		self.generate_report_action.setToolTip(self._("Write an HTML report with profiles, charts, correlations, outliers and tests"))
+		self.generate_report_action.triggered.connect(self.generate_report)
+		self.file_menu.addAction(self.generate_report_action)
+
 		exit_action = QAction(QIcon(), self._("E&xit"), self)
 		exit_action.setToolTip(self._("Exit the application"))
 		exit_action.setShortcut("Ctrl+Q")
 		exit_action.triggered.connect(self.close)
 		self.file_menu.addAction(exit_action)
 
+		# قائمة Edit (تراجع / إعادة)
+		self.edit_menu = menu_bar.addMenu(self._("&Edit"))
+
+		self.undo_action = QAction(QIcon(), self._("&Undo"), self)
+		self.undo_action.setToolTip(self._("Undo the last data operation"))
+		self.undo_action.setShortcut("Ctrl+Z")
+		self.undo_action.triggered.connect(self.undo_last_operation)
+		self.edit_menu.addAction(self.undo_action)
+
+		self.redo_action = QAction(QIcon(), self._("&Redo"), self)
+		self.redo_action.setToolTip(self._("Redo the last undone data operation"))
+		self.redo_action.setShortcut("Ctrl+Y")
+		self.redo_action.triggered.connect(self.redo_last_operation)
+		self.edit_menu.addAction(self.redo_action)
+
+		self.update_undo_redo_actions()
+
 		# 2. قائمة Data 
 		self.data_menu = menu_bar.addMenu(self._("&Data"))
 		
@@ -320,6 +623,21 @@ class MainWindow(QMainWindow):
 		rename_column_action.triggered.connect(self.show_rename_column_dialog)
 		self.data_menu.addAction(rename_column_action)
 
+		self.data_menu.addSeparator()
+
+		# تسجيل خطوات التنظيف كـ Pipeline وإعادة تطبيقها
+		self.save_pipeline_action = QAction(QIcon(), self._("Save &Pipeline..."), self)
+		self.save_pipeline_action.setToolTip(self._("Save the applied cleaning steps as a reusable pipeline"))
+		self.save_pipeline_action.triggered.connect(self.save_pipeline)
+		self.data_menu.addAction(self.save_pipeline_action)
+
+		self.apply_pipeline_action = QAction(QIcon(), self._("&Apply Pipeline..."), self)
+		self.apply_pipeline_action.setToolTip(self._("Apply a saved pipeline to the current data"))
+		self.apply_pipeline_action.triggered.connect(self.apply_pipeline)
+		self.data_menu.addAction(self.apply_pipeline_action)
+
+		self.data_menu.addSeparator()
+
 		# إضافة زر Generate Pair Plot 
 		generate_pair_plot_action = QAction(QIcon(), self._("&Generate Pair Plot"), self)
 		generate_pair_plot_action.setToolTip(self._("Generate a pair plot for numerical variables"))
@@ -341,6 +659,13 @@ class MainWindow(QMainWindow):
 		# 4. قائمة Help
 		self.help_menu = menu_bar.addMenu(self._("&Help"))
 
+		# Timings of data operations, plot renders, tables and dialogs (see core.tracing)
+		self.performance_action = QAction(QIcon(), self._("&Performance Panel"), self)
+		self.performance_action.setToolTip(self._("Show where time goes: timings of operations, plots and dialogs"))
+		self.performance_action.setCheckable(True)
+		self.performance_action.toggled.connect(self.toggle_performance_panel)
+		self.help_menu.addAction(self.performance_action)
+
 		about_action = QAction(QIcon(), self._("&About"), self)
 		about_action.setToolTip(self._("Show information about Helwan-Insight"))
 		about_action.triggered.connect(self.show_about_dialog)
@@ -350,10 +675,87 @@ class MainWindow(QMainWindow):
 		self.status_bar = self.statusBar()
 		self.status_label = QLabel(self._("Ready"))
 		self.status_bar.addWidget(self.status_label)
+		# Progress of background work such as exporting plots
+		self.status_progress_bar = QProgressBar()
+		self.status_progress_bar.setMaximumWidth(200)
+		self.status_progress_bar.setVisible(False)
+		self.status_bar.addPermanentWidget(self.status_progress_bar)
+		# Memory in use against the budget; checked periodically so caches are dropped (and
+		# undo data moved to disk) before the system runs out of memory
+		self.memory_label = QLabel()
+		self.status_bar.addPermanentWidget(self.memory_label)
+		self.memory_timer = QTimer(self)
+		self.memory_timer.setInterval(MEMORY_CHECK_INTERVAL_MS)
+		self.memory_timer.timeout.connect(self.check_memory)
+		self.memory_timer.start()
 
 	def set_status_bar_message(self, message: str):
 		self.status_label.setText(message)
 
+	def check_memory(self):
+		# Reading the RSS and the (sampled, cached) dataset sizes is cheap. The plot and data
+		# caches are used by this thread and the render threads, so they are cleared here;
+		# only writing undo data to disk runs in a worker. The data shown (self.data_handler,
+		# the only dataset) is always in use, so it is never spilled
+		self.update_memory_label()
+		if self.memory_worker is not None:
+			return
+		excess = memory_monitor.excess()
+		if excess <= 0:
+			return
+		actions, excess = memory_monitor.clear_caches(excess)
+		if excess <= 0:
+			self.on_memory_freed(actions)
+			return
+		self.memory_worker = TaskWorker(memory_monitor.spill_history, args=(excess,), parent=self)
+		self.memory_worker.result_ready.connect(lambda result: self.on_memory_freed(actions + result[0]))
+		self.memory_worker.error_occurred.connect(lambda error: self.on_memory_freed(actions))
+		self.memory_worker.start()
+
+	def on_memory_freed(self, actions: list):
+		self.memory_worker = None
+		if actions:
+			self.set_status_bar_message(self._("Over the memory budget: {actions}").format(
+				actions="; ".join(self.describe_memory_action(*action) for action in actions)))
+		self.update_memory_label()
+
+	def describe_memory_action(self, kind: str, name: str, size: int) -> str:
+		"""Describes one of the actions returned by MemoryMonitor.enforce and its stages."""
+		if kind == 'cache':
+			return self._("Cleared {name} ({size})").format(name=self._(name), size=format_bytes(size))
+		if kind == 'data_caches':
+			return self._("Cleared data caches ({size})").format(size=format_bytes(size))
+		if kind == 'undo':
+			return self._("Moved undo data to disk ({size})").format(size=format_bytes(size))
+		return self._("Moved idle dataset {name} to disk ({size})").format(name=name, size=format_bytes(size))
+
+	def update_memory_label(self):
+		snapshot = memory_monitor.snapshot()
+		self.memory_label.setText(self._("Memory: {used} / {budget}").format(
+			used=format_bytes(snapshot["rss"]), budget=format_bytes(snapshot["budget"])))
+		lines = [self._("{name}: data {data}, undo {undo}, caches {caches}").format(
+			name=dataset["name"], data=self._("on disk") if dataset["spilled"] else format_bytes(dataset["bytes"]),
+			undo=format_bytes(dataset["undo_bytes"]), caches=format_bytes(dataset["cache_bytes"]))
+			for dataset in snapshot["datasets"]]
+		lines += [f"{self._(name)}: {format_bytes(size)}" for name, size in snapshot["caches"].items()]
+		self.memory_label.setToolTip("\n".join(lines))
+
+	def confirm_memory(self, estimated_bytes: int) -> bool:
+		"""Asks before an operation estimated to need more memory than the budget leaves."""
+		if not memory_monitor.would_exceed(estimated_bytes):
+			return True
+		answer = QMessageBox.question(
+			self, self._("Low Memory"),
+			self._("This operation may need about {needed} of memory, but {used} of the {budget} memory budget is already in use. "
+				   "It may fail or make the system slow.\n\nContinue anyway?").format(
+				needed=format_bytes(estimated_bytes), used=format_bytes(memory_monitor.rss()),
+				budget=format_bytes(memory_monitor.budget)),
+			QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+		if answer != QMessageBox.Yes:
+			self.set_status_bar_message(self._("Operation cancelled."))
+			return False
+		return True
+
 	def load_data(self):
 		self.set_status_bar_message(self._("Loading data... Please wait."))
 		file_path, _ = QFileDialog.getOpenFileName(
@@ -363,12 +765,16 @@ class MainWindow(QMainWindow):
 			self._("Data Files (*.csv *.xlsx *.xls);;All Files (*)")
 		)
 		if file_path:
+			if not self.confirm_memory(estimate_load_bytes(file_path)):
+				return
+			from core.data_handler import DataHandler
 			try:
 				self.data_handler = DataHandler(file_path)
 				self.df = self.data_handler.load_data()
 				
 				self.data_preview_table.set_data(self.df)
-				self.eda_dashboard.set_data(self.df, self.data_handler)
+				self.ensure_eda_dashboard().set_data(self.df, self.data_handler)
+				self.update_undo_redo_actions()
 
 				self.stacked_widget.setCurrentWidget(self.data_preview_page)
 				self.set_status_bar_message(
@@ -429,7 +835,7 @@ class MainWindow(QMainWindow):
 
 		if file_path:
 			try:
-				self.eda_dashboard.plot_area.save_plot_as_image(file_path)
+				self.ensure_eda_dashboard().plot_area.save_plot_as_image(file_path)
 				QMessageBox.information(self, self._("Success"), 
 										self._("Plot saved successfully to {path}").format(path=file_path))
 				self.set_status_bar_message(self._("Plot saved to {path}").format(path=file_path))
@@ -440,6 +846,189 @@ class MainWindow(QMainWindow):
 		else:
 			self.set_status_bar_message(self._("Save plot operation cancelled."))
 
+	def export_all_plots(self):
+		if self.df is None:
+			QMessageBox.warning(self, self._("No Data"), self._("Please load data first."))
+			return
+		if self.export_worker is not None and self.export_worker.isRunning():
+			QMessageBox.information(self, self._("Export Running"), self._("Please wait for the current export to finish."))
+			return
+
+		dialog = ExportDialog(self.data_handler.get_column_names(), self._, self)
+		if not dialog.exec_():
+			return
+		file_format, columns, include_heatmap, include_statistics = dialog.get_selected_options()
+		if not columns and not include_heatmap and not include_statistics:
+			QMessageBox.warning(self, self._("Nothing to Export"), self._("Please select at least one plot to export."))
+			return
+
+		if file_format == 'multipage_pdf':
+			output_path, _ = QFileDialog.getSaveFileName(
+				self,
+				self._("Export All Plots"),
+				"report.pdf",
+				self._("PDF Files (*.pdf);;All Files (*)")
+			)
+		else:
+			output_path = QFileDialog.getExistingDirectory(self, self._("Export All Plots"))
+		if not output_path:
+			self.set_status_bar_message(self._("Export cancelled."))
+			return
+
+		from core.export import export_plots
+
+		# Charts are rendered in worker processes, driven from a background thread; they are
+		# drawn from a snapshot so data operations meanwhile do not change the export. The
+		# workers are spawned: forking this multi-threaded Qt process is not safe. Each spawned
+		# worker unpickles its own copy of the frame, so only as many start as the memory
+		# budget has room for
+		self.export_worker = TaskWorker(
+			export_plots,
+			args=(self.df.copy(deep=False), output_path, file_format),
+			kwargs={'columns': columns, 'include_heatmap': include_heatmap,
+					'include_statistics': include_statistics, 'translate': self._, 'mp_context': 'spawn',
+					'n_jobs': memory_monitor.worker_limit(self.data_handler.estimate_operation_memory(copies=2))},
+			report_progress=True,
+			parent=self
+		)
+		self.export_worker.progress.connect(self.on_export_progress)
+		self.export_worker.result_ready.connect(self.on_export_finished)
+		self.export_worker.error_occurred.connect(self.on_export_failed)
+		self.export_plots_action.setEnabled(False)
+		self.status_progress_bar.setValue(0)
+		self.status_progress_bar.setVisible(True)
+		self.set_status_bar_message(self._("Exporting plots..."))
+		self.export_worker.start()
+
+	def on_export_progress(self, completed: int, total: int):
+		self.status_progress_bar.setMaximum(total)
+		self.status_progress_bar.setValue(completed)
+		self.set_status_bar_message(self._("Exporting plots... {completed} of {total}").format(completed=completed, total=total))
+
+	def on_export_finished(self, result: dict):
+		self.export_plots_action.setEnabled(True)
+		self.status_progress_bar.setVisible(False)
+		if result["pages"]:
+			message = self._("Exported {count} pages.").format(count=result["pages"])
+		else:
+			message = self._("Exported {count} files.").format(count=len(result["files"]))
+		self.set_status_bar_message(message)
+		if result["skipped"]:
+			skipped = "\n".join(f"{name}: {self._(reason)}" for name, reason in result["skipped"])
+			QMessageBox.information(self, self._("Export Finished"),
+									message + "\n\n" + self._("Skipped plots:") + "\n" + skipped)
+
+	def on_export_failed(self, error: Exception):
+		self.export_plots_action.setEnabled(True)
+		self.status_progress_bar.setVisible(False)
+		self.set_status_bar_message(self._("Error exporting plots."))
+		if isinstance(error, ValueError):
+			QMessageBox.warning(self, self._("Export Error"), self._(str(error)))
+		else:
+			QMessageBox.critical(self, self._("Export Error"), self._("Failed to export plots: {e}").format(e=error))
+
+	def generate_report(self):
+		if self.df is None:
+			QMessageBox.warning(self, self._("No Data"), self._("Please load data first."))
+			return
+		if self.report_worker is not None and self.report_worker.isRunning():
+			QMessageBox.information(self, self._("Report Running"), self._("Please wait for the current report to finish."))
+			return
+
+		dialog = ReportDialog(self.data_handler.get_column_names(), self._, self)
+		if not dialog.exec_():
+			return
+		image_format, columns = dialog.get_selected_options()
+
+		output_path, _ = QFileDialog.getSaveFileName(
+			self,
+			self._("Generate Report"),
+			"report.html",
+			self._("HTML Files (*.html);;All Files (*)")
+		)
+		if not output_path:
+			self.set_status_bar_message(self._("Report cancelled."))
+			return
+
+		from core.report import generate_report
+
+		# Sections are computed in (spawned, see export_plots) worker processes, from a snapshot of the data
+		title = os.path.basename(self.data_handler.file_path) if self.data_handler.file_path else None
+		self.report_worker = TaskWorker(
+			generate_report,
+			args=(self.df.copy(deep=False), output_path),
+			kwargs={'columns': columns, 'image_format': image_format, 'title': title, 'translate': self._,
+					'mp_context': 'spawn',
+					'n_jobs': memory_monitor.worker_limit(self.data_handler.estimate_operation_memory(copies=2))},
+			report_progress=True,
+			parent=self
+		)
+		self.report_worker.progress.connect(self.on_report_progress)
+		self.report_worker.result_ready.connect(self.on_report_finished)
+		self.report_worker.error_occurred.connect(self.on_report_failed)
+		self.generate_report_action.setEnabled(False)
+		self.status_progress_bar.setValue(0)
+		self.status_progress_bar.setVisible(True)
+		self.set_status_bar_message(self._("Generating report..."))
+		self.report_worker.start()
+
+	def on_report_progress(self, completed: int, total: int):
+		self.status_progress_bar.setMaximum(total)
+		self.status_progress_bar.setValue(completed)
+		self.set_status_bar_message(self._("Generating report... {completed} of {total} sections").format(completed=completed, total=total))
+
+	def on_report_finished(self, result: dict):
+		self.generate_report_action.setEnabled(True)
+		self.status_progress_bar.setVisible(False)
+		message = self._("Report saved to {path}").format(path=result["path"])
+		self.set_status_bar_message(message)
+		if result["skipped"]:
+			skipped = "\n".join(f"{heading}: {self._(reason)}" for heading, reason in result["skipped"])
+			QMessageBox.information(self, self._("Report Finished"),
+									message + "\n\n" + self._("Sections without results:") + "\n" + skipped)
+
+	def on_report_failed(self, error: Exception):
+		self.generate_report_action.setEnabled(True)
+		self.status_progress_bar.setVisible(False)
+		self.set_status_bar_message(self._("Error generating report."))
+		if isinstance(error, ValueError):
+			QMessageBox.warning(self, self._("Report Error"), self._(str(error)))
+		else:
+			QMessageBox.critical(self, self._("Report Error"), self._("Failed to generate report: {e}").format(e=error))
+
+	def update_data_views(self):
+		# Refresh every view after the DataHandler's DataFrame changed
+		self.df = self.data_handler.get_dataframe()
+		self.data_preview_table.set_data(self.df)
+		self.ensure_eda_dashboard().set_data(self.df, self.data_handler)
+		self.update_undo_redo_actions()
+
+	def update_undo_redo_actions(self):
+		self.undo_action.setEnabled(self.data_handler is not None and self.data_handler.can_undo())
+		self.redo_action.setEnabled(self.data_handler is not None and self.data_handler.can_redo())
+
+	def undo_last_operation(self):
+		if self.data_handler is None or not self.data_handler.can_undo():
+			return
+		try:
+			operation = self.data_handler.undo()
+			self.update_data_views()
+			self.set_status_bar_message(self._("Undone: {operation}").format(operation=operation["operation"]))
+		except Exception as e:
+			QMessageBox.critical(self, self._("Processing Error"), self._("An unexpected error occurred: {e}").format(e=e))
+
+	def redo_last_operation(self):
+		if self.data_handler is None or not self.data_handler.can_redo():
+			return
+		try:
+			operation = self.data_handler.redo()
+			self.update_data_views()
+			self.set_status_bar_message(self._("Redone: {operation}").format(operation=operation["operation"]))
+		except ValueError as e:
+			QMessageBox.warning(self, self._("Error"), self._(str(e)))
+		except Exception as e:
+			QMessageBox.critical(self, self._("Processing Error"), self._("An unexpected error occurred: {e}").format(e=e))
+
 	def show_eda_dashboard(self):
 		if self.df is None:
 			QMessageBox.warning(self.parent, self._("No Data Loaded"), self._("Please load a data file first to view the EDA Dashboard."))
@@ -449,11 +1038,11 @@ class MainWindow(QMainWindow):
 		self.stacked_widget.setCurrentWidget(self.eda_dashboard_page)
 
 
-	def handle_plot_request(self, plot_type: str, column: str, df: pd.DataFrame):
+	def handle_plot_request(self, plot_type: str, column: str, df: 'pd.DataFrame'):
 		if plot_type == 'heatmap':
-			self.eda_dashboard.plot_area.plot_data(plot_type, None, df) 
+			self.ensure_eda_dashboard().plot_area.plot_data(plot_type, None, df) 
 		else:
-			self.eda_dashboard.plot_area.plot_data(plot_type, column, df)
+			self.ensure_eda_dashboard().plot_area.plot_data(plot_type, column, df)
 		
 		if self.stacked_widget.indexOf(self.eda_dashboard_page) == -1:
 			self.stacked_widget.addWidget(self.eda_dashboard_page)
@@ -476,10 +1065,10 @@ class MainWindow(QMainWindow):
 		from utils.i18n import setup_translation
 		self.current_app_translator = setup_translation(locale_code, "helwan_insight")
 		
-		if isinstance(self.current_app_translator, gettext.GNUTranslations):
-			self._ = self.current_app_translator.gettext
+		if isinstance(self.current_app_translator, Translation):
+			self._ = self.current_app_translator
 		else:
-			self._ = lambda text: text # Fallback if gettext translation not loaded
+			self._ = no_translation # Fallback if gettext translation not loaded
 
 		# Reload Qt's own translator for standard dialogs
 		self.current_qt_translator = QTranslator()
@@ -500,13 +1089,21 @@ class MainWindow(QMainWindow):
 		if self.df is None:
 			QMessageBox.warning(self, self._("No Data"), self._("Please load data first to handle missing values."))
 			return
+		from core.data_handler import IMPUTATION_STRATEGIES
 
 		dialog = MissingValuesDialog(self.data_handler.get_column_names(), 
 									 self.data_handler.get_numerical_columns(), 
 									 self.data_handler.get_categorical_columns(),
 									 self._, parent=self)
 		if dialog.exec_() == QDialog.Accepted:
-			strategy_type, column_to_affect, fill_value = dialog.get_selected_options()
+			strategy_type, column_to_affect, fill_value, group_by = dialog.get_selected_options()
+			# Imputing a column replaces it (its old values are kept for undo); dropping rows copies every column
+			if strategy_type in IMPUTATION_STRATEGIES and column_to_affect not in ["numerical_cols_only", "categorical_cols_only", "all_cols_any_type"]:
+				estimated_bytes = self.data_handler.estimate_operation_memory([column_to_affect])
+			else:
+				estimated_bytes = self.data_handler.estimate_operation_memory(copies=1 if strategy_type.startswith('drop') else 2)
+			if not self.confirm_memory(estimated_bytes):
+				return
 			
 			try:
 				processed_count = 0
@@ -521,79 +1118,39 @@ class MainWindow(QMainWindow):
 					processed_count = self.data_handler.handle_missing_values('drop_rows', column=column_to_affect)
 					QMessageBox.information(self, self._("Success"), 
 											self._("Successfully dropped {count} rows with missing values in column '{column}'.").format(count=processed_count, column=column_to_affect))
-				
-				elif strategy_type == 'fill_mean':
-					if column_to_affect == "numerical_cols_only":
-						numerical_cols = self.data_handler.get_numerical_columns()
-						for col in numerical_cols:
-							processed_count += self.data_handler.handle_missing_values('fill_mean', column=col)
-						QMessageBox.information(self, self._("Success"), 
-												self._("Successfully filled missing values with mean in {count} numerical cells.").format(count=processed_count))
-					elif column_to_affect in ["categorical_cols_only", "all_cols_any_type"]:
-						QMessageBox.warning(self.parent, self._("Invalid Column Type"), self._("Mean filling is only applicable to numerical columns."))
-						return
-					else: # عمود محدد
-						processed_count = self.data_handler.handle_missing_values('fill_mean', column=column_to_affect)
-						QMessageBox.information(self, self._("Success"), 
-												self._("Successfully filled {count} missing values in column '{column}' with mean.").format(count=processed_count, column=column_to_affect))
 
-				elif strategy_type == 'fill_median':
-					if column_to_affect == "numerical_cols_only":
-						numerical_cols = self.data_handler.get_numerical_columns()
-						for col in numerical_cols:
-							processed_count += self.data_handler.handle_missing_values('fill_median', column=col)
-						QMessageBox.information(self, self._("Success"), 
-												self._("Successfully filled missing values with median in {count} numerical cells.").format(count=processed_count))
-					elif column_to_affect in ["categorical_cols_only", "all_cols_any_type"]:
-						QMessageBox.warning(self.parent, self._("Invalid Column Type"), self._("Median filling is only applicable to numerical columns."))
+				elif strategy_type in IMPUTATION_STRATEGIES:
+					if strategy_type == 'fill_value' and not fill_value:
+						QMessageBox.warning(self, self._("Missing Value"), self._("Please enter a value to fill with."))
 						return
-					else: # عمود محدد
-						processed_count = self.data_handler.handle_missing_values('fill_median', column=column_to_affect)
-						QMessageBox.information(self, self._("Success"), 
-												self._("Successfully filled {count} missing values in column '{column}' with median.").format(count=processed_count, column=column_to_affect))
-				
-				elif strategy_type == 'fill_mode':
-					target_cols = []
-					if column_to_affect == "numerical_cols_only":
-						target_cols = self.data_handler.get_numerical_columns()
-					elif column_to_affect == "categorical_cols_only":
-						target_cols = self.data_handler.get_categorical_columns()
-					elif column_to_affect == "all_cols_any_type":
-						 QMessageBox.warning(self.parent, self._("Invalid Selection"), self._("Mode filling requires selecting specific column types or a single column."))
-						 return
-					else: # عمود محدد
-						target_cols = [column_to_affect]
-
-					for col in target_cols:
-						processed_count += self.data_handler.handle_missing_values('fill_mode', column=col)
-					QMessageBox.information(self, self._("Success"), 
-											self._("Successfully filled missing values with mode in {count} cells.").format(count=processed_count))
 
-				elif strategy_type == 'fill_value':
-					if not fill_value:
-						QMessageBox.warning(self.parent, self._("Missing Value"), self._("Please enter a value to fill with."))
-						return
-					
-					target_cols = []
+					numerical_only = strategy_type in ('fill_mean', 'fill_median', 'interpolate')
 					if column_to_affect == "numerical_cols_only":
 						target_cols = self.data_handler.get_numerical_columns()
-					elif column_to_affect == "categorical_cols_only":
-						target_cols = self.data_handler.get_categorical_columns()
-					elif column_to_affect == "all_cols_any_type":
-						 QMessageBox.warning(self.parent, self._("Invalid Selection"), self._("Filling with specific value requires selecting specific column types or a single column."))
-						 return
+					elif column_to_affect in ["categorical_cols_only", "all_cols_any_type"]:
+						if numerical_only:
+							QMessageBox.warning(self, self._("Invalid Column Type"), self._("This strategy is only applicable to numerical columns."))
+							return
+						if column_to_affect == "categorical_cols_only":
+							target_cols = self.data_handler.get_categorical_columns()
+						else:
+							target_cols = self.data_handler.get_column_names()
 					else: # عمود محدد
 						target_cols = [column_to_affect]
 
-					for col in target_cols:
-						processed_count += self.data_handler.handle_missing_values('fill_value', column=col, fill_value=fill_value)
+					# كل الأعمدة تُملأ في خطوة واحدة (قابلة للتراجع مرة واحدة)
+					target_cols = [col for col in target_cols if not group_by or col not in group_by]
+					filled_counts = self.data_handler.impute_missing_values(
+						{col: strategy_type for col in target_cols},
+						fill_values={col: fill_value for col in target_cols} if strategy_type == 'fill_value' else None,
+						group_by=group_by
+					)
+					processed_count = sum(filled_counts.values())
 					QMessageBox.information(self, self._("Success"), 
-											self._("Successfully filled missing values with '{value}' in {count} cells.").format(value=fill_value, count=processed_count))
+											self._("Successfully filled {count} missing values in {columns} column(s).").format(count=processed_count, columns=len(filled_counts)))
 
 				# تحديث الواجهة بعد المعالجة
-				self.df = self.data_handler.get_dataframe()
-				self.data_preview_table.set_data(self.df)
-				self.eda_dashboard.set_data(self.df, self.data_handler)
+				self.update_data_views()
 
 			except ValueError as e:
 				QMessageBox.warning(self, self._("Error"), self._(str(e)))
@@ -605,14 +1162,20 @@ class MainWindow(QMainWindow):
 			QMessageBox.warning(self, self._("No Data"), self._("Please load data first to remove duplicates."))
 			return
 		
+		dialog = DuplicatesDialog(self.data_handler.get_column_names(), self._,
+								  report_callback=self.show_duplicate_report, parent=self)
+		if dialog.exec_() != QDialog.Accepted:
+			return
+		subset, keep = dialog.get_selected_options()
+		if not self.confirm_memory(self.data_handler.estimate_operation_memory(copies=1)):
+			return
+
 		try:
-			removed_count = self.data_handler.drop_duplicates()
+			removed_count = self.data_handler.drop_duplicates(subset=subset, keep=keep)
 			if removed_count > 0:
 				QMessageBox.information(self, self._("Success"), 
 										self._("Successfully removed {count} duplicate rows.").format(count=removed_count))
-				self.df = self.data_handler.get_dataframe()
-				self.data_preview_table.set_data(self.df)
-				self.eda_dashboard.set_data(self.df, self.data_handler)
+				self.update_data_views()
 			else:
 				QMessageBox.information(self, self._("No Duplicates"), self._("No duplicate rows found."))
 		except ValueError as e:
@@ -620,6 +1183,76 @@ class MainWindow(QMainWindow):
 		except Exception as e:
 			QMessageBox.critical(self, self._("Processing Error"), self._("An unexpected error occurred: {e}").format(e=e))
 
+	def save_pipeline(self):
+		if self.df is None:
+			QMessageBox.warning(self, self._("No Data"), self._("Please load data first."))
+			return
+		from core.pipeline import Pipeline
+		pipeline = Pipeline.from_handler(self.data_handler)
+		if not pipeline.steps:
+			QMessageBox.information(self, self._("Empty Pipeline"), self._("No cleaning steps have been applied yet."))
+			return
+
+		file_path, _ = QFileDialog.getSaveFileName(
+			self,
+			self._("Save Pipeline"),
+			"pipeline.json",
+			self._("JSON Files (*.json);;YAML Files (*.yaml *.yml);;All Files (*)")
+		)
+		if not file_path:
+			self.set_status_bar_message(self._("Save operation cancelled."))
+			return
+		try:
+			pipeline.save(file_path)
+			self.set_status_bar_message(self._("Pipeline with {count} steps saved to {path}").format(count=len(pipeline.steps), path=file_path))
+		except ValueError as e:
+			QMessageBox.warning(self, self._("Error"), self._(str(e)))
+		except Exception as e:
+			QMessageBox.critical(self, self._("Save Error"), self._("Failed to save pipeline: {e}").format(e=e))
+
+	def apply_pipeline(self):
+		if self.df is None:
+			QMessageBox.warning(self, self._("No Data"), self._("Please load data first."))
+			return
+
+		file_path, _ = QFileDialog.getOpenFileName(
+			self,
+			self._("Apply Pipeline"),
+			"",
+			self._("Pipeline Files (*.json *.yaml *.yml);;All Files (*)")
+		)
+		if not file_path:
+			return
+		if not self.confirm_memory(self.data_handler.estimate_operation_memory()):
+			return
+		from core.pipeline import Pipeline
+		try:
+			pipeline = Pipeline.load(file_path)
+			applied = pipeline.apply(self.data_handler)
+			self.set_status_bar_message(self._("Applied {count} pipeline steps.").format(count=applied))
+		except ValueError as e:
+			QMessageBox.warning(self, self._("Error"), self._(str(e)))
+		except Exception as e:
+			QMessageBox.critical(self, self._("Processing Error"), self._("An unexpected error occurred: {e}").format(e=e))
+		# Steps applied before a failing one stay applied (and can be undone one by one)
+		self.update_data_views()
+
+	def show_duplicate_report(self, subset: list = None):
+		from ui.dialogs.statistics_dialog import StatisticsDialog
+		try:
+			report = self.data_handler.get_duplicate_report(subset)
+			if report.empty:
+				QMessageBox.information(self, self._("No Duplicates"), self._("No duplicate rows found."))
+				return
+			report.index = [self._("Group {number}").format(number=i + 1) for i in range(len(report))]
+			dialog = StatisticsDialog(report, self._, parent=self)
+			dialog.setWindowTitle(self._("Duplicate Groups ({count})").format(count=len(report)))
+			dialog.exec_()
+		except ValueError as e:
+			QMessageBox.warning(self, self._("Error"), self._(str(e)))
+		except Exception as e:
+			QMessageBox.critical(self, self._("Processing Error"), self._("An unexpected error occurred: {e}").format(e=e))
+
 	def show_change_column_type_dialog(self):
 		if self.df is None:
 			QMessageBox.warning(self, self._("No Data"), self._("Please load data first to change column type."))
@@ -627,20 +1260,34 @@ class MainWindow(QMainWindow):
 
 		dialog = ChangeColumnTypeDialog(self.data_handler.get_column_names(), self._, parent=self)
 		if dialog.exec_() == QDialog.Accepted:
-			column, new_type = dialog.get_selected_options()
+			column, new_type, date_format = dialog.get_selected_options()
 			
 			if not column or not new_type:
 				QMessageBox.warning(self, self._("Missing Information"), self._("Please select a column and a new type."))
 				return
+			if not self.confirm_memory(self.data_handler.estimate_operation_memory([column])):
+				return
 
 			try:
-				self.data_handler.change_column_type(column, new_type)
+				# معاينة أولاً: القيم التي لا يمكن تحويلها تُعرض مع أرقام صفوفها
+				report = self.data_handler.get_conversion_report(column, new_type, format=date_format)
+				errors = 'raise'
+				if report["failed"] > 0:
+					examples = "\n".join(f"{row}: {value}" for row, value in report["failed_rows"].head(10).itertuples(index=False))
+					answer = QMessageBox.question(
+						self, self._("Conversion Problems"),
+						self._("{count} values in column '{column}' cannot be converted, for example:\n\n{examples}\n\nConvert anyway and set these values to missing?").format(
+							count=report["failed"], column=column, examples=examples),
+						QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+					if answer != QMessageBox.Yes:
+						self.set_status_bar_message(self._("Conversion cancelled."))
+						return
+					errors = 'coerce'
+				self.data_handler.change_column_type(column, new_type, errors=errors, format=date_format)
 				QMessageBox.information(self, self._("Success"), 
 										self._("Column '{column}' successfully converted to {new_type_display}.").format(
 											column=column, new_type_display=dialog.type_combo.currentText()))
-				self.df = self.data_handler.get_dataframe()
-				self.data_preview_table.set_data(self.df)
-				self.eda_dashboard.set_data(self.df, self.data_handler)
+				self.update_data_views()
 			except ValueError as e:
 				translated_error_message = self._(str(e))
 				QMessageBox.warning(self, self._("Error"), translated_error_message)
@@ -667,9 +1314,7 @@ class MainWindow(QMainWindow):
 				self.data_handler.rename_column(old_name, new_name)
 				QMessageBox.information(self, self._("Success"), 
 										self._("Column '{old_name}' successfully renamed to '{new_name}'.").format(old_name=old_name, new_name=new_name))
-				self.df = self.data_handler.get_dataframe()
-				self.data_preview_table.set_data(self.df)
-				self.eda_dashboard.set_data(self.df, self.data_handler)
+				self.update_data_views()
 			except ValueError as e:
 				QMessageBox.warning(self, self._("Error"), self._(str(e)))
 			except Exception as e:
@@ -680,21 +1325,43 @@ class MainWindow(QMainWindow):
 			QMessageBox.warning(self, self._("No Data"), self._("Please load data first to generate a pair plot."))
 			return
 
+		from core.pairplot import MAX_PAIRPLOT_COLUMNS
 		numerical_cols = self.data_handler.get_numerical_columns()
 		if not numerical_cols:
 			QMessageBox.warning(self.parent, self._("No Numerical Data"), self._("No numerical columns found to generate a pair plot."))
 			return
 		
-		self.eda_dashboard.plot_area.plot_data('pairplot', None, self.df) 
+		dialog = PairPlotDialog(numerical_cols, MAX_PAIRPLOT_COLUMNS, self._, self)
+		if not dialog.exec_():
+			return
+		columns, mode = dialog.get_selected_options()
+		if not columns:
+			QMessageBox.warning(self, self._("No Columns Selected"), self._("Please select at least one column."))
+			return
+		if len(columns) > MAX_PAIRPLOT_COLUMNS:
+			QMessageBox.warning(self, self._("Too Many Columns"),
+								self._("Please select at most {n} columns for a pair plot.").format(n=MAX_PAIRPLOT_COLUMNS))
+			return
+
+		self.ensure_eda_dashboard().plot_area.plot_pairplot(self.df, columns, mode)
 		
-		self.stacked_widget.setCurrentWidget(self.eda_dashboard_page)
+		self.show_eda_dashboard()
 		self.set_status_bar_message(self._("Generated Pair Plot."))
 
 	def retranslate_ui(self):
 		self.setWindowTitle(self._("Helwan-Insight - Data Analysis Tool"))
 
 		self.file_menu.setTitle(self._("&File"))
+		self.edit_menu.setTitle(self._("&Edit"))
+		self.undo_action.setText(self._("&Undo"))
+		self.undo_action.setToolTip(self._("Undo the last data operation"))
+		self.redo_action.setText(self._("&Redo"))
+		self.redo_action.setToolTip(self._("Redo the last undone data operation"))
 		self.data_menu.setTitle(self._("&Data"))
+		self.save_pipeline_action.setText(self._("Save &Pipeline..."))
+		self.save_pipeline_action.setToolTip(self._("Save the applied cleaning steps as a reusable pipeline"))
+		self.apply_pipeline_action.setText(self._("&Apply Pipeline..."))
+		self.apply_pipeline_action.setToolTip(self._("Apply a saved pipeline to the current data"))
 		self.help_menu.setTitle(self._("&Help"))
 
 		for action in self.file_menu.actions():
@@ -711,6 +1378,12 @@ class MainWindow(QMainWindow):
 			elif original_text_key == "Save Plot as Image":
 				action.setText(self._("Save Plot as &Image"))
 				action.setToolTip(self._("Save the current displayed plot as an image (PNG)"))
+			elif original_text_key == "Export All Plots...":
+				action.setText(self._("&Export All Plots..."))
+				action.setToolTip(self._("Export every column's plot, the heatmap and statistics tables"))
+			elif original_text_key == "Generate Report...":
+				action.setText(self._("&Generate Report..."))
+				action.setToolTip(self._("Write an HTML report with profiles, charts, correlations, outliers and tests"))
 			elif original_text_key == "Exit":
 				action.setText(self._("E&xit"))
 				action.setToolTip(self._("Exit the application"))
@@ -741,6 +1414,9 @@ class MainWindow(QMainWindow):
 			if action.text().replace("&", "") == "About":
 				action.setText(self._("&About"))
 				action.setToolTip(self._("Show information about Helwan-Insight"))
+			elif action.text().replace("&", "") == "Performance Panel":
+				action.setText(self._("&Performance Panel"))
+				action.setToolTip(self._("Show where time goes: timings of operations, plots and dialogs"))
 
 		self.status_label.setText(self._("Ready"))
 
@@ -748,6 +1424,9 @@ class MainWindow(QMainWindow):
 			self.eda_dashboard.retranslate_ui()
 		if self.data_preview_table:
 			self.data_preview_table.retranslate_ui()
+		if self.performance_dock:
+			self.performance_dock.setWindowTitle(self._("Performance"))
+			self.performance_dock.widget().retranslate_ui()
 
 		if isinstance(QApplication.activeModalWidget(), MissingValuesDialog):
 			dialog = QApplication.activeModalWidget()
@@ -771,8 +1450,52 @@ class MainWindow(QMainWindow):
 			dialog.strategy_combo.setItemText(3, self._("Fill with Median"))
 			dialog.strategy_combo.setItemText(4, self._("Fill with Mode"))
 			dialog.strategy_combo.setItemText(5, self._("Fill with Specific Value"))
+			dialog.strategy_combo.setItemText(6, self._("Forward Fill"))
+			dialog.strategy_combo.setItemText(7, self._("Backward Fill"))
+			dialog.strategy_combo.setItemText(8, self._("Interpolate (Linear)"))
+			dialog.layout.labelForField(dialog.group_combo).setText(self._("Fill Within Groups Of:"))
+			dialog.group_combo.setItemText(0, self._("(No Grouping)"))
 			dialog.fill_value_input.setPlaceholderText(self._("Enter value to fill with"))
 
+		if isinstance(QApplication.activeModalWidget(), DuplicatesDialog):
+			dialog = QApplication.activeModalWidget()
+			dialog.setWindowTitle(self._("Drop Duplicates"))
+			dialog.layout.labelForField(dialog.columns_list).setText(self._("Compare Columns (none = all):"))
+			dialog.layout.labelForField(dialog.keep_combo).setText(self._("Keep:"))
+			dialog.keep_combo.setItemText(0, self._("Keep First Occurrence"))
+			dialog.keep_combo.setItemText(1, self._("Keep Last Occurrence"))
+			dialog.keep_combo.setItemText(2, self._("Remove All Copies"))
+			dialog.report_button.setText(self._("Show Duplicate Groups"))
+
+		if isinstance(QApplication.activeModalWidget(), PairPlotDialog):
+			dialog = QApplication.activeModalWidget()
+			dialog.setWindowTitle(self._("Generate Pair Plot"))
+			dialog.layout.labelForField(dialog.columns_list).setText(
+				self._("Columns (at most {n}):").format(n=dialog.max_columns))
+			dialog.layout.labelForField(dialog.mode_combo).setText(self._("Panels:"))
+			dialog.mode_combo.setItemText(0, self._("Sampled Points"))
+			dialog.mode_combo.setItemText(1, self._("Density (All Rows)"))
+
+		if isinstance(QApplication.activeModalWidget(), ExportDialog):
+			dialog = QApplication.activeModalWidget()
+			dialog.setWindowTitle(self._("Export All Plots"))
+			dialog.layout.labelForField(dialog.format_combo).setText(self._("Format:"))
+			dialog.format_combo.setItemText(0, self._("PNG Images (Folder)"))
+			dialog.format_combo.setItemText(1, self._("SVG Images (Folder)"))
+			dialog.format_combo.setItemText(2, self._("PDF Files (Folder)"))
+			dialog.format_combo.setItemText(3, self._("Single Multi-page PDF"))
+			dialog.layout.labelForField(dialog.columns_list).setText(self._("Plot Columns:"))
+			dialog.heatmap_checkbox.setText(self._("Correlation Heatmap"))
+			dialog.statistics_checkbox.setText(self._("Summary Statistics Tables"))
+
+		if isinstance(QApplication.activeModalWidget(), ReportDialog):
+			dialog = QApplication.activeModalWidget()
+			dialog.setWindowTitle(self._("Generate Report"))
+			dialog.layout.labelForField(dialog.image_format_combo).setText(self._("Chart Format:"))
+			dialog.image_format_combo.setItemText(0, self._("PNG Images"))
+			dialog.image_format_combo.setItemText(1, self._("SVG (Vector) Images"))
+			dialog.layout.labelForField(dialog.columns_list).setText(self._("Profiled Columns:"))
+
 		if isinstance(QApplication.activeModalWidget(), ChangeColumnTypeDialog):
 			dialog = QApplication.activeModalWidget()
 			dialog.setWindowTitle(self._("Change Column Type"))
@@ -787,6 +1510,8 @@ class MainWindow(QMainWindow):
 			dialog.type_combo.setItemText(1, self._("Float"))
 			dialog.type_combo.setItemText(2, self._("Text"))
 			dialog.type_combo.setItemText(3, self._("Date/Time"))
+			dialog.layout.labelForField(dialog.format_input).setText(self._("Date Format:"))
+			dialog.format_input.setPlaceholderText(self._("Auto-detect (e.g. %d/%m/%Y)"))
 		
 		if isinstance(QApplication.activeModalWidget(), RenameColumnDialog):
 			dialog = QApplication.activeModalWidget()
@@ -800,6 +1525,8 @@ class MainWindow(QMainWindow):
 			dialog.layout.labelForField(dialog.new_name_input).setText(self._("New Name:"))
 			dialog.new_name_input.setPlaceholderText(self._("Enter new column name"))
 		
-		if isinstance(QApplication.activeModalWidget(), StatisticsDialog):
+		# Only loaded once a statistics dialog has been shown
+		statistics_dialog = sys.modules.get('ui.dialogs.statistics_dialog')
+		if statistics_dialog and isinstance(QApplication.activeModalWidget(), statistics_dialog.StatisticsDialog):
 			dialog = QApplication.activeModalWidget()
 			dialog.retranslate_ui()
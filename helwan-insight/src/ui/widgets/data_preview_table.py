@@ -1,7 +1,13 @@
-import pandas as pd
+from typing import TYPE_CHECKING
+
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
 from PyQt5.QtCore import Qt
 
+from core.tracing import traced
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 class DataPreviewTable(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -15,7 +21,11 @@ class DataPreviewTable(QWidget):
         
         self.retranslate_ui()
 
-    def set_data(self, df: pd.DataFrame):
+    @traced('table', rows='df')
+    def set_data(self, df: 'pd.DataFrame'):
+        # Imported here so the window can be shown before pandas is loaded
+        import pandas as pd
+
         self.table_widget.clear()
         if df is None or df.empty:
             self.table_widget.setRowCount(0)
@@ -1,15 +1,20 @@
+from functools import partial
+
 import pandas as pd
 from PyQt5.QtWidgets import (
 	QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
 	QPushButton, QStackedWidget, QSizePolicy, QScrollArea,
-	QMessageBox, QListWidget, QAbstractItemView, QGroupBox, QTextEdit, QApplication
+	QMessageBox, QListWidget, QAbstractItemView, QGroupBox, QTextEdit, QApplication,
+	QSpinBox, QProgressBar, QCheckBox, QSlider
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QMimeData
 from PyQt5.QtGui import QClipboard
 
 from ui.widgets.visualization import PlotArea
 from core.data_handler import DataHandler
+from core.grouping import GROUP_AGGREGATIONS
 from ui.dialogs.statistics_dialog import StatisticsDialog
+from ui.workers import TaskWorker
 
 class EDADashboard(QWidget):
 	plot_requested = pyqtSignal(str, str, pd.DataFrame)
@@ -22,6 +27,9 @@ class EDADashboard(QWidget):
 
 		self.df = None
 		self.data_handler = None
+		self.bootstrap_worker = None
+		self.test_worker = None
+		self.bootstrap_seed = 0 # Fixed seed so repeated runs give the same intervals
 
 		self.setup_ui()
 		self.retranslate_ui()
@@ -57,6 +65,15 @@ class EDADashboard(QWidget):
 		self.control_layout.addWidget(self.plot_type_label)
 		self.control_layout.addWidget(self.plot_type_combo)
 
+		# Bin count of the histogram shown; re-binned from cached fine bins as it moves
+		self.histogram_bins_label = QLabel()
+		self.histogram_bins_slider = QSlider(Qt.Horizontal)
+		self.histogram_bins_slider.setRange(2, 200)
+		self.histogram_bins_slider.setValue(20)
+		self.histogram_bins_slider.valueChanged.connect(self.on_histogram_bins_changed)
+		self.control_layout.addWidget(self.histogram_bins_label)
+		self.control_layout.addWidget(self.histogram_bins_slider)
+
 		# Generate Plot Button
 		self.generate_plot_button = QPushButton(self._("Generate Plot"))
 		self.generate_plot_button.clicked.connect(self.generate_plot)
@@ -66,6 +83,33 @@ class EDADashboard(QWidget):
 		self.generate_heatmap_button = QPushButton(self._("Generate Correlation Heatmap"))
 		self.generate_heatmap_button.clicked.connect(self.generate_heatmap)
 		self.control_layout.addWidget(self.generate_heatmap_button)
+		# Puts strongly correlated columns next to each other
+		self.heatmap_cluster_checkbox = QCheckBox(self._("Cluster Heatmap Columns"))
+		self.control_layout.addWidget(self.heatmap_cluster_checkbox)
+
+		# X/Y Plot Section (two numerical columns against each other)
+		self.xy_plot_group_box = QGroupBox(self._("X/Y Plot"))
+		self.xy_plot_layout = QVBoxLayout(self.xy_plot_group_box)
+
+		self.xy_x_label = QLabel(self._("X Column:"))
+		self.xy_x_combo = QComboBox()
+		self.xy_plot_layout.addWidget(self.xy_x_label)
+		self.xy_plot_layout.addWidget(self.xy_x_combo)
+
+		self.xy_y_label = QLabel(self._("Y Column:"))
+		self.xy_y_combo = QComboBox()
+		self.xy_plot_layout.addWidget(self.xy_y_label)
+		self.xy_plot_layout.addWidget(self.xy_y_combo)
+
+		# Unchecked = individual points, switching to a density grid only for large data
+		self.xy_density_checkbox = QCheckBox(self._("Density Mode"))
+		self.xy_plot_layout.addWidget(self.xy_density_checkbox)
+
+		self.generate_xy_plot_button = QPushButton(self._("Generate X/Y Plot"))
+		self.generate_xy_plot_button.clicked.connect(self.generate_xy_plot)
+		self.xy_plot_layout.addWidget(self.generate_xy_plot_button)
+
+		self.control_layout.addWidget(self.xy_plot_group_box)
 
 
 		# Statistical Analysis Section (Basic Statistics)
@@ -82,6 +126,22 @@ class EDADashboard(QWidget):
 		self.generate_stats_button.clicked.connect(self.generate_statistics)
 		self.statistical_analysis_layout.addWidget(self.generate_stats_button)
 
+		self.bootstrap_resamples_label = QLabel(self._("Bootstrap Resamples:"))
+		self.bootstrap_resamples_spin = QSpinBox()
+		self.bootstrap_resamples_spin.setRange(100, 100000)
+		self.bootstrap_resamples_spin.setSingleStep(500)
+		self.bootstrap_resamples_spin.setValue(1000)
+		self.statistical_analysis_layout.addWidget(self.bootstrap_resamples_label)
+		self.statistical_analysis_layout.addWidget(self.bootstrap_resamples_spin)
+
+		self.generate_bootstrap_button = QPushButton(self._("Bootstrap Confidence Intervals"))
+		self.generate_bootstrap_button.clicked.connect(self.generate_bootstrap_intervals)
+		self.statistical_analysis_layout.addWidget(self.generate_bootstrap_button)
+
+		self.bootstrap_progress_bar = QProgressBar()
+		self.bootstrap_progress_bar.setVisible(False)
+		self.statistical_analysis_layout.addWidget(self.bootstrap_progress_bar)
+
 		self.control_layout.addWidget(self.statistical_analysis_group_box)
 
 		# Advanced Statistical Tests Section
@@ -108,10 +168,24 @@ class EDADashboard(QWidget):
 		self.advanced_analysis_layout.addWidget(self.test_column2_label)
 		self.advanced_analysis_layout.addWidget(self.test_column2_combo)
 
+		self.test_method_label = QLabel(self._("Test Method:"))
+		self.test_method_combo = QComboBox()
+		self.test_method_combo.addItems([
+			self._("Parametric"),
+			self._("Permutation"),
+			self._("Exact")
+		])
+		self.advanced_analysis_layout.addWidget(self.test_method_label)
+		self.advanced_analysis_layout.addWidget(self.test_method_combo)
+
 		self.perform_test_button = QPushButton(self._("Perform Test"))
 		self.perform_test_button.clicked.connect(self.perform_statistical_test)
 		self.advanced_analysis_layout.addWidget(self.perform_test_button)
 
+		self.test_progress_bar = QProgressBar()
+		self.test_progress_bar.setVisible(False)
+		self.advanced_analysis_layout.addWidget(self.test_progress_bar)
+
 		self.control_layout.addWidget(self.advanced_analysis_group_box)
 
 		# Correlation Analysis Section
@@ -122,6 +196,50 @@ class EDADashboard(QWidget):
 		self.correlation_layout.addWidget(self.generate_correlation_button)
 		self.control_layout.addWidget(self.correlation_group_box)
 
+		# Group Analysis Section
+		self.group_analysis_group_box = QGroupBox(self._("Group Analysis"))
+		self.group_analysis_layout = QVBoxLayout(self.group_analysis_group_box)
+
+		self.group_key_label = QLabel(self._("Group By Columns:"))
+		self.group_key_list = QListWidget()
+		self.group_key_list.setSelectionMode(QAbstractItemView.MultiSelection)
+		self.group_analysis_layout.addWidget(self.group_key_label)
+		self.group_analysis_layout.addWidget(self.group_key_list)
+
+		self.group_value_label = QLabel(self._("Value Column:"))
+		self.group_value_combo = QComboBox()
+		self.group_analysis_layout.addWidget(self.group_value_label)
+		self.group_analysis_layout.addWidget(self.group_value_combo)
+
+		self.group_aggregation_label = QLabel(self._("Aggregations:"))
+		self.group_aggregation_list = QListWidget()
+		self.group_aggregation_list.setSelectionMode(QAbstractItemView.MultiSelection)
+		self.group_aggregation_list.addItems(GROUP_AGGREGATIONS)
+		for i in range(self.group_aggregation_list.count()):
+			if self.group_aggregation_list.item(i).text() in ('count', 'mean'):
+				self.group_aggregation_list.item(i).setSelected(True)
+		self.group_analysis_layout.addWidget(self.group_aggregation_label)
+		self.group_analysis_layout.addWidget(self.group_aggregation_list)
+
+		# Unchecked = hash-only grouping, faster for keys with many distinct values
+		self.group_sort_checkbox = QCheckBox(self._("Sort Groups"))
+		self.group_sort_checkbox.setChecked(True)
+		self.group_analysis_layout.addWidget(self.group_sort_checkbox)
+
+		self.compute_group_stats_button = QPushButton(self._("Compute Group Statistics"))
+		self.compute_group_stats_button.clicked.connect(self.compute_group_statistics)
+		self.group_analysis_layout.addWidget(self.compute_group_stats_button)
+
+		self.group_boxplot_button = QPushButton(self._("Box Plot by Group"))
+		self.group_boxplot_button.clicked.connect(self.generate_group_boxplot)
+		self.group_analysis_layout.addWidget(self.group_boxplot_button)
+
+		self.group_violin_button = QPushButton(self._("Violin Plot by Group"))
+		self.group_violin_button.clicked.connect(self.generate_group_violin)
+		self.group_analysis_layout.addWidget(self.group_violin_button)
+
+		self.control_layout.addWidget(self.group_analysis_group_box)
+
 		# Outlier Analysis Section
 		self.outlier_group_box = QGroupBox(self._("Outlier Analysis (IQR Method)"))
 		self.outlier_layout = QVBoxLayout(self.outlier_group_box)
@@ -162,10 +280,13 @@ class EDADashboard(QWidget):
 	def set_data(self, df: pd.DataFrame, data_handler: DataHandler):
 		self.df = df
 		self.data_handler = data_handler
+		self.plot_area.set_data_handler(data_handler)
 		self.update_column_combo()
+		self.update_xy_column_combos()
 		self.update_stat_column_list()
 		self.update_test_column_combos()
 		self.update_outlier_column_combo() # Update outlier column combo
+		self.update_group_columns()
 
 	def update_column_combo(self):
 		self.column_combo.clear()
@@ -174,6 +295,16 @@ class EDADashboard(QWidget):
 			if self.column_combo.count() > 0:
 				self.on_column_selected(0) # Trigger update of plot type options
 
+	def update_xy_column_combos(self):
+		self.xy_x_combo.clear()
+		self.xy_y_combo.clear()
+		if self.df is not None:
+			numerical_cols = self.data_handler.get_numerical_columns()
+			self.xy_x_combo.addItems(numerical_cols)
+			self.xy_y_combo.addItems(numerical_cols)
+			if len(numerical_cols) > 1:
+				self.xy_y_combo.setCurrentIndex(1)
+
 	def update_stat_column_list(self):
 		self.stat_column_list.clear()
 		if self.df is not None:
@@ -200,6 +331,14 @@ class EDADashboard(QWidget):
 			numerical_cols = self.data_handler.get_numerical_columns()
 			self.outlier_column_combo.addItems(numerical_cols)
 
+	def update_group_columns(self):
+		self.group_key_list.clear()
+		self.group_value_combo.clear()
+		if self.df is not None:
+			all_cols = self.data_handler.get_column_names()
+			self.group_key_list.addItems(all_cols)
+			self.group_value_combo.addItems(all_cols)
+
 	def on_column_selected(self, index):
 		if self.df is None or index < 0:
 			return 
@@ -271,8 +410,25 @@ class EDADashboard(QWidget):
 			 QMessageBox.warning(self.parent, self._("Plot Error"), self._("Violin plot requires a numerical column."))
 			 return
 
+		if plot_type == 'histogram':
+			self.plot_area.plot_histogram(column_name, self.df, self.data_handler.get_fine_histogram,
+			                              self.histogram_bins_slider.value())
+			if hasattr(self.parent, 'show_eda_dashboard'):
+				self.parent.show_eda_dashboard()
+			return
+
+		if plot_type == 'violin':
+			self.plot_area.plot_violin(column_name, self.df, self.data_handler.get_violin_densities)
+			if hasattr(self.parent, 'show_eda_dashboard'):
+				self.parent.show_eda_dashboard()
+			return
+
 		self.plot_requested.emit(plot_type, column_name, self.df)
 
+	def on_histogram_bins_changed(self, bins: int):
+		self.histogram_bins_label.setText(self._("Histogram Bins: {bins}").format(bins=bins))
+		self.plot_area.set_histogram_bins(bins)
+
 	def generate_heatmap(self):
 		if self.df is None:
 			QMessageBox.warning(self.parent, self._("No Data"), self._("Please load data first to generate a heatmap."))
@@ -283,7 +439,26 @@ class EDADashboard(QWidget):
 			QMessageBox.warning(self.parent, self._("No Numerical Data"), self._("No numerical columns found to generate a heatmap."))
 			return
 
-		self.plot_requested.emit('heatmap', None, self.df)
+		cluster = self.heatmap_cluster_checkbox.isChecked()
+		self.plot_area.plot_heatmap(self.df, partial(self.data_handler.get_correlation_matrix, cluster=cluster),
+		                            cluster=cluster)
+		if hasattr(self.parent, 'show_eda_dashboard'):
+			self.parent.show_eda_dashboard()
+
+	def generate_xy_plot(self):
+		if self.df is None:
+			QMessageBox.warning(self.parent, self._("No Data"), self._("Please load data first."))
+			return
+
+		x_column = self.xy_x_combo.currentText()
+		y_column = self.xy_y_combo.currentText()
+		if not x_column or not y_column:
+			QMessageBox.warning(self.parent, self._("Missing Information"), self._("Please select two numerical columns."))
+			return
+
+		self.plot_area.plot_xy(x_column, y_column, self.df, density=self.xy_density_checkbox.isChecked())
+		if hasattr(self.parent, 'show_eda_dashboard'):
+			self.parent.show_eda_dashboard()
 
 	def generate_statistics(self):
 		if self.df is None:
@@ -309,6 +484,66 @@ class EDADashboard(QWidget):
 			QMessageBox.critical(self.parent, self._("Statistical Analysis Error"), 
 								 self._("An unexpected error occurred during statistical analysis: {e}").format(e=e))
 
+	def generate_bootstrap_intervals(self):
+		if self.df is None:
+			QMessageBox.warning(self.parent, self._("No Data"), self._("Please load data first to generate statistics."))
+			return
+
+		selected_items = self.stat_column_list.selectedItems()
+		if not selected_items:
+			QMessageBox.warning(self.parent, self._("No Columns Selected"), self._("Please select at least one column for statistics."))
+			return
+
+		if self.bootstrap_worker is not None and self.bootstrap_worker.isRunning():
+			return
+
+		selected_columns = [item.text() for item in selected_items]
+
+		# Resampling runs in a background thread (and worker processes) to keep the UI responsive
+		self.bootstrap_worker = TaskWorker(
+			self.data_handler.get_bootstrap_confidence_intervals,
+			args=(selected_columns,),
+			kwargs={'n_resamples': self.bootstrap_resamples_spin.value(), 'seed': self.bootstrap_seed,
+					'mp_context': 'spawn'},
+			report_progress=True,
+			parent=self
+		)
+		self.bootstrap_worker.progress.connect(self.on_bootstrap_progress)
+		self.bootstrap_worker.result_ready.connect(self.on_bootstrap_finished)
+		self.bootstrap_worker.error_occurred.connect(self.on_bootstrap_failed)
+
+		self.generate_bootstrap_button.setEnabled(False)
+		self.bootstrap_progress_bar.setValue(0)
+		self.bootstrap_progress_bar.setVisible(True)
+		self.bootstrap_worker.start()
+
+	def on_bootstrap_progress(self, completed: int, total: int):
+		self.bootstrap_progress_bar.setMaximum(total)
+		self.bootstrap_progress_bar.setValue(completed)
+
+	def on_bootstrap_finished(self, result: dict):
+		self.generate_bootstrap_button.setEnabled(True)
+		self.bootstrap_progress_bar.setVisible(False)
+
+		dialog = StatisticsDialog(result["statistics"], self._, parent=self.parent)
+		dialog.setWindowTitle(self._("Bootstrap Confidence Intervals ({level:.0%}, {n} resamples)").format(
+			level=result["confidence_level"], n=result["n_resamples"]))
+		dialog.exec_()
+
+		if result["correlation"] is not None:
+			dialog = StatisticsDialog(result["correlation"], self._, parent=self.parent)
+			dialog.setWindowTitle(self._("Bootstrap Correlation Intervals"))
+			dialog.exec_()
+
+	def on_bootstrap_failed(self, error: Exception):
+		self.generate_bootstrap_button.setEnabled(True)
+		self.bootstrap_progress_bar.setVisible(False)
+		if isinstance(error, ValueError):
+			QMessageBox.warning(self.parent, self._("Error"), self._(str(error)))
+		else:
+			QMessageBox.critical(self.parent, self._("Statistical Analysis Error"), 
+								 self._("An unexpected error occurred during statistical analysis: {e}").format(e=error))
+
 	def on_test_type_selected(self, index):
 		test_type = self.test_type_combo.currentText()
 		all_cols = self.data_handler.get_column_names() if self.data_handler and self.df is not None else []
@@ -351,67 +586,114 @@ class EDADashboard(QWidget):
 			QMessageBox.warning(self.parent, self._("Invalid Selection"), self._("Please select two different columns for the test."))
 			return
 
-		test_result = None
-		try:
-			if test_type_display == self._("Independent Samples T-Test"):
-				test_result = self.data_handler.perform_t_test(column1, column2)
-			elif test_type_display == self._("Chi-Square Test"):
-				test_result = self.data_handler.perform_chi_square_test(column1, column2)
-			else:
-				QMessageBox.warning(self.parent, self._("Unsupported Test"), self._("Selected test type is not supported."))
-				return
+		if test_type_display == self._("Independent Samples T-Test"):
+			test_func = self.data_handler.perform_t_test
+		elif test_type_display == self._("Chi-Square Test"):
+			test_func = self.data_handler.perform_chi_square_test
+		else:
+			QMessageBox.warning(self.parent, self._("Unsupported Test"), self._("Selected test type is not supported."))
+			return
 
-			if test_result:
-				dialog = StatisticsDialog(None, self._, parent=self.parent) # Pass None for DataFrame, as we use QTextEdit
-				dialog.setWindowTitle(self._(test_result["test_type"]))
-				
-				result_text = []
-				result_text.append(f"{self._('Test Type')}: {self._(test_result['test_type'])}")
-				result_text.append(f"{self._('Column 1')}: {test_result['column1']}")
-				result_text.append(f"{self._('Column 2')}: {test_result['column2']}")
-				
-				if test_type_display == self._("Independent Samples T-Test"):
-					result_text.append(f"{self._('T-Statistic')}: {test_result['t_statistic']:.4f}")
-					result_text.append(f"{self._('P-Value')}: {test_result['p_value']:.4f}")
-				elif test_type_display == self._("Chi-Square Test"):
-					result_text.append(f"{self._('Chi2 Statistic')}: {test_result['chi2_statistic']:.4f}")
-					result_text.append(f"{self._('P-Value')}: {test_result['p_value']:.4f}")
-					result_text.append(f"{self._('Degrees of Freedom')}: {test_result['degrees_of_freedom']}")
-					result_text.append(f"\n{self._('Contingency Table')}:\n{test_result['contingency_table']}")
-					result_text.append(f"\n{self._('Expected Frequencies')}:\n{test_result['expected_frequencies']}")
-
-				# Determine language for interpretation
-				if self._("English") == "English": # Check if the translator function returns "English" for "English"
-					interpretation = test_result["interpretation"]["en"]
-				elif self._("English") == "الإنجليزية": # Check if it returns the Arabic translation for "English"
-					interpretation = test_result["interpretation"]["ar"]
-				else:
-					interpretation = test_result["interpretation"]["en"] # Fallback to English
-
-				result_text.append(f"\n{self._('Interpretation')}:\n{interpretation}")
-				
-				dialog.table_widget.setVisible(False) # Hide the table widget for text-based results
-				
-				dialog.text_output = QTextEdit() # Create a QTextEdit for the result text
-				dialog.text_output.setReadOnly(True)
-				dialog.text_output.setText("\n".join(result_text))
-				dialog.main_layout.insertWidget(0, dialog.text_output) # Insert at the top of the dialog's layout
-
-				# Disconnect any old connections before connecting the new one for the copy button
-				try:
-					dialog.copy_button.clicked.disconnect()
-				except TypeError:
-					pass # No previous connection, ignore
-				dialog.copy_button.clicked.connect(lambda: self.copy_text_to_clipboard(dialog.text_output.toPlainText()))
-				dialog.retranslate_ui() # Retranslate dialog components after changing content
-
-				dialog.exec_()
+		method_map = {
+			self._("Parametric"): 'parametric',
+			self._("Permutation"): 'permutation',
+			self._("Exact"): 'exact'
+		}
+		method = method_map.get(self.test_method_combo.currentText(), 'parametric')
 
-		except ValueError as e:
-			QMessageBox.warning(self.parent, self._("Error"), self._(str(e)))
-		except Exception as e:
+		if self.test_worker is not None and self.test_worker.isRunning():
+			return
+
+		# Permutation and exact tests can take a while, so every test runs off the GUI thread
+		self.test_worker = TaskWorker(
+			test_func,
+			args=(column1, column2),
+			kwargs={'method': method, 'seed': self.bootstrap_seed, 'mp_context': 'spawn'},
+			report_progress=(method != 'parametric'),
+			parent=self
+		)
+		self.test_worker.progress.connect(self.on_test_progress)
+		self.test_worker.result_ready.connect(lambda result: self.on_test_finished(test_type_display, result))
+		self.test_worker.error_occurred.connect(self.on_test_failed)
+
+		self.perform_test_button.setEnabled(False)
+		self.test_progress_bar.setValue(0)
+		self.test_progress_bar.setVisible(method != 'parametric')
+		self.test_worker.start()
+
+	def on_test_progress(self, completed: int, total: int):
+		self.test_progress_bar.setMaximum(total)
+		self.test_progress_bar.setValue(completed)
+
+	def on_test_failed(self, error: Exception):
+		self.perform_test_button.setEnabled(True)
+		self.test_progress_bar.setVisible(False)
+		if isinstance(error, ValueError):
+			QMessageBox.warning(self.parent, self._("Error"), self._(str(error)))
+		else:
 			QMessageBox.critical(self.parent, self._("Statistical Test Error"), 
-								 self._("An unexpected error occurred during statistical test: {e}").format(e=e))
+								 self._("An unexpected error occurred during statistical test: {e}").format(e=error))
+
+	def on_test_finished(self, test_type_display: str, test_result: dict):
+		self.perform_test_button.setEnabled(True)
+		self.test_progress_bar.setVisible(False)
+
+		if not test_result:
+			return
+
+		dialog = StatisticsDialog(None, self._, parent=self.parent) # Pass None for DataFrame, as we use QTextEdit
+		dialog.setWindowTitle(self._(test_result["test_type"]))
+		
+		result_text = []
+		result_text.append(f"{self._('Test Type')}: {self._(test_result['test_type'])}")
+		result_text.append(f"{self._('Method')}: {self._(test_result['method'].capitalize())}")
+		result_text.append(f"{self._('Column 1')}: {test_result['column1']}")
+		result_text.append(f"{self._('Column 2')}: {test_result['column2']}")
+		
+		if test_type_display == self._("Independent Samples T-Test"):
+			result_text.append(f"{self._('T-Statistic')}: {test_result['t_statistic']:.4f}")
+			result_text.append(f"{self._('P-Value')}: {test_result['p_value']:.4f}")
+		elif test_type_display == self._("Chi-Square Test"):
+			result_text.append(f"{self._('Chi2 Statistic')}: {test_result['chi2_statistic']:.4f}")
+			result_text.append(f"{self._('P-Value')}: {test_result['p_value']:.4f}")
+			result_text.append(f"{self._('Degrees of Freedom')}: {test_result['degrees_of_freedom']}")
+
+		if test_result["n_permutations"]:
+			permutations_line = f"{self._('Permutations')}: {test_result['n_permutations']}"
+			if test_result["early_stopped"]:
+				permutations_line += f" ({self._('stopped early, p-value resolved')})"
+			result_text.append(permutations_line)
+
+		if test_type_display == self._("Chi-Square Test"):
+			result_text.append(f"\n{self._('Contingency Table')}:\n{test_result['contingency_table']}")
+			result_text.append(f"\n{self._('Expected Frequencies')}:\n{test_result['expected_frequencies']}")
+
+		# Determine language for interpretation
+		if self._("English") == "English": # Check if the translator function returns "English" for "English"
+			interpretation = test_result["interpretation"]["en"]
+		elif self._("English") == "الإنجليزية": # Check if it returns the Arabic translation for "English"
+			interpretation = test_result["interpretation"]["ar"]
+		else:
+			interpretation = test_result["interpretation"]["en"] # Fallback to English
+
+		result_text.append(f"\n{self._('Interpretation')}:\n{interpretation}")
+		
+		dialog.table_widget.setVisible(False) # Hide the table widget for text-based results
+		
+		dialog.text_output = QTextEdit() # Create a QTextEdit for the result text
+		dialog.text_output.setReadOnly(True)
+		dialog.text_output.setText("\n".join(result_text))
+		dialog.main_layout.insertWidget(0, dialog.text_output) # Insert at the top of the dialog's layout
+
+		# Disconnect any old connections before connecting the new one for the copy button
+		try:
+			dialog.copy_button.clicked.disconnect()
+		except TypeError:
+			pass # No previous connection, ignore
+		dialog.copy_button.clicked.connect(lambda: self.copy_text_to_clipboard(dialog.text_output.toPlainText()))
+		dialog.retranslate_ui() # Retranslate dialog components after changing content
+
+		dialog.exec_()
 
 	def generate_correlation_matrix(self):
 		"""
@@ -438,6 +720,88 @@ class EDADashboard(QWidget):
 			QMessageBox.critical(self.parent, self._("Correlation Error"), 
 								 self._("An unexpected error occurred during correlation analysis: {e}").format(e=e))
 
+	def get_group_selection(self):
+		keys = [item.text() for item in self.group_key_list.selectedItems()]
+		value_column = self.group_value_combo.currentText()
+		if not keys:
+			QMessageBox.warning(self.parent, self._("No Columns Selected"), self._("Please select at least one column to group by."))
+			return None
+		if not value_column:
+			QMessageBox.warning(self.parent, self._("No Column Selected"), self._("Please select a value column."))
+			return None
+		return keys, value_column
+
+	def compute_group_statistics(self):
+		if self.df is None:
+			QMessageBox.warning(self.parent, self._("No Data"), self._("Please load data first."))
+			return
+
+		selection = self.get_group_selection()
+		if selection is None:
+			return
+		keys, value_column = selection
+
+		aggregations = [item.text() for item in self.group_aggregation_list.selectedItems()]
+		if not aggregations:
+			QMessageBox.warning(self.parent, self._("No Aggregation Selected"), self._("Please select at least one aggregation."))
+			return
+
+		try:
+			group_df = self.data_handler.group_by(keys, {value_column: aggregations},
+												  sort=self.group_sort_checkbox.isChecked())
+			# Flatten multi-column group labels for display
+			group_df.index = [" / ".join(map(str, label)) if isinstance(label, tuple) else str(label)
+							  for label in group_df.index]
+
+			dialog = StatisticsDialog(group_df, self._, parent=self.parent)
+			dialog.setWindowTitle(self._("Group Statistics by {keys}").format(keys=", ".join(keys)))
+			dialog.exec_()
+
+		except ValueError as e:
+			QMessageBox.warning(self.parent, self._("Error"), self._(str(e)))
+		except Exception as e:
+			QMessageBox.critical(self.parent, self._("Statistical Analysis Error"), 
+								 self._("An unexpected error occurred during statistical analysis: {e}").format(e=e))
+
+	def generate_group_boxplot(self):
+		if self.df is None:
+			QMessageBox.warning(self.parent, self._("No Data"), self._("Please load data first."))
+			return
+
+		selection = self.get_group_selection()
+		if selection is None:
+			return
+		keys, value_column = selection
+
+		try:
+			labels, values = self.data_handler.get_group_values(keys, value_column,
+																sort=self.group_sort_checkbox.isChecked())
+			self.plot_area.plot_group_boxplot(value_column, keys, labels, values)
+			if hasattr(self.parent, 'show_eda_dashboard'):
+				self.parent.show_eda_dashboard()
+		except ValueError as e:
+			QMessageBox.warning(self.parent, self._("Error"), self._(str(e)))
+
+	def generate_group_violin(self):
+		if self.df is None:
+			QMessageBox.warning(self.parent, self._("No Data"), self._("Please load data first."))
+			return
+
+		selection = self.get_group_selection()
+		if selection is None:
+			return
+		keys, value_column = selection
+		if not pd.api.types.is_numeric_dtype(self.df[value_column]):
+			QMessageBox.warning(self.parent, self._("Plot Error"), self._("Violin plot requires a numerical column."))
+			return
+
+		# Densities are estimated (and cached by the data handler) in the render worker
+		violin_source = partial(self.data_handler.get_violin_densities, group_by=keys,
+								sort=self.group_sort_checkbox.isChecked())
+		self.plot_area.plot_violin(value_column, self.df, violin_source, keys=keys)
+		if hasattr(self.parent, 'show_eda_dashboard'):
+			self.parent.show_eda_dashboard()
+
 	def detect_outliers(self):
 		if self.df is None:
 			QMessageBox.warning(self.parent, self._("No Data"), self._("Please load data first to detect outliers."))
@@ -518,8 +882,17 @@ class EDADashboard(QWidget):
 	def retranslate_ui(self):
 		self.column_label.setText(self._("Select Column:"))
 		self.plot_type_label.setText(self._("Select Plot Type:"))
+		self.histogram_bins_label.setText(self._("Histogram Bins: {bins}").format(bins=self.histogram_bins_slider.value()))
 		self.generate_plot_button.setText(self._("Generate Plot"))
 		self.generate_heatmap_button.setText(self._("Generate Correlation Heatmap"))
+		self.heatmap_cluster_checkbox.setText(self._("Cluster Heatmap Columns"))
+
+		# X/Y Plot Section
+		self.xy_plot_group_box.setTitle(self._("X/Y Plot"))
+		self.xy_x_label.setText(self._("X Column:"))
+		self.xy_y_label.setText(self._("Y Column:"))
+		self.xy_density_checkbox.setText(self._("Density Mode"))
+		self.generate_xy_plot_button.setText(self._("Generate X/Y Plot"))
 		
 		# Re-populate plot type combo based on current column selection
 		current_column_name = self.column_combo.currentText()
@@ -541,6 +914,8 @@ class EDADashboard(QWidget):
 		self.statistical_analysis_group_box.setTitle(self._("Descriptive Statistics"))
 		self.stat_column_label.setText(self._("Select Columns for Statistics:"))
 		self.generate_stats_button.setText(self._("Generate Statistics"))
+		self.bootstrap_resamples_label.setText(self._("Bootstrap Resamples:"))
+		self.generate_bootstrap_button.setText(self._("Bootstrap Confidence Intervals"))
 
 		# Re-populate column list for basic statistics
 		self.stat_column_list.clear()
@@ -569,12 +944,33 @@ class EDADashboard(QWidget):
 		# Re-populate test column combos
 		self.update_test_column_combos()
 
+		self.test_method_label.setText(self._("Test Method:"))
+		current_test_method_index = self.test_method_combo.currentIndex()
+		self.test_method_combo.clear()
+		self.test_method_combo.addItems([
+			self._("Parametric"),
+			self._("Permutation"),
+			self._("Exact")
+		])
+		if current_test_method_index != -1:
+			self.test_method_combo.setCurrentIndex(current_test_method_index)
+
 		self.perform_test_button.setText(self._("Perform Test"))
 
 		# Correlation Analysis Section
 		self.correlation_group_box.setTitle(self._("Correlation Analysis"))
 		self.generate_correlation_button.setText(self._("Generate Correlation Matrix"))
 
+		# Group Analysis Section
+		self.group_analysis_group_box.setTitle(self._("Group Analysis"))
+		self.group_key_label.setText(self._("Group By Columns:"))
+		self.group_value_label.setText(self._("Value Column:"))
+		self.group_aggregation_label.setText(self._("Aggregations:"))
+		self.group_sort_checkbox.setText(self._("Sort Groups"))
+		self.compute_group_stats_button.setText(self._("Compute Group Statistics"))
+		self.group_boxplot_button.setText(self._("Box Plot by Group"))
+		self.group_violin_button.setText(self._("Violin Plot by Group"))
+
 		# Outlier Analysis Section
 		self.outlier_group_box.setTitle(self._("Outlier Analysis (IQR Method)"))
 		self.outlier_column_label.setText(self._("Select Numerical Column:"))
@@ -0,0 +1,141 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QCheckBox, QPushButton, QLabel, QFileDialog, QMessageBox)
+from PyQt5.QtCore import Qt, QTimer
+
+from core.tracing import tracer, summarize_spans
+
+# How often (ms) the table is refreshed while the panel is visible
+REFRESH_INTERVAL_MS = 1000
+
+# Most recent spans listed (all of them are kept for the totals and the export)
+MAX_LISTED_SPANS = 500
+
+
+class PerformancePanel(QWidget):
+    """
+    Lists the spans recorded by core.tracing (DataHandler methods, plot renders, table
+    population, dialog construction) with wall and CPU time, rows and peak memory growth,
+    either one row per call (newest first) or totals per operation. Recording is switched
+    on and off here; the spans can be exported as Chrome-trace JSON.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self._ = parent._ if parent and hasattr(parent, '_') else lambda text: text
+        self._shown_count = None
+
+        self.layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.enabled_checkbox = QCheckBox()
+        self.enabled_checkbox.setChecked(tracer.enabled)
+        self.enabled_checkbox.toggled.connect(self.set_tracing_enabled)
+        controls.addWidget(self.enabled_checkbox)
+        self.totals_checkbox = QCheckBox()
+        self.totals_checkbox.toggled.connect(self.refresh)
+        controls.addWidget(self.totals_checkbox)
+        controls.addStretch()
+        self.clear_button = QPushButton()
+        self.clear_button.clicked.connect(self.clear)
+        controls.addWidget(self.clear_button)
+        self.export_button = QPushButton()
+        self.export_button.clicked.connect(self.export_chrome_trace)
+        controls.addWidget(self.export_button)
+        self.layout.addLayout(controls)
+
+        self.summary_label = QLabel()
+        self.layout.addWidget(self.summary_label)
+        self.table_widget = QTableWidget()
+        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_widget.verticalHeader().setVisible(False)
+        self.layout.addWidget(self.table_widget)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh_if_changed)
+
+        self.retranslate_ui()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        # Nothing is refreshed while the panel is hidden
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def set_tracing_enabled(self, enabled: bool):
+        tracer.enabled = enabled
+        self.refresh()
+
+    def clear(self):
+        tracer.clear()
+        self.refresh()
+
+    def refresh_if_changed(self):
+        spans = tracer.spans()
+        if len(spans) != self._shown_count or (spans and spans[-1] is not self._last_span):
+            self.refresh(spans=spans)
+
+    def refresh(self, _checked=None, spans: list = None):
+        spans = tracer.spans() if spans is None else spans
+        self._shown_count = len(spans)
+        self._last_span = spans[-1] if spans else None
+        self.summary_label.setText(self._("{count} operations recorded, {seconds:.2f} s in total").format(
+            count=len(spans), seconds=sum(span.wall for span in spans)))
+        if self.totals_checkbox.isChecked():
+            headers = [self._("Operation"), self._("Category"), self._("Calls"), self._("Total Wall (ms)"),
+                       self._("Total CPU (ms)"), self._("Slowest (ms)"), self._("Rows")]
+            rows = [(total["name"], total["category"], total["count"], total["wall"] * 1000, total["cpu"] * 1000,
+                     total["max_wall"] * 1000, total["rows"]) for total in summarize_spans(spans)]
+        else:
+            headers = [self._("Operation"), self._("Category"), self._("Wall (ms)"), self._("CPU (ms)"),
+                       self._("Rows"), self._("Peak Memory +MB"), self._("Thread")]
+            rows = [(span.name, span.category, span.wall * 1000, span.cpu * 1000, span.rows,
+                     span.peak_memory_delta / 2 ** 20, span.thread_name)
+                    for span in reversed(spans[-MAX_LISTED_SPANS:])]
+
+        self.table_widget.setSortingEnabled(False)
+        self.table_widget.clear()
+        self.table_widget.setColumnCount(len(headers))
+        self.table_widget.setHorizontalHeaderLabels(headers)
+        self.table_widget.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                item = QTableWidgetItem()
+                if isinstance(value, float):
+                    item.setData(Qt.DisplayRole, round(value, 2))
+                elif isinstance(value, int):
+                    item.setData(Qt.DisplayRole, value)
+                else:
+                    item.setText("" if value is None else str(value))
+                self.table_widget.setItem(i, j, item)
+        self.table_widget.setSortingEnabled(True)
+        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+
+    def export_chrome_trace(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            self._("Export Chrome Trace"),
+            "helwan-insight-trace.json",
+            self._("JSON Files (*.json);;All Files (*)")
+        )
+        if not file_path:
+            return
+        try:
+            count = tracer.export_chrome_trace(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, self._("Export Error"), self._("Failed to export trace: {e}").format(e=e))
+            return
+        QMessageBox.information(self, self._("Export Finished"),
+                                self._("Exported {count} operations. Open the file in chrome://tracing or "
+                                       "ui.perfetto.dev.").format(count=count))
+
+    def retranslate_ui(self):
+        self.enabled_checkbox.setText(self._("Record Timings"))
+        self.totals_checkbox.setText(self._("Totals per Operation"))
+        self.clear_button.setText(self._("Clear"))
+        self.export_button.setText(self._("Export Chrome Trace..."))
+        self.refresh()
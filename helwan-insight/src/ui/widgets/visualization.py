@@ -1,140 +1,398 @@
+import threading
+
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from PyQt5.QtWidgets import QVBoxLayout, QWidget, QMessageBox
-from PyQt5.QtCore import Qt
-import seaborn as sns 
+from matplotlib.figure import Figure
+from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QWidget, QMessageBox, QLabel, QProgressBar, QSizePolicy
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QImage, QPixmap
+
+from core.memory import memory_monitor
+from core.plot_cache import PlotCache, Uncacheable, freeze, DATA_CACHE_BYTES, FIGURE_CACHE_BYTES
+from core.plotting import (render_plot, figure_to_rgba, RenderCancelled, RENDER_STAGES, ZOOMABLE_PLOT_TYPES,
+                           XY_ZOOMABLE_PLOT_TYPES)
+from ui.workers import TaskWorker
+
+# Delay before re-rendering the current plot at a new widget size
+RESIZE_RENDER_DELAY_MS = 300
+
+# Largest relative difference in width or height at which a cached figure is shown as is
+FIGURE_SIZE_TOLERANCE = 0.05
+
+# Share of the visible x range kept per mouse wheel step when zooming in
+WHEEL_ZOOM_FACTOR = 0.8
+
 
 class PlotArea(QWidget):
+    """
+    Shows plots rendered off the GUI thread: each request is prepared and rasterized by
+    core.plotting in a worker, and the finished image is displayed here. A new request
+    cancels the one still in progress, whose result is then dropped.
+    Histograms, line and scatter plots can be zoomed (mouse wheel), panned (drag) and
+    reset (double-click) along x, X/Y plots along both axes; each view is re-rendered
+    from the full data.
+    Rendered figures and prepared plot data are cached by plot spec, size and data
+    version, so revisiting a plot shows it at once; the caches are dropped whenever the
+    data handler reports a change.
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self._ = parent._ if parent and hasattr(parent, '_') else lambda text: text
 
-        self.figure, self.ax = plt.subplots()
-        self.canvas = FigureCanvas(self.figure)
+        # The last finished plot, kept for saving at full resolution, and an older figure that
+        # the next render clears and draws into instead of building a new one
+        self.figure = Figure()
+        self._spare_figure = None
+        self._pixmap = None
+        self._request_id = 0
+        self._current_request = None
+        self._cancel_event = None
+        self._workers = set()
+        # For zoomable plots: where the axes sit in the figure and the limits they show
+        self._axes_geometry = None
+        # The (x, y) limits of the current zoomable plot before any zooming
+        self._full_view = None
+        self._drag_start = None
+        self.data_handler = None
+        self._figure_cache = PlotCache(FIGURE_CACHE_BYTES)
+        self._data_cache = PlotCache(DATA_CACHE_BYTES)
+        # Both are emptied first when the application runs over its memory budget
+        memory_monitor.register_cache("rendered plots", self._figure_cache)
+        memory_monitor.register_cache("plot data", self._data_cache)
+
         self.layout = QVBoxLayout(self)
-        self.layout.addWidget(self.canvas)
         self.layout.setContentsMargins(0, 0, 0, 0)
-        plt.tight_layout()
+
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.image_label.setMinimumSize(480, 360)
+        self.layout.addWidget(self.image_label, 1)
+
+        status_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        status_layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, RENDER_STAGES)
+        self.progress_bar.setMaximumWidth(200)
+        status_layout.addWidget(self.progress_bar)
+        self.layout.addLayout(status_layout)
+        self.set_busy(False)
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self.rerender_current_plot)
+
+    def set_data_handler(self, data_handler):
+        """Follows the data version of data_handler so cached plots of older data are dropped."""
+        if data_handler is self.data_handler:
+            return
+        if self.data_handler is not None:
+            self.data_handler.remove_data_listener(self.on_data_changed)
+        self.data_handler = data_handler
+        if data_handler is not None:
+            data_handler.add_data_listener(self.on_data_changed)
+        self.clear_caches()
+
+    def on_data_changed(self, data_version: int):
+        self.clear_caches()
+
+    def clear_caches(self):
+        self._figure_cache.clear()
+        self._data_cache.clear()
+
+    def _cache_key(self, plot_type: str, column: str, df: pd.DataFrame, options: dict) -> tuple:
+        # None when the options hold data themselves (e.g. pre-split group values)
+        try:
+            frozen_options = freeze(options or {})
+        except Uncacheable:
+            return None
+        handler = self.data_handler
+        data_version = handler.data_version if handler is not None and df is handler.df else None
+        return (plot_type, column, id(df), data_version, frozen_options)
+
+    def set_busy(self, busy: bool, message: str = ""):
+        self.status_label.setText(message)
+        self.status_label.setVisible(busy)
+        self.progress_bar.setVisible(busy)
+        if busy:
+            self.progress_bar.setValue(0)
 
     def plot_data(self, plot_type: str, column: str, df: pd.DataFrame):
-        if plot_type not in ['pairplot', 'violin']: 
-            self.ax.clear()
+        self._full_view = None
+        self.request_plot(plot_type, column, df)
+
+    def plot_histogram(self, column: str, df: pd.DataFrame, histogram_source=None, bins: int = 20):
+        """
+        Plots a histogram re-binned from a fine histogram (see core.histograms);
+        histogram_source(column) supplies a cached one, e.g. DataHandler.get_fine_histogram.
+        """
+        self._full_view = None
+        self.request_plot('histogram', column, df, options={"histogram_source": histogram_source, "bins": bins})
 
-        if df is None or df.empty:
-            QMessageBox.warning(self.parent, self._("No Data"), self._("No data available to plot."))
+    def set_histogram_bins(self, bins: int):
+        """Re-renders the current histogram with another bin count (no pass over the data)."""
+        if self._current_request is None or self._current_request[0] != 'histogram':
             return
-        
-        if column is not None and column not in df.columns: 
-            QMessageBox.warning(self.parent, self._("Invalid Column"), self._("Selected column does not exist in the data."))
+        plot_type, column, df, options = self._current_request
+        self.request_plot(plot_type, column, df, dict(options or {}, bins=bins), show_placeholder=False)
+
+    def plot_violin(self, column: str, df: pd.DataFrame, violin_source=None, keys: list = None, max_groups: int = 30):
+        """
+        Plots violins from kernel density estimates; violin_source(column) supplies cached
+        (label, density) pairs, e.g. DataHandler.get_violin_densities, one per group of keys.
+        """
+        self._full_view = None
+        self.request_plot('violin', column, df,
+                          options={"violin_source": violin_source, "keys": keys, "max_groups": max_groups})
+
+    def plot_heatmap(self, df: pd.DataFrame, correlation_source=None, cluster: bool = False):
+        """
+        Plots the correlation matrix as one image that can be zoomed into along both axes;
+        correlation_source() supplies a cached matrix, e.g. DataHandler.get_correlation_matrix.
+        """
+        self._full_view = None
+        self.request_plot('heatmap', None, df, options={"correlation_source": correlation_source, "cluster": cluster})
+
+    def plot_pairplot(self, df: pd.DataFrame, columns: list = None, mode: str = 'sample'):
+        """Plots the given numerical columns pairwise (see core.pairplot for the modes)."""
+        self._full_view = None
+        self.request_plot('pairplot', None, df, options={"columns": columns, "mode": mode})
+
+    def plot_xy(self, x_column: str, y_column: str, df: pd.DataFrame, density: bool = False):
+        """Plots two columns against each other, as a density grid when density is set or the data is large."""
+        self._full_view = None
+        self.request_plot('xy_scatter', x_column, df, options={"y_column": y_column, "density": density})
+
+    def plot_group_boxplot(self, column: str, keys: list, labels: list, values: list, max_groups: int = 30):
+        """Draws one box per group from pre-split group values (see DataHandler.get_group_values)."""
+        self.request_plot('group_boxplot', column, None,
+                          options={"keys": keys, "labels": labels, "values": values, "max_groups": max_groups})
+
+    def request_plot(self, plot_type: str, column: str = None, df: pd.DataFrame = None, options: dict = None,
+                     show_placeholder: bool = True):
+        # Supersede the plot still being rendered, if any
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        self._request_id += 1
+        request_id = self._request_id
+        self._current_request = (plot_type, column, df, options)
+        self._cancel_event = None
+
+        ratio = self.devicePixelRatioF()
+        width, height = int(self.image_label.width() * ratio), int(self.image_label.height() * ratio)
+        cache_key = self._cache_key(plot_type, column, df, options)
+        cached_figure = self._figure_cache.get(cache_key) if cache_key is not None else None
+        if cached_figure is not None and self._fits_view(cached_figure, width, height):
+            self.display_figure(cached_figure)
             return
+        self._cancel_event = threading.Event()
 
-        col_data = df[column] if column else None
+        if show_placeholder:
+            self._pixmap = None
+            self.image_label.clear()
+            self.image_label.setText(self._("Rendering plot..."))
+        self.set_busy(True, self._("Rendering plot..."))
 
-        try:
-            if plot_type == 'histogram':
-                col_data.hist(ax=self.ax, bins=20)
-                self.ax.set_title(self._("Histogram of {column}").format(column=column))
-                self.ax.set_xlabel(self._(column))
-                self.ax.set_ylabel(self._("Frequency"))
-            elif plot_type == 'bar':
-                if col_data.nunique() > 10:
-                    top_values = col_data.value_counts().nlargest(10)
-                    self.ax.bar(top_values.index.astype(str), top_values.values)
-                    self.ax.set_title(self._("Bar Chart of Top 10 {column}").format(column=column))
-                else:
-                    value_counts = col_data.value_counts()
-                    self.ax.bar(value_counts.index.astype(str), value_counts.values)
-                    self.ax.set_title(self._("Bar Chart of {column}").format(column=column))
-                self.ax.set_xlabel(self._(column))
-                self.ax.set_ylabel(self._("Count"))
-                self.figure.autofmt_xdate(rotation=45)
-            elif plot_type == 'boxplot':
-                col_data.plot.box(ax=self.ax)
-                self.ax.set_title(self._("Box Plot of {column}").format(column=column))
-                self.ax.set_ylabel(self._(column))
-            elif plot_type == 'scatter':
-                if pd.api.types.is_numeric_dtype(col_data):
-                    self.ax.scatter(df.index, col_data)
-                    self.ax.set_title(self._("Scatter Plot of {column}").format(column=column))
-                    self.ax.set_xlabel(self._("Index"))
-                    self.ax.set_ylabel(self._(column))
-                else:
-                    QMessageBox.warning(self.parent, self._("Plot Error"), 
-                                        self._("Scatter plot requires numerical data for the selected column."))
-            elif plot_type == 'line':
-                if pd.api.types.is_datetime64_any_dtype(col_data):
-                    self.ax.plot(col_data, df.index)
-                    self.ax.set_xlabel(self._(column))
-                    self.ax.set_ylabel(self._("Index"))
-                else:
-                    self.ax.plot(df.index, col_data)
-                    self.ax.set_xlabel(self._("Index"))
-                    self.ax.set_ylabel(self._(column))
-                self.ax.set_title(self._("Line Plot of {column}").format(column=column))
-                self.figure.autofmt_xdate()
-            elif plot_type == 'pie':
-                if not pd.api.types.is_numeric_dtype(col_data) or col_data.nunique() < len(col_data):
-                    value_counts = col_data.value_counts()
-                    self.ax.pie(value_counts, labels=value_counts.index.astype(str), autopct='%1.1f%%', startangle=90)
-                    self.ax.set_title(self._("Pie Chart of {column}").format(column=column))
-                    self.ax.axis('equal')
-                else:
-                    QMessageBox.warning(self.parent, self._("Plot Error"),
-                                        self._("Pie chart is best suited for categorical or discrete numerical data."))
-            elif plot_type == 'heatmap':
-                numerical_df = df.select_dtypes(include=['number'])
-                if numerical_df.empty:
-                    QMessageBox.warning(self.parent, self._("Plot Error"), self._("No numerical data available for heatmap."))
-                    return
-                
-                correlation_matrix = numerical_df.corr()
-                sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt=".2f", ax=self.ax)
-                self.ax.set_title(self._("Correlation Heatmap"))
-                self.figure.tight_layout()
-            
-            elif plot_type == 'pairplot':
-                numerical_df = df.select_dtypes(include=['number'])
-                if numerical_df.empty:
-                    QMessageBox.warning(self.parent, self._("Plot Error"), self._("No numerical data available for pair plot."))
-                    return
-                
-                plt.close(self.figure)
-                g = sns.pairplot(numerical_df)
-                
-                self.figure = g.fig
-                
-                self.layout.removeWidget(self.canvas)
-                self.canvas.deleteLater()
-                self.canvas = FigureCanvas(self.figure)
-                self.layout.addWidget(self.canvas)
-                
-                self.canvas.draw_idle()
-                return
-            
-            elif plot_type == 'violin':
-                if not pd.api.types.is_numeric_dtype(col_data):
-                    QMessageBox.warning(self.parent, self._("Plot Error"), 
-                                        self._("Violin plot requires a numerical column."))
-                    return
-                
-                sns.violinplot(y=col_data, ax=self.ax, inner='quartile') 
-                self.ax.set_title(self._("Violin Plot of {column}").format(column=column))
-                self.ax.set_ylabel(self._(column))
+        # A superseded render may still be drawing into the spare figure; it is then dropped
+        figure, self._spare_figure = self._spare_figure, None
+        worker = TaskWorker(render_plot, args=(plot_type, column, df),
+                            kwargs={"options": options, "translate": self._, "width": width, "height": height,
+                                    "cancel_event": self._cancel_event, "figure": figure,
+                                    "data_cache": self._data_cache, "cache_key": cache_key,
+                                    "mp_context": 'spawn'},
+                            report_progress=True, report_partial_results=True, parent=self)
+        worker.progress.connect(lambda completed, total, rid=request_id: self.on_render_progress(rid, completed, total))
+        worker.partial_result.connect(lambda pixels, rid=request_id: self.on_render_preview(rid, pixels))
+        worker.result_ready.connect(lambda figure, rid=request_id, key=cache_key: self.on_render_finished(rid, figure, key))
+        worker.error_occurred.connect(lambda error, rid=request_id: self.on_render_failed(rid, error))
+        worker.finished.connect(lambda w=worker: self._workers.discard(w))
+        self._workers.add(worker)
+        worker.start()
+
+    def rerender_current_plot(self):
+        if self._current_request is not None and self._pixmap is not None:
+            plot_type, column, df, options = self._current_request
+            self.request_plot(plot_type, column, df, options, show_placeholder=False)
+
+    def on_render_progress(self, request_id: int, completed: int, total: int):
+        if request_id == self._request_id:
+            self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(completed)
+
+    def show_pixels(self, pixels):
+        height, width = pixels.shape[:2]
+        image = QImage(pixels.tobytes(), width, height, 4 * width, QImage.Format_RGBA8888)
+        self._pixmap = QPixmap.fromImage(image)
+        self._pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self.image_label.setText("")
+        self.update_displayed_pixmap()
+
+    def on_render_preview(self, request_id: int, pixels):
+        # Part of a plot drawn panel by panel; not zoomable until it is finished
+        if request_id == self._request_id:
+            self._axes_geometry = None
+            self.show_pixels(pixels)
+
+    @staticmethod
+    def _fits_view(figure: Figure, width: int, height: int) -> bool:
+        # Cached figures are reused for views of about the same size (the busy status line
+        # alone changes the height a little); otherwise the plot is rendered again
+        cached_width, cached_height = figure.canvas.get_width_height()
+        return (abs(cached_width - width) <= FIGURE_SIZE_TOLERANCE * width and
+                abs(cached_height - height) <= FIGURE_SIZE_TOLERANCE * height)
+
+    def on_render_finished(self, request_id: int, figure: Figure, cache_key: tuple = None):
+        if request_id != self._request_id:
+            return  # superseded by a newer request
+        if cache_key is not None:
+            width, height = figure.canvas.get_width_height()
+            self._figure_cache.put(cache_key, figure, 4 * width * height)
+        self.display_figure(figure)
+
+    def display_figure(self, figure: Figure):
+        """Shows a finished figure (just rendered or from the cache) as the current plot."""
+        self.set_busy(False)
+        self._cancel_event = None
+        # The replaced figure is recycled for the next render unless the cache still shows it
+        if figure is not self.figure and not self._figure_cache.holds(self.figure):
+            self._spare_figure = self.figure
+        self.figure = figure
+        self.show_pixels(figure_to_rgba(figure))
+
+        plot_type, _column, _df, options = self._current_request
+        if plot_type in ZOOMABLE_PLOT_TYPES and figure.axes:
+            ax = figure.axes[0]
+            self._axes_geometry = {"bounds": ax.bbox.bounds, "figure_size": (figure.bbox.width, figure.bbox.height),
+                                   "x_range": ax.get_xlim(), "y_range": ax.get_ylim(),
+                                   "zoom_y": plot_type in XY_ZOOMABLE_PLOT_TYPES}
+            options = options or {}
+            if not options.get("x_range") and not options.get("y_range"):
+                self._full_view = (ax.get_xlim(), ax.get_ylim())
+            self.image_label.setToolTip(self._("Scroll to zoom, drag to pan, double-click to reset the view"))
+        else:
+            self._axes_geometry = None
+            self.image_label.setToolTip("")
+
+    def on_render_failed(self, request_id: int, error: Exception):
+        if request_id != self._request_id or isinstance(error, RenderCancelled):
+            return
+        self.set_busy(False)
+        self._cancel_event = None
+        self._current_request = None
+        self.image_label.clear()
+        self._pixmap = None
+        if isinstance(error, ValueError):
+            QMessageBox.warning(self.parent, self._("Plot Error"), self._(str(error)))
+        else:
+            QMessageBox.critical(self.parent, self._("Plotting Error"),
+                                 self._("An error occurred while plotting: {e}").format(e=error))
 
+    def update_displayed_pixmap(self):
+        if self._pixmap is None:
+            return
+        ratio = self.devicePixelRatioF()
+        target = self.image_label.size() * ratio
+        if self._pixmap.size() == target:
+            self.image_label.setPixmap(self._pixmap)
+        else:
+            scaled = self._pixmap.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            scaled.setDevicePixelRatio(ratio)
+            self.image_label.setPixmap(scaled)
+
+    def _data_at(self, pos) -> tuple:
+        # The data (x, y) coordinates under a widget position, or None without a zoomable plot
+        if self._axes_geometry is None or self._pixmap is None:
+            return None
+        pixmap = self.image_label.pixmap()
+        if pixmap is None or pixmap.isNull():
+            return None
+        label_pos = self.image_label.mapFrom(self, pos)
+        shown_width = pixmap.width() / pixmap.devicePixelRatioF()
+        shown_height = pixmap.height() / pixmap.devicePixelRatioF()
+        image_x = label_pos.x() - (self.image_label.width() - shown_width) / 2
+        image_y = label_pos.y() - (self.image_label.height() - shown_height) / 2
+        axes_left, axes_bottom, axes_width, axes_height = self._axes_geometry["bounds"]
+        figure_width, figure_height = self._axes_geometry["figure_size"]
+        # Matplotlib measures figure pixels from the bottom left corner
+        figure_x = image_x * figure_width / shown_width
+        figure_y = figure_height - image_y * figure_height / shown_height
+        (x_low, x_high), (y_low, y_high) = self._axes_geometry["x_range"], self._axes_geometry["y_range"]
+        return (x_low + (figure_x - axes_left) / axes_width * (x_high - x_low),
+                y_low + (figure_y - axes_bottom) / axes_height * (y_high - y_low))
+
+    def set_view(self, x_range=None, y_range=None):
+        """
+        Re-renders the current zoomable plot for an x range and, for X/Y plots, a y range
+        (None for the whole data along that axis).
+        """
+        if self._current_request is None or self._current_request[0] not in ZOOMABLE_PLOT_TYPES:
+            return
+        plot_type, column, df, options = self._current_request
+        options = dict(options or {})
+        for key, view_range, full_range in (("x_range", x_range, self._full_view[0] if self._full_view else None),
+                                            ("y_range", y_range, self._full_view[1] if self._full_view else None)):
+            # Heatmap rows run downwards, so their ranges come high to low
+            if view_range is not None and full_range is not None and \
+                    abs(view_range[1] - view_range[0]) >= abs(full_range[1] - full_range[0]):
+                view_range = None  # zoomed out past the whole data
+            if view_range is None:
+                options.pop(key, None)
             else:
-                QMessageBox.warning(self.parent, self._("Unsupported Plot Type"), 
-                                    self._("The selected plot type '{plot_type}' is not yet supported for '{column}'.").format(plot_type=plot_type, column=column))
-                return
+                options[key] = (float(view_range[0]), float(view_range[1]))
+        self.request_plot(plot_type, column, df, options, show_placeholder=False)
 
-            self.figure.canvas.draw_idle()
+    def wheelEvent(self, event):
+        point = self._data_at(event.pos())
+        if point is None or event.angleDelta().y() == 0:
+            super().wheelEvent(event)
+            return
+        factor = WHEEL_ZOOM_FACTOR if event.angleDelta().y() > 0 else 1 / WHEEL_ZOOM_FACTOR
+        (x_low, x_high), (y_low, y_high) = self._axes_geometry["x_range"], self._axes_geometry["y_range"]
+        x, y = point
+        y_range = (y - (y - y_low) * factor, y + (y_high - y) * factor) if self._axes_geometry["zoom_y"] else None
+        self.set_view((x - (x - x_low) * factor, x + (x_high - x) * factor), y_range)
+        event.accept()
 
-        except Exception as e:
-            QMessageBox.critical(self.parent, self._("Plotting Error"), 
-                                 self._("An error occurred while plotting: {e}").format(e=e))
-            self.ax.clear()
-            self.figure.canvas.draw_idle()
+    def mousePressEvent(self, event):
+        point = self._data_at(event.pos()) if event.button() == Qt.LeftButton else None
+        if point is not None:
+            self._drag_start = (point, dict(self._axes_geometry))
+            self.setCursor(Qt.ClosedHandCursor)
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._drag_start is not None and event.button() == Qt.LeftButton:
+            (start_x, start_y), geometry = self._drag_start
+            self._drag_start = None
+            self.unsetCursor()
+            point = self._data_at(event.pos())
+            if point is not None and point != (start_x, start_y):
+                # Measured in the limits at the start of the drag, the view moves with the cursor
+                x_shift, y_shift = start_x - point[0], start_y - point[1]
+                (x_low, x_high), (y_low, y_high) = geometry["x_range"], geometry["y_range"]
+                y_range = (y_low + y_shift, y_high + y_shift) if geometry["zoom_y"] else None
+                self.set_view((x_low + x_shift, x_high + x_shift), y_range)
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        if self._data_at(event.pos()) is not None:
+            self.set_view(None, None)
+            event.accept()
+            return
+        super().mouseDoubleClickEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Stretch the current image right away, re-render sharply once resizing stops
+        self.update_displayed_pixmap()
+        if self._pixmap is not None:
+            self._resize_timer.start(RESIZE_RENDER_DELAY_MS)
 
     def save_plot_as_image(self, file_path: str):
         try:
@@ -143,4 +401,8 @@ class PlotArea(QWidget):
             raise IOError(f"Failed to save plot to {file_path}: {e}")
 
     def retranslate_ui(self):
-        pass
+        # Plot titles are translated when rendered; re-render the current plot in the new language
+        self._figure_cache.clear()
+        if self.status_label.isVisible():
+            self.status_label.setText(self._("Rendering plot..."))
+        self.rerender_current_plot()
@@ -0,0 +1,34 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class TaskWorker(QThread):
+    """
+    Runs a long computation (usually a DataHandler method) off the GUI thread.
+    If report_progress is True, the callable receives a progress_callback keyword
+    argument which is forwarded to the progress signal as (completed, total).
+    If report_partial_results is True, it also receives a partial_result_callback keyword
+    argument forwarded to the partial_result signal (e.g. a preview of a plot in progress).
+    """
+    progress = pyqtSignal(int, int)
+    partial_result = pyqtSignal(object)
+    result_ready = pyqtSignal(object)
+    error_occurred = pyqtSignal(object)
+
+    def __init__(self, func, args: tuple = (), kwargs: dict = None, report_progress: bool = False,
+                 report_partial_results: bool = False, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.kwargs = dict(kwargs or {})
+        if report_progress:
+            self.kwargs['progress_callback'] = self.progress.emit
+        if report_partial_results:
+            self.kwargs['partial_result_callback'] = self.partial_result.emit
+
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.error_occurred.emit(e)
+            return
+        self.result_ready.emit(result)
@@ -1,6 +1,34 @@
 import gettext
 import os
 
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'locales')
+
+
+def no_translation(text: str) -> str:
+    """The translation function used when no catalogue is loaded (module level, so it can be pickled)."""
+    return text
+
+
+class Translation:
+    """
+    The gettext function of a locale as a callable that can be pickled: worker processes
+    (which may be started with spawn rather than fork) load the catalogue themselves
+    instead of receiving it.
+    """
+
+    def __init__(self, locale_code: str, domain: str):
+        self.locale_code = locale_code
+        self.domain = domain
+        self.translations = gettext.translation(domain, localedir=LOCALE_DIR, languages=[locale_code, 'en'],
+                                                fallback=True)
+
+    def __call__(self, text: str) -> str:
+        return self.translations.gettext(text)
+
+    def __reduce__(self):
+        return Translation, (self.locale_code, self.domain)
+
+
 def setup_translation(locale_code: str, domain: str):
     """
     Sets up the translation for the given locale and domain.
@@ -10,11 +38,9 @@ def setup_translation(locale_code: str, domain: str):
     Returns:
         function: The _ (gettext) function for translation.
     """
-    localedir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'locales')
-    
     try:
-        lang = gettext.translation(domain, localedir=localedir, languages=[locale_code, 'en'], fallback=True)
-        lang.install()
-        return lang.gettext
+        translation = Translation(locale_code, domain)
+        translation.translations.install()
+        return translation
     except Exception as e:
-        return lambda text: text
+        return no_translation
@@ -0,0 +1,65 @@
+import importlib
+import os
+import sys
+import time
+
+# Modules imported in the background once the main window has painted, in the order the
+# first analysis needs them; anything not loaded yet is imported on first use instead
+PRELOAD_MODULES = (
+    'numpy',
+    'pandas',
+    'core.data_handler',
+    'matplotlib.figure',
+    'matplotlib.backends.backend_agg',
+    'core.plotting',
+    'ui.widgets.eda_dashboard',
+    'scipy.stats',
+    'seaborn',
+)
+
+# Command-line flag and environment variable that turn on the startup-time measurement mode
+STARTUP_TIMING_FLAG = '--startup-timing'
+STARTUP_TIMING_ENV = 'HELWAN_STARTUP_TIMING'
+
+
+def startup_timing_requested(argv: list) -> bool:
+    return STARTUP_TIMING_FLAG in argv or bool(os.environ.get(STARTUP_TIMING_ENV))
+
+
+class StartupTimer:
+    """
+    Records how long after start each startup stage was reached (e.g. first paint). When
+    enabled, each stage is also printed to stderr as it is reached.
+    """
+
+    def __init__(self, enabled: bool = False, start: float = None):
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self.marks = {}
+
+    def mark(self, stage: str) -> float:
+        """Records stage (only the first time it is reached); returns the seconds since start."""
+        elapsed = time.perf_counter() - self.start
+        if stage not in self.marks:
+            self.marks[stage] = elapsed
+            if self.enabled:
+                print(f"[startup] {stage}: {elapsed * 1000:.0f} ms", file=sys.stderr, flush=True)
+        return self.marks[stage]
+
+
+def preload_modules(modules: tuple = PRELOAD_MODULES, progress_callback=None) -> list:
+    """
+    Imports modules (meant for a background thread, so the first use of a feature does
+    not wait for its imports). Modules that fail to import are skipped; the error shows
+    up again when the feature itself is used. Returns the modules that were imported.
+    """
+    loaded = []
+    for index, name in enumerate(modules, start=1):
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except ImportError:
+            pass
+        if progress_callback:
+            progress_callback(index, len(modules))
+    return loaded